@@ -8,6 +8,7 @@ from alembic import context
 
 # Import des modèles pour la génération automatique des migrations
 from src.models.base import Base
+from src.models.search import BOOK_FTS_TABLE
 from src.config import settings
 
 # this is the Alembic Config object, which provides
@@ -27,6 +28,12 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Ignore l'index FTS5 et ses tables internes lors de l'autogénération."""
+    if type_ == "table" and name.startswith(BOOK_FTS_TABLE):
+        return False
+    return True
+
 # Remplacer l'URL de la base de données par celle de la configuration
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
@@ -36,6 +43,7 @@ def run_migrations_offline():
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -53,7 +61,9 @@ def run_migrations_online():
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
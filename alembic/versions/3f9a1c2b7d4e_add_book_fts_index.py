@@ -0,0 +1,38 @@
+"""Add book full-text search index
+
+Revision ID: 3f9a1c2b7d4e
+Revises: 08035063bf56
+Create Date: 2026-10-18 09:12:41.503127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.models.search import BOOK_FTS_CREATE, BOOK_FTS_REBUILD, BOOK_FTS_DROP
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2b7d4e'
+down_revision: Union[str, None] = '08035063bf56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in BOOK_FTS_CREATE:
+        op.execute(statement)
+    # Indexe les livres déjà présents
+    op.execute(BOOK_FTS_REBUILD)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in BOOK_FTS_DROP:
+        op.execute(statement)
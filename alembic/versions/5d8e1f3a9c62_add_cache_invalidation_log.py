@@ -0,0 +1,37 @@
+"""Add cache invalidation log
+
+Revision ID: 5d8e1f3a9c62
+Revises: b81d5e0f6a27
+Create Date: 2026-10-18 14:22:05.613207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8e1f3a9c62'
+down_revision: Union[str, None] = 'b81d5e0f6a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cache_invalidation',
+    sa.Column('tags', sa.Text(), nullable=False),
+    sa.Column('origin', sa.String(length=100), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cache_invalidation_id'), 'cache_invalidation', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cache_invalidation_id'), table_name='cache_invalidation')
+    op.drop_table('cache_invalidation')
@@ -0,0 +1,49 @@
+"""Add library counters
+
+Revision ID: 7c2e4d9a1b35
+Revises: 3f9a1c2b7d4e
+Create Date: 2026-10-18 11:03:27.218455
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e4d9a1b35'
+down_revision: Union[str, None] = '3f9a1c2b7d4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('library_counter',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_library_counter_id'), 'library_counter', ['id'], unique=False)
+    op.create_index(op.f('ix_library_counter_name'), 'library_counter', ['name'], unique=True)
+    # Initialisation à partir des tables existantes
+    op.execute("""
+        INSERT INTO library_counter (name, value, created_at, updated_at)
+        SELECT 'total_books', COALESCE(SUM(quantity), 0), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM book
+        UNION ALL SELECT 'unique_books', COUNT(*), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM book
+        UNION ALL SELECT 'total_users', COUNT(*), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM user
+        UNION ALL SELECT 'active_users', COUNT(*), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM user WHERE is_active
+        UNION ALL SELECT 'total_loans', COUNT(*), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM loan
+        UNION ALL SELECT 'active_loans', COUNT(*), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM loan WHERE return_date IS NULL
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_library_counter_name'), table_name='library_counter')
+    op.drop_index(op.f('ix_library_counter_id'), table_name='library_counter')
+    op.drop_table('library_counter')
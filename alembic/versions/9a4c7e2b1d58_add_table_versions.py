@@ -0,0 +1,46 @@
+"""Add table versions
+
+Revision ID: 9a4c7e2b1d58
+Revises: 5d8e1f3a9c62
+Create Date: 2026-10-18 16:41:52.094318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4c7e2b1d58'
+down_revision: Union[str, None] = '5d8e1f3a9c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('table_version',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_table_version_id'), 'table_version', ['id'], unique=False)
+    op.create_index(op.f('ix_table_version_name'), 'table_version', ['name'], unique=True)
+    op.execute("""
+        INSERT INTO table_version (name, version, created_at, updated_at)
+        SELECT 'book', 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        UNION ALL SELECT 'category', 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        UNION ALL SELECT 'user', 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        UNION ALL SELECT 'loan', 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_table_version_name'), table_name='table_version')
+    op.drop_index(op.f('ix_table_version_id'), table_name='table_version')
+    op.drop_table('table_version')
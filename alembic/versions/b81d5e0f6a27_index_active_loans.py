@@ -0,0 +1,78 @@
+"""Index active loans per user
+
+Revision ID: b81d5e0f6a27
+Revises: 7c2e4d9a1b35
+Create Date: 2026-10-18 13:41:09.774310
+
+"""
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger("alembic")
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d5e0f6a27'
+down_revision: Union[str, None] = '7c2e4d9a1b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def close_duplicate_active_loans() -> None:
+    """
+    Les emprunts non atomiques des révisions précédentes ont pu ouvrir
+    plusieurs emprunts actifs d'un même livre pour un utilisateur : le plus
+    ancien est conservé, les autres sont clos (exemplaire rendu au stock,
+    compteurs corrigés) pour que l'index unique puisse être créé.
+    """
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("""
+        SELECT loan.id, loan.book_id FROM loan
+        WHERE loan.return_date IS NULL AND EXISTS (
+            SELECT 1 FROM loan AS kept
+            WHERE kept.user_id = loan.user_id AND kept.book_id = loan.book_id
+            AND kept.return_date IS NULL AND kept.id < loan.id
+        )
+    """)).all()
+    if not rows:
+        return
+    now = datetime.utcnow()
+    loan = sa.table('loan', sa.column('id'), sa.column('return_date'), sa.column('updated_at'))
+    bind.execute(loan.update().where(loan.c.id.in_([id for id, _ in rows])).values(return_date=now, updated_at=now))
+    copies = Counter(book_id for _, book_id in rows)
+    bind.execute(
+        sa.text("UPDATE book SET quantity = quantity + :copies WHERE id = :book_id"),
+        [{"book_id": book_id, "copies": count} for book_id, count in copies.items()]
+    )
+    bind.execute(
+        sa.text("UPDATE library_counter SET value = value + :delta WHERE name = :name"),
+        [{"name": "active_loans", "delta": -len(rows)}, {"name": "total_books", "delta": len(rows)}]
+    )
+    logger.warning(f"{len(rows)} emprunt(s) actif(s) en double clos avant la création de uq_loan_active_user_book : {sorted(id for id, _ in rows)}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_loan_user_return_date', 'loan', ['user_id', 'return_date'], unique=False)
+    op.drop_index('idx_loan_user_id', table_name='loan')
+    if op.get_bind().dialect.name in ('sqlite', 'postgresql'):
+        close_duplicate_active_loans()
+        op.create_index(
+            'uq_loan_active_user_book', 'loan', ['user_id', 'book_id'],
+            unique=True,
+            sqlite_where=sa.text('return_date IS NULL'),
+            postgresql_where=sa.text('return_date IS NULL'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name in ('sqlite', 'postgresql'):
+        op.drop_index('uq_loan_active_user_book', table_name='loan')
+    op.create_index('idx_loan_user_id', 'loan', ['user_id'], unique=False)
+    op.drop_index('idx_loan_user_return_date', table_name='loan')
@@ -1,4 +1,16 @@
+import argparse
+import os
+
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Lance l'API.")
+    parser.add_argument("--port", type=int, default=8000)
+    # Plusieurs workers : clés JWT partagées par JWT_KEYS_FILE (ou SECRET_KEY / JWT_KEYS)
+    parser.add_argument("--workers", type=int, default=1, help="Processus uvicorn (sans rechargement automatique si > 1)")
+    args = parser.parse_args()
+    if args.workers > 1:
+        # Un seul app.log pour tous les workers : chacun le ferait tourner de son
+        # côté (lignes perdues). Rotation externe, le fichier déplacé est rouvert.
+        os.environ["LOG_MAX_BYTES"] = "0"
+    uvicorn.run("src.main:app", host="0.0.0.0", port=args.port, reload=args.workers == 1, workers=args.workers)
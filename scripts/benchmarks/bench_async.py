@@ -0,0 +1,131 @@
+"""
+Test de charge des routes de lecture : handlers synchrones (pool de threads
+AnyIO, session SessionLocal) contre handlers asynchrones (aiosqlite,
+AsyncSessionLocal). Chaque application tourne dans un processus uvicorn ;
+des clients HTTP concurrents (keep-alive) envoient un mélange de
+GET /books/{id} et GET /books/?limit=20.
+
+    python scripts/benchmarks/bench_async.py --concurrency 64 --requests 4000
+"""
+import argparse
+import http.client
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from seed import seed_database, temp_database_url
+
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.api.schemas.books import Book
+from src.db.session import get_async_db, get_db
+from src.models.books import Book as BookModel
+from src.repositories.books import AsyncBookRepository, BookRepository
+from src.services.books import AsyncBookService, BookService
+from src.utils.pagination import Page, PaginationParams, count_cache_key, paginate
+
+# Applications minimales (sans authentification) pour isoler le coût base de données
+
+sync_app = FastAPI()
+
+@sync_app.get("/books/", response_model=Page[Book])
+def sync_read_books(db: Session = Depends(get_db), limit: int = 20):
+    return paginate(db.query(BookModel), PaginationParams(limit=limit), BookModel, count_key=count_cache_key("books"))
+
+@sync_app.get("/books/{id}", response_model=Book)
+def sync_read_book(id: int, db: Session = Depends(get_db)):
+    return BookService(BookRepository(BookModel, db)).get(id=id)
+
+
+async_app = FastAPI()
+
+@async_app.get("/books/", response_model=Page[Book])
+async def async_read_books(db: AsyncSession = Depends(get_async_db), limit: int = 20):
+    return await AsyncBookService(AsyncBookRepository(BookModel, db)).paginate(params=PaginationParams(limit=limit))
+
+@async_app.get("/books/{id}", response_model=Book)
+async def async_read_book(id: int, db: AsyncSession = Depends(get_async_db)):
+    return await AsyncBookService(AsyncBookRepository(BookModel, db)).get(id=id)
+
+
+def start_server(app_name, port, env):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"bench_async:{app_name}", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env
+    )
+    for _ in range(100):
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/books/1")
+            connection.getresponse().read()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Le serveur {app_name} n'a pas démarré")
+
+
+def run_load(port, concurrency, requests, books):
+    def worker(count):
+        rng = random.Random()
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        latencies, errors = [], 0
+        for _ in range(count):
+            path = "/books/?limit=20" if rng.random() < 0.3 else f"/books/{rng.randint(1, books)}"
+            start = time.perf_counter()
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            errors += response.status != 200
+        connection.close()
+        return latencies, errors
+
+    per_worker = requests // concurrency
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, [per_worker] * concurrency))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "errors": sum(errors for _, errors in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    url = temp_database_url("async")
+    seed_database(url, books=args.books, users=10, loans=0)
+    env = dict(os.environ, DATABASE_URL=url)
+    print(f"Base : {url} ({args.books} livres), {args.concurrency} clients, {args.requests} requêtes")
+
+    for label, app_name in (("sync", "sync_app"), ("async", "async_app")):
+        process = start_server(app_name, args.port, env)
+        try:
+            run_load(args.port, args.concurrency, args.concurrency * 5, args.books)  # échauffement
+            result = run_load(args.port, args.concurrency, args.requests, args.books)
+        finally:
+            process.terminate()
+            process.wait()
+        print(f"{label:<6} {result['throughput']:8.0f} req/s  p50 {result['p50']:6.1f} ms  "
+              f"p95 {result['p95']:6.1f} ms  erreurs {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Test de charge des emprunts concurrents : de nombreux threads empruntent
+les mêmes livres en parallèle. Vérifie qu'aucun livre n'est sur-emprunté
+(stock jamais négatif, autant d'emprunts que d'exemplaires) et mesure le débit.
+
+    python scripts/benchmarks/bench_checkout.py --threads 32 --users 2000 --books 50 --stock 10
+"""
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from seed import temp_database_url
+from src.exceptions import CustomException
+from src.models import Base, Book, User, Loan
+from src.repositories.books import BookRepository
+from src.repositories.loans import LoanRepository
+from src.repositories.users import UserRepository
+from src.services.loans import LoanService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--books", type=int, default=50)
+    parser.add_argument("--stock", type=int, default=10, help="exemplaires par livre")
+    args = parser.parse_args()
+
+    engine = create_engine(temp_database_url("checkout"), connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    with SessionLocal() as db:
+        db.add_all(
+            Book(title=f"Livre {i}", author="Auteur", isbn=f"{i:013d}", publication_year=2000, quantity=args.stock)
+            for i in range(1, args.books + 1)
+        )
+        db.add_all(
+            User(email=f"user{i}@example.com", full_name=f"Utilisateur {i}", hashed_password="x", is_active=True)
+            for i in range(1, args.users + 1)
+        )
+        db.commit()
+
+    # Chaque utilisateur tente d'emprunter un livre : args.users demandes pour
+    # args.books * args.stock exemplaires au total
+    requests = [(user_id, user_id % args.books + 1) for user_id in range(1, args.users + 1)]
+
+    def borrow(request):
+        user_id, book_id = request
+        with SessionLocal() as db:
+            service = LoanService(LoanRepository(Loan, db), BookRepository(Book, db), UserRepository(User, db))
+            try:
+                service.create_loan(user_id=user_id, book_id=book_id)
+                return 201
+            except CustomException as e:
+                return e.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = Counter(pool.map(borrow, requests))
+    elapsed = time.perf_counter() - start
+
+    with SessionLocal() as db:
+        loans = db.query(func.count(Loan.id)).scalar()
+        negative = db.query(func.count(Book.id)).filter(Book.quantity < 0).scalar()
+        remaining = db.query(func.sum(Book.quantity)).scalar()
+        per_book = dict(db.query(Loan.book_id, func.count(Loan.id)).group_by(Loan.book_id).all())
+
+    print(f"{len(requests)} demandes, {args.threads} threads : {elapsed:.2f} s, {len(requests) / elapsed:.0f} demandes/s")
+    print("Réponses :", dict(results))
+    print(f"Emprunts créés : {loans}, exemplaires restants : {remaining}, stocks négatifs : {negative}")
+    assert negative == 0, "stock négatif"
+    assert max(per_book.values(), default=0) <= args.stock, "livre sur-emprunté"
+    assert loans + remaining == args.books * args.stock, "stock incohérent"
+    assert results[201] == loans
+    print("Aucun sur-emprunt constaté")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Latence de diffusion des invalidations de cache entre workers : plusieurs
+processus s'abonnent au bus (table cache_invalidation d'une base SQLite en
+WAL), un processus publie des invalidations ; on mesure le délai entre la
+publication et l'application dans le cache local de chaque worker.
+
+    python scripts/benchmarks/bench_invalidation_bus.py --workers 4 --messages 200 --poll-interval 0.05
+"""
+import argparse
+import multiprocessing
+import statistics
+import time
+
+from sqlalchemy import create_engine
+
+from seed import temp_database_url
+from src.db.profile import apply_sqlite_profile, engine_options
+from src.models.cache import CacheInvalidation
+from src.utils.cache_backends import LRUCache
+from src.utils.cache_bus import InvalidationBus
+
+
+def worker(url, poll_interval, ready, receipts, stop):
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_profile(engine)
+    local_cache = LRUCache()
+
+    def on_invalidate(tags):
+        local_cache.invalidate(*tags)
+        receipts.put((tags[0], time.time()))
+
+    bus = InvalidationBus(engine, on_invalidate, poll_interval=poll_interval)
+    bus.start()
+    ready.put(bus.origin)
+    stop.wait()
+    bus.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="secondes")
+    parser.add_argument("--spacing", type=float, default=0.01, help="secondes entre deux publications")
+    args = parser.parse_args()
+
+    url = temp_database_url("bus")
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_profile(engine)
+    CacheInvalidation.__table__.create(engine)
+
+    context = multiprocessing.get_context("spawn")
+    ready, receipts, stop = context.Queue(), context.Queue(), context.Event()
+    processes = [
+        context.Process(target=worker, args=(url, args.poll_interval, ready, receipts, stop))
+        for _ in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.get(timeout=60)
+
+    publisher = InvalidationBus(engine, lambda tags: None)
+    sent = {}
+    for i in range(args.messages):
+        tag = f"bench-{i}"
+        sent[tag] = time.time()
+        publisher.publish([tag])
+        time.sleep(args.spacing)
+
+    latencies = []
+    for _ in range(args.messages * args.workers):
+        tag, received_at = receipts.get(timeout=60)
+        latencies.append((received_at - sent[tag]) * 1000)
+    stop.set()
+    for process in processes:
+        process.join()
+
+    latencies.sort()
+    quantile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    print(f"{args.workers} workers, {args.messages} invalidations, intervalle de scrutation {args.poll_interval * 1000:.0f} ms")
+    print(f"  livrées : {len(latencies)}/{args.messages * args.workers}")
+    print(
+        f"  latence (ms) : moyenne {statistics.mean(latencies):.1f}, p50 {quantile(0.5):.1f}, "
+        f"p95 {quantile(0.95):.1f}, p99 {quantile(0.99):.1f}, max {latencies[-1]:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
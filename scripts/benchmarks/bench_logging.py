@@ -0,0 +1,160 @@
+"""
+Benchmark de la latence des requêtes avec la journalisation active :
+configuration d'origine (FileHandler et StreamHandler synchrones dans le
+thread de la requête) contre la chaîne QueueHandler/QueueListener, avec et
+sans échantillonnage des messages INFO.
+
+Les requêtes GET /books/ sont envoyées directement à l'application ASGI,
+séquentiellement puis par lots concurrents. La console est redirigée vers
+/dev/null et le fichier de log est écrit dans un répertoire temporaire.
+--io-delay simule un disque lent (ms par écriture dans le fichier de log).
+
+    python scripts/benchmarks/bench_logging.py --requests 2000 --concurrency 16 --io-delay 0.5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from seed import seed_database, temp_database_url
+
+# Base et fichier de log choisis avant le chargement de la configuration de l'application
+DATABASE_URL = temp_database_url("logging")
+LOG_DIRECTORY = tempfile.mkdtemp(prefix="biblio-logs-")
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ["LOG_FILE"] = os.path.join(LOG_DIRECTORY, "import.log")
+
+import logging  # noqa: E402
+
+from src.config import settings  # noqa: E402
+from src.logging_config import TEXT_FORMAT, setup_logging, stop_logging  # noqa: E402
+from src.main import app  # noqa: E402
+
+
+def legacy_logging(path: str) -> None:
+    """
+    Configuration d'origine : écritures synchrones dans le thread appelant.
+    """
+    stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    logging.basicConfig(
+        level=logging.INFO,
+        format=TEXT_FORMAT,
+        handlers=[logging.FileHandler(path, encoding="utf-8"), logging.StreamHandler()],
+    )
+
+
+def slow_file_io(delay: float) -> None:
+    """
+    Ajoute `delay` secondes à chaque écriture dans un fichier de log.
+    """
+    flush = logging.StreamHandler.flush
+
+    def slow_flush(self):
+        flush(self)
+        time.sleep(delay)
+    logging.FileHandler.flush = slow_flush
+
+
+def queue_logging(path: str, **overrides) -> None:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    setup_logging(settings.model_copy(update={"LOG_FILE": path, **overrides}))
+
+
+async def get(path: str, query: str = "") -> int:
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app({
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 12345), "server": ("bench", 80),
+    }, receive, send)
+    return status
+
+
+async def timed_get(path: str, query: str, latencies: list) -> None:
+    start = time.perf_counter()
+    status = await get(path, query)
+    latencies.append(time.perf_counter() - start)
+    assert status == 200, status
+
+
+async def run(requests: int, concurrency: int):
+    path = f"{settings.API_V1_STR}/books/"
+    sequential, concurrent = [], []
+    for i in range(requests):
+        await timed_get(path, f"limit=10&skip={i % 50 * 10}", sequential)
+    start = time.perf_counter()
+    for batch in range(0, requests, concurrency):
+        await asyncio.gather(*(
+            timed_get(path, f"limit=10&skip={(batch + j) % 50 * 10}", concurrent) for j in range(concurrency)
+        ))
+    throughput = len(concurrent) / (time.perf_counter() - start)
+    return sequential, concurrent, throughput
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--io-delay", type=float, default=0.0, help="latence simulée par écriture (ms)")
+    args = parser.parse_args()
+
+    seed_database(DATABASE_URL, books=5000, users=100, loans=1000)
+    if args.io_delay:
+        slow_file_io(args.io_delay / 1000)
+    configurations = [
+        ("synchrone (origine)", lambda path: legacy_logging(path)),
+        ("file d'attente", lambda path: queue_logging(path)),
+        ("file + échantillonnage", lambda path: queue_logging(path, LOG_SAMPLING={"src": 0.1})),
+        ("file + JSON", lambda path: queue_logging(path, LOG_JSON=True)),
+    ]
+    stderr, sys.stderr = sys.stderr, open(os.devnull, "w")
+    results = []
+    try:
+        for label, configure in configurations:
+            log_path = os.path.join(LOG_DIRECTORY, label.replace(" ", "_") + ".log")
+            configure(log_path)
+            asyncio.run(run(100, args.concurrency))  # échauffement
+            sequential, _, throughput = asyncio.run(run(args.requests, args.concurrency))
+            stop_logging()
+            results.append((label, sequential, throughput, os.path.getsize(log_path)))
+    finally:
+        sys.stderr.close()
+        sys.stderr = stderr
+
+    print(f"{args.requests} requêtes GET /books/ par configuration (latences en ms, écriture +{args.io_delay} ms)")
+    print(f"{'configuration':<24} {'moy.':>6} {'p50':>6} {'p95':>6} {'p99':>6} {'req/s':>7} {'log':>9}")
+    for label, sequential, throughput, size in results:
+        print(
+            f"{label:<24} {statistics.mean(sequential) * 1000:6.2f} {percentile(sequential, 0.5):6.2f} "
+            f"{percentile(sequential, 0.95):6.2f} {percentile(sequential, 0.99):6.2f} "
+            f"{throughput:7.0f} {size // 1024:>7}Ko"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Débit de connexion (POST /auth/login) de l'application complète, servie par
+uvicorn : bcrypt dans les threads du serveur (PASSWORD_HASH_WORKERS=0, le
+comportement des anciennes routes synchrones) contre le pool de processus
+dédié. Pendant la rafale de connexions, des clients mesurent la latence de
+requêtes publiques légères (GET /books/?limit=20) pour voir si les connexions les affament.
+
+Le gain du pool dépend des cœurs disponibles : sur une machine à un cœur,
+bcrypt occupe de toute façon l'unique processeur.
+
+    python scripts/benchmarks/bench_login.py --logins 200 --concurrency 16 --workers 2 4
+"""
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from seed import seed_database, temp_database_url
+
+from sqlalchemy import update
+
+from src.models.users import User
+from src.utils.security import crypt_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PREFIX = "/api/v1"
+PASSWORD = "password123"
+
+
+def start_server(port, env):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env
+    )
+    for _ in range(150):
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/")
+            connection.getresponse().read()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Le serveur n'a pas démarré")
+
+
+def quantile(latencies, q):
+    return statistics.quantiles(latencies, n=100)[q - 1] * 1000 if len(latencies) > 1 else float("nan")
+
+
+def run_burst(port, logins, concurrency, users, readers, books):
+    body_for = lambda i: urllib.parse.urlencode({"username": f"user{i % users + 1}@example.com", "password": PASSWORD})
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    done = threading.Event()
+    read_errors = [0] * readers
+
+    def login_worker(indexes):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        latencies, errors = [], 0
+        for i in indexes:
+            start = time.perf_counter()
+            connection.request("POST", f"{PREFIX}/auth/login", body_for(i), headers)
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            errors += response.status != 200
+        connection.close()
+        return latencies, errors
+
+    def reader_worker(offset):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        latencies, i = [], offset
+        while not done.is_set():
+            start = time.perf_counter()
+            connection.request("GET", f"{PREFIX}/books/?skip={i % books}&limit=20")
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            read_errors[offset] += response.status != 200
+            i += readers
+        connection.close()
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=concurrency + readers) as pool:
+        reader_futures = [pool.submit(reader_worker, offset) for offset in range(readers)]
+        start = time.perf_counter()
+        login_futures = [pool.submit(login_worker, range(worker, logins, concurrency)) for worker in range(concurrency)]
+        results = [future.result() for future in login_futures]
+        elapsed = time.perf_counter() - start
+        done.set()
+        read_latencies = sorted(latency for future in reader_futures for latency in future.result())
+
+    login_latencies = sorted(latency for latencies, _ in results for latency in latencies)
+    return {
+        "throughput": len(login_latencies) / elapsed,
+        "login_p50": quantile(login_latencies, 50),
+        "login_p95": quantile(login_latencies, 95),
+        "read_p50": quantile(read_latencies, 50),
+        "read_p95": quantile(read_latencies, 95),
+        "reads": len(read_latencies),
+        "errors": sum(errors for _, errors in results) + sum(read_errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4], help="tailles du pool à comparer")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    users, books = 100, 1000
+    url = temp_database_url("login")
+    engine = seed_database(url, books=books, users=users, loans=0)
+    with engine.begin() as connection:
+        # Tous actifs, même mot de passe : un seul hash à calculer
+        connection.execute(update(User).values(is_active=True, hashed_password=crypt_context(args.rounds).hash(PASSWORD)))
+    env = dict(
+        os.environ, DATABASE_URL=url, API_V1_STR=PREFIX, BCRYPT_ROUNDS=str(args.rounds),
+        LOG_FILE=os.path.join(tempfile.mkdtemp(prefix="biblio-"), "app.log"), LOG_LEVEL="WARNING",
+    )
+    print(f"{args.logins} connexions, {args.concurrency} clients, {args.readers} lecteurs, "
+          f"coût bcrypt {args.rounds}, {os.cpu_count()} cœur(s)")
+
+    for workers in [0, *args.workers]:
+        label = "threads du serveur" if workers == 0 else f"pool de {workers} processus"
+        process = start_server(args.port, dict(env, PASSWORD_HASH_WORKERS=str(workers)))
+        try:
+            run_burst(args.port, args.concurrency, args.concurrency, users, args.readers, books)  # échauffement
+            result = run_burst(args.port, args.logins, args.concurrency, users, args.readers, books)
+        finally:
+            process.terminate()
+            process.wait()
+        print(f"  {label:<20} {result['throughput']:6.1f} connexions/s  "
+              f"connexion p50 {result['login_p50']:7.0f} ms  p95 {result['login_p95']:7.0f} ms  |  "
+              f"lecture p50 {result['read_p50']:6.1f} ms  p95 {result['read_p95']:7.1f} ms ({result['reads']})  "
+              f"erreurs {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
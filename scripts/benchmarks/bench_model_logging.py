@@ -0,0 +1,110 @@
+"""
+Benchmark du coût de la journalisation dans les modèles ORM, journalisation
+configurée au niveau INFO comme en production :
+
+- chargement de N emprunts (Loan) depuis la base, sans instrumentation puis
+  avec les événements "init"/"load" de src.models.instrumentation (DEBUG
+  désactivé, puis activé vers un handler en mémoire) ;
+- construction de N objets Loan et appels à repr() sur N livres, avec les
+  f-strings de l'ancien code (reproduites ici, évaluées même sans DEBUG)
+  contre les modèles actuels.
+
+SQLAlchemy n'appelle pas __init__ au chargement d'une ligne : les anciens
+__init__ journalisés ne pesaient que sur la construction d'objets.
+
+    python scripts/benchmarks/bench_model_logging.py --rows 10000
+"""
+import argparse
+import io
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from seed import seed_database, temp_database_url
+from src.models import Book, Loan
+from src.models.instrumentation import disable_model_instrumentation, enable_model_instrumentation
+
+models_logger = logging.getLogger("src.models")
+
+
+def legacy_construct(rows):
+    # Ligne supprimée de Loan.__init__, exécutée à chaque construction
+    for user_id, book_id, due_date, loan_date in rows:
+        models_logger.debug(f"Creating Loan: user_id={user_id}, book_id={book_id}, due_date={due_date}, loan_date={loan_date}, return_date={None}, extended={False}")
+        Loan(user_id=user_id, book_id=book_id, due_date=due_date, loan_date=loan_date)
+
+
+def construct(rows):
+    for user_id, book_id, due_date, loan_date in rows:
+        Loan(user_id=user_id, book_id=book_id, due_date=due_date, loan_date=loan_date)
+
+
+def legacy_repr(books):
+    # Ancien Book.__repr__ : une f-string journalisée avant la représentation
+    for book in books:
+        models_logger.debug(f"Repr called for Book: {book.title} by {book.author}")
+        repr(book)
+
+
+def current_repr(books):
+    for book in books:
+        repr(book)
+
+
+def measure(label, func, repeat):
+    func()  # échauffement
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<48} {elapsed * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = seed_database(temp_database_url("models"), books=args.rows, users=1000, loans=args.rows)
+    Session = sessionmaker(bind=engine)
+
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    buffer = logging.StreamHandler(io.StringIO())
+
+    def hydrate():
+        with Session() as db:
+            db.query(Loan).all()
+
+    print(f"Chargement de {args.rows} emprunts")
+    measure("sans instrumentation", hydrate, args.repeat)
+    enable_model_instrumentation()
+    measure("instrumentation, DEBUG désactivé", hydrate, args.repeat)
+    instrumentation_logger = logging.getLogger("src.models.instrumentation")
+    instrumentation_logger.setLevel(logging.DEBUG)
+    instrumentation_logger.addHandler(buffer)
+    measure("instrumentation, DEBUG actif (handler mémoire)", hydrate, args.repeat)
+    instrumentation_logger.removeHandler(buffer)
+    instrumentation_logger.setLevel(logging.NOTSET)
+    disable_model_instrumentation()
+
+    now = datetime.utcnow()
+    rows = [(i % 1000 + 1, i + 1, now + timedelta(days=14), now) for i in range(args.rows)]
+    print(f"Construction de {args.rows} emprunts")
+    measure("__init__ journalisé (f-string)", lambda: legacy_construct(rows), args.repeat)
+    measure("modèle actuel", lambda: construct(rows), args.repeat)
+    enable_model_instrumentation()
+    measure("modèle actuel, instrumentation sans DEBUG", lambda: construct(rows), args.repeat)
+    disable_model_instrumentation()
+
+    with Session() as db:
+        books = db.query(Book).all()
+        print(f"repr() de {len(books)} livres")
+        measure("__repr__ journalisé (f-string)", lambda: legacy_repr(books), args.repeat)
+        measure("modèle actuel", lambda: current_repr(books), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
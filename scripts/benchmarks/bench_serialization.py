@@ -0,0 +1,135 @@
+"""
+Benchmark de la sérialisation des réponses /books/ (Page[Book], livres avec
+catégories) et /loans/ (List[LoanWithDetails]) : chemin response_model de
+FastAPI avec l'encodeur JSON standard, le même avec orjson, et la
+sérialisation groupée par TypeAdapter (src.api.serialization).
+
+Mesure aussi le coût des anciens __init__ journalisés des schémas, appelés
+par pydantic à chaque validation depuis un dictionnaire (corps de requête,
+modèles redécoupés par FastAPI).
+
+    python scripts/benchmarks/bench_serialization.py --books 100 --loans 500
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload, selectinload, sessionmaker
+
+from seed import seed_database, temp_database_url
+from src.api.schemas.books import Book, Category
+from src.api.schemas.loans import LoanWithDetails
+from src.api.schemas.users import User
+from src.api.serialization import json_response
+from src.models import Book as BookModel, Loan as LoanModel
+from src.models.categories import Category as CategoryModel, book_category
+from src.utils.pagination import Page, PaginationParams, paginate
+
+logger = logging.getLogger("bench")
+
+
+class LoggingInit:
+    """
+    Reproduit les anciens __init__ des schémas (une ligne formatée par objet ;
+    l'original en formatait une par niveau d'héritage).
+    """
+    def __init__(self, **data):
+        super().__init__(**data)
+        logger.debug(f"{type(self).__name__} created with data: {data}")
+
+
+class LegacyCategory(LoggingInit, Category):
+    pass
+
+
+class LegacyBook(LoggingInit, Book):
+    categories: List[LegacyCategory] = []
+
+
+class LegacyUser(LoggingInit, User):
+    pass
+
+
+class LegacyLoanWithDetails(LoggingInit, LoanWithDetails):
+    user: LegacyUser
+    book: LegacyBook
+
+
+def seed_categories(engine, books: int, per_book: int = 3) -> None:
+    with engine.begin() as connection:
+        connection.execute(insert(CategoryModel.__table__), [
+            {"name": f"Catégorie {i}", "description": f"Description {i}"} for i in range(1, 21)
+        ])
+        connection.execute(insert(book_category), [
+            {"book_id": book_id, "category_id": (book_id + offset) % 20 + 1}
+            for book_id in range(1, books + 1) for offset in range(per_book)
+        ])
+
+
+def response_model_path(schema, response_class):
+    """
+    Chemin de FastAPI pour un objet renvoyé tel quel avec response_model.
+    """
+    field = create_model_field("Response", schema, mode="serialization")
+
+    def render(content):
+        return response_class(asyncio.run(serialize_response(field=field, response_content=content))).body
+    return render
+
+
+def measure(label, func, content, repeat):
+    body = func(content)  # échauffement
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(content)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<32} {elapsed * 1000:8.2f} ms  {len(body):>8} octets")
+    return body
+
+
+def compare(title, schema, legacy_schema, content, repeat):
+    print(title)
+    bodies = [
+        measure("response_model + json", response_model_path(schema, JSONResponse), content, repeat),
+        measure("response_model + orjson", response_model_path(schema, ORJSONResponse), content, repeat),
+        measure("TypeAdapter.dump_json", lambda c: json_response(schema, c).body, content, repeat),
+    ]
+    assert len({json.dumps(json.loads(body), sort_keys=True) for body in bodies}) == 1, "JSON différents"
+
+    # Validation depuis des dictionnaires : anciens __init__ contre schémas actuels
+    data = json.loads(bodies[0])
+    measure("dicts, __init__ journalisé", lambda d: response_model_path(legacy_schema, ORJSONResponse)(d), data, repeat)
+    measure("dicts, schémas actuels", lambda d: response_model_path(schema, ORJSONResponse)(d), data, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=100, help="taille de la page /books/")
+    parser.add_argument("--loans", type=int, default=500, help="nombre d'emprunts de /loans/")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = seed_database(temp_database_url("serialization"), books=max(args.books, 1000), users=200, loans=args.loans)
+    seed_categories(engine, max(args.books, 1000))
+    db = sessionmaker(bind=engine)()
+    try:
+        query = db.query(BookModel).options(selectinload(BookModel.categories))
+        page = paginate(query, PaginationParams(skip=0, limit=args.books), BookModel)
+        loans = db.query(LoanModel).options(
+            joinedload(LoanModel.user), joinedload(LoanModel.book).selectinload(BookModel.categories)
+        ).all()
+        compare(f"/books/ : Page[Book] de {len(page.items)} livres", Page[Book], Page[LegacyBook], page, args.repeat)
+        compare(f"/loans/ : {len(loans)} emprunts détaillés", List[LoanWithDetails], List[LegacyLoanWithDetails], loans, args.repeat)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
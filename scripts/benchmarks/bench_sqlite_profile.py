@@ -0,0 +1,87 @@
+"""
+Débit en lecture/écriture concurrentes sur SQLite, avec et sans le profil
+de production (WAL, synchronous=NORMAL, busy_timeout, cache, mmap, temp_store).
+Des threads lecteurs lisent des livres et des pages de livres, des threads
+écrivains modifient le stock (une transaction par écriture), pendant une durée fixe.
+
+    python scripts/benchmarks/bench_sqlite_profile.py --readers 8 --writers 4 --duration 10
+"""
+import argparse
+import random
+import threading
+import time
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.exc import OperationalError
+
+from seed import seed_database, temp_database_url
+from src.db.profile import apply_sqlite_profile, engine_options, sqlite_pragmas
+from src.models import Book
+
+
+def run(url, *, profile, readers, writers, duration, books):
+    engine = create_engine(url, **engine_options(url))
+    if profile:
+        apply_sqlite_profile(engine, sqlite_pragmas())
+    else:
+        # Réglages par défaut de SQLite (le journal WAL est persistant dans le fichier)
+        apply_sqlite_profile(engine, {"journal_mode": "DELETE"})
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def reader():
+        rng, done = random.Random(), 0
+        with engine.connect() as connection:
+            while time.perf_counter() < stop:
+                connection.execute(select(Book).where(Book.id == rng.randint(1, books))).first()
+                connection.execute(select(Book).order_by(Book.id).offset(rng.randint(0, books - 20)).limit(20)).all()
+                connection.rollback()
+                done += 1
+        with lock:
+            counts["reads"] += done
+
+    def writer():
+        rng, done, locked = random.Random(), 0, 0
+        while time.perf_counter() < stop:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(
+                        update(Book).where(Book.id == rng.randint(1, books)).values(quantity=Book.quantity + 1)
+                    )
+                done += 1
+            except OperationalError:
+                locked += 1
+        with lock:
+            counts["writes"] += done
+            counts["locked"] += locked
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return {name: value / duration if name != "locked" else value for name, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=20_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    for label, profile in (("défaut", False), ("profil", True)):
+        url = temp_database_url("profile")
+        seed_database(url, books=args.books, users=10, loans=0).dispose()
+        result = run(url, profile=profile, readers=args.readers, writers=args.writers,
+                     duration=args.duration, books=args.books)
+        print(f"{label:<7} lectures {result['reads']:8.0f}/s  écritures {result['writes']:7.0f}/s  "
+              f"verrous (database is locked) {result['locked']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark de StatsService.get_general_stats : sept requêtes séparées
+(implémentation historique) contre une requête combinée.
+
+    python scripts/benchmarks/bench_stats.py --books 200000 --users 50000 --loans 500000
+"""
+import argparse
+import time
+from datetime import datetime
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import sessionmaker
+
+from seed import seed_database, temp_database_url
+from src.models import Book, User, Loan
+from src.services.stats import StatsService
+
+
+def legacy_general_stats(db):
+    """
+    Implémentation d'origine : un aller-retour par agrégat.
+    """
+    return {
+        "total_books": db.query(func.sum(Book.quantity)).scalar() or 0,
+        "unique_books": db.query(func.count(Book.id)).scalar() or 0,
+        "total_users": db.query(func.count(User.id)).scalar() or 0,
+        "active_users": db.query(func.count(User.id)).filter(User.is_active == True).scalar() or 0,
+        "total_loans": db.query(func.count(Loan.id)).scalar() or 0,
+        "active_loans": db.query(func.count(Loan.id)).filter(Loan.return_date == None).scalar() or 0,
+        "overdue_loans": db.query(func.count(Loan.id)).filter(
+            Loan.return_date == None,
+            Loan.due_date < datetime.utcnow()
+        ).scalar() or 0,
+    }
+
+
+def measure(label, func, db, statements, repeat):
+    func(db)  # échauffement (cache de pages SQLite)
+    statements.clear()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(db)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<10} {elapsed * 1000:8.2f} ms/appel  {len(statements) // repeat} requête(s)/appel")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--loans", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Création de la base ({args.books} livres, {args.users} utilisateurs, {args.loans} emprunts)...")
+    engine = seed_database(temp_database_url("stats"), books=args.books, users=args.users, loans=args.loans)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *a: statements.append(statement))
+
+    db = sessionmaker(bind=engine)()
+    try:
+        legacy = measure("séparées", legacy_general_stats, db, statements, args.repeat)
+        combined = measure("combinée", lambda s: StatsService(s).get_general_stats(), db, statements, args.repeat)
+    finally:
+        db.close()
+    assert legacy == combined, (legacy, combined)
+    print("Résultats identiques :", combined)
+
+
+if __name__ == "__main__":
+    main()
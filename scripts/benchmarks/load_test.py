@@ -0,0 +1,439 @@
+"""
+Test de charge de l'application complète (src.main:app servie par uvicorn,
+sur une base SQLite temporaire). Des utilisateurs virtuels concurrents, un
+compte et une connexion keep-alive chacun, enchaînent un mélange pondéré de
+scénarios :
+
+- browse   : GET /books/ (page de 20) ou GET /books/{id}
+- search   : GET /books/search/?query=... ou GET /books/search/title/{title}
+- login    : POST /auth/login
+- checkout : POST /loans/me
+- return   : POST /loans/{id}/return d'un emprunt de l'utilisateur virtuel
+             (route réservée aux administrateurs : token administrateur)
+- stats    : GET /stats/general, /stats/most-borrowed-books ou
+             /stats/monthly-loans (administrateur)
+
+Latences p50/p95/p99, débit et taux d'erreur par endpoint sont écrits dans
+un fichier JSON, avec le commit et la configuration, pour comparer les
+exécutions d'un commit à l'autre (--compare).
+
+Les refus métier attendus d'un emprunt (409 livre indisponible ou déjà
+emprunté, 403 limite d'emprunts) sont comptés à part (rejected) ; les
+erreurs sont les autres statuts et les échecs de connexion. Les requêtes
+de la période d'échauffement (--warmup, démarrage progressif des
+utilisateurs) ne sont pas comptées.
+
+    python scripts/benchmarks/load_test.py --users 50 --duration 60 --workers 2 \\
+        --mix browse=50,search=20,login=5,checkout=10,return=10,stats=5
+    python scripts/benchmarks/load_test.py --compare results/load-<commit>.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+from seed import seed_database, temp_database_url
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from src.models.counters import LibraryCounter
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.counters import CounterRepository
+from src.services.loans import MAX_ACTIVE_LOANS
+from src.utils.security import crypt_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+PREFIX = "/api/v1"
+PASSWORD = "password123"
+ADMIN_EMAIL = "admin@example.com"
+
+SCENARIOS = ("browse", "search", "login", "checkout", "return", "stats")
+DEFAULT_MIX = "browse=50,search=20,login=5,checkout=10,return=10,stats=5"
+SEARCH_TERMS = ("roman", "essai", "histoire", "poésie")
+STATS_PATHS = ("/stats/general", "/stats/most-borrowed-books", "/stats/monthly-loans")
+
+# Statuts attendus en réponse à un refus métier (pas des erreurs)
+REJECTIONS = {"POST /loans/me": {403, 409}}
+
+
+def parse_mix(text):
+    """
+    "browse=50,search=20,..." -> {"browse": 50.0, ...} (poids relatifs).
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Scénario inconnu : {name} (parmi {', '.join(SCENARIOS)})")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Poids invalide pour {name} : {weight!r}")
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"Poids négatif pour {name}")
+    if not sum(mix.values()):
+        raise argparse.ArgumentTypeError("Le mélange doit avoir au moins un poids positif")
+    return mix
+
+
+def percentile(values, p):
+    # Rang le plus proche, sur des valeurs triées
+    return values[max(0, min(len(values) - 1, math.ceil(p / 100 * len(values)) - 1))]
+
+
+class VirtualUser:
+    """
+    Un utilisateur virtuel : une connexion keep-alive, un compte, ses emprunts en cours.
+    """
+    def __init__(self, index, args, admin_token, measure_from):
+        self.email = f"user{index + 1}@example.com"
+        self.args = args
+        self.admin_token = admin_token
+        self.measure_from = measure_from
+        self.rng = random.Random(args.seed * 100_003 + index)
+        self.connection = None
+        self.token = None
+        self.loans = []
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def request(self, endpoint, method, path, *, body=None, token=None, form=False):
+        headers = {}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if body is not None:
+            headers["Content-Type"] = "application/x-www-form-urlencoded" if form else "application/json"
+            body = urllib.parse.urlencode(body) if form else json.dumps(body)
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.args.host, self.args.port, timeout=self.args.timeout)
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, PREFIX + path, body, headers)
+            response = self.connection.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            # Connexion perdue ou délai dépassé : reconnexion à la prochaine requête
+            self.connection.close()
+            self.connection = None
+            data, status = b"", None
+        if start >= self.measure_from:
+            self.samples[endpoint].append(time.perf_counter() - start)
+            self.statuses[endpoint][str(status) if status else "connection_error"] += 1
+        return status, data
+
+    def login(self):
+        status, data = self.request(
+            "POST /auth/login", "POST", "/auth/login",
+            body={"username": self.email, "password": PASSWORD}, form=True,
+        )
+        if status == 200:
+            self.token = json.loads(data)["access_token"]
+
+    def browse(self):
+        if self.rng.random() < 0.5:
+            skip = self.rng.randrange(0, max(1, self.args.books - 20))
+            self.request("GET /books/", "GET", f"/books/?skip={skip}&limit=20")
+        else:
+            self.request("GET /books/{id}", "GET", f"/books/{self.rng.randint(1, self.args.books)}", token=self.token)
+
+    def search(self):
+        if self.rng.random() < 0.5:
+            query = urllib.parse.quote(self.rng.choice(SEARCH_TERMS))
+            self.request("GET /books/search/", "GET", f"/books/search/?query={query}&limit=20", token=self.token)
+        else:
+            title = urllib.parse.quote(f"Titre {self.rng.randint(1, self.args.books)}")
+            self.request("GET /books/search/title/{title}", "GET", f"/books/search/title/{title}", token=self.token)
+
+    def checkout(self):
+        if len(self.loans) >= MAX_ACTIVE_LOANS:
+            return self.return_()
+        status, data = self.request(
+            "POST /loans/me", "POST", "/loans/me",
+            body={"book_id": self.rng.randint(1, self.args.books)}, token=self.token,
+        )
+        if status == 201:
+            self.loans.append(json.loads(data)["id"])
+
+    def return_(self):
+        if not self.loans:
+            return self.checkout()
+        loan_id = self.loans.pop(self.rng.randrange(len(self.loans)))
+        self.request("POST /loans/{id}/return", "POST", f"/loans/{loan_id}/return", token=self.admin_token)
+
+    def stats(self):
+        path = self.rng.choice(STATS_PATHS)
+        self.request(f"GET {path}", "GET", path, token=self.admin_token)
+
+    def run(self, start_at, deadline, mix):
+        actions = {
+            "browse": self.browse, "search": self.search, "login": self.login,
+            "checkout": self.checkout, "return": self.return_, "stats": self.stats,
+        }
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        time.sleep(max(0.0, start_at - time.perf_counter()))
+        self.login()
+        while time.perf_counter() < deadline:
+            actions[self.rng.choices(names, weights)[0]]()
+            if self.args.think_time:
+                time.sleep(self.rng.expovariate(1 / self.args.think_time))
+        if self.connection is not None:
+            self.connection.close()
+
+
+def history_rows(args, now):
+    # Emprunts rendus sur l'année écoulée ; un couple (utilisateur, livre)
+    # au plus une fois (contrainte d'unicité de `loan`)
+    rng = random.Random(args.seed)
+    for pair in rng.sample(range(args.users * args.books), min(args.history, args.users * args.books)):
+        loan_date = now - timedelta(days=rng.randint(15, 365))
+        yield {
+            "user_id": pair // args.books + 1,
+            "book_id": pair % args.books + 1,
+            "loan_date": loan_date,
+            "due_date": loan_date + timedelta(days=14),
+            "return_date": loan_date + timedelta(days=rng.randint(1, 14)),
+            "extended": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def prepare_database(args):
+    """
+    Base temporaire : catalogue, un compte actif par utilisateur virtuel, un
+    administrateur et un historique d'emprunts rendus (pour les statistiques).
+    """
+    url = temp_database_url("load")
+    engine = seed_database(url, books=args.books, users=args.users, loans=0, seed=args.seed)
+    hashed_password = crypt_context(args.rounds).hash(PASSWORD)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(update(User).values(is_active=True, hashed_password=hashed_password))
+        connection.execute(insert(Loan), list(history_rows(args, now)))
+        connection.execute(insert(User), [{
+            "email": ADMIN_EMAIL, "hashed_password": hashed_password, "full_name": "Administrateur",
+            "is_active": True, "is_admin": True, "created_at": now, "updated_at": now,
+        }])
+    # Compteurs initialisés, comme après scripts/reconcile_counters.py
+    with Session(engine) as db:
+        CounterRepository(LibraryCounter, db).reconcile(fix=True)
+    engine.dispose()
+    return url
+
+
+def start_server(args, url):
+    directory = tempfile.mkdtemp(prefix="biblio-")
+    env = dict(
+        os.environ, DATABASE_URL=url, API_V1_STR=PREFIX, BCRYPT_ROUNDS=str(args.rounds),
+        LOG_FILE=os.path.join(directory, "app.log"), LOG_LEVEL=args.log_level,
+        # Clé commune aux workers uvicorn
+        SECRET_KEY=secrets.token_urlsafe(32), JWT_KEYS_FILE=os.path.join(directory, "jwt_keys.json"),
+    )
+    # Sortie console du serveur à part : le rapport reste lisible
+    server_log = open(os.path.join(directory, "server.log"), "w")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", args.host, "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=server_log, stderr=subprocess.STDOUT,
+    )
+    server_log.close()
+    for _ in range(300):
+        try:
+            connection = http.client.HTTPConnection(args.host, args.port, timeout=1)
+            connection.request("GET", "/")
+            connection.getresponse().read()
+            print(f"Journaux du serveur : {directory}")
+            return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Le serveur n'a pas démarré (voir {server_log.name})")
+
+
+def admin_login(args):
+    connection = http.client.HTTPConnection(args.host, args.port, timeout=args.timeout)
+    body = urllib.parse.urlencode({"username": ADMIN_EMAIL, "password": PASSWORD})
+    connection.request("POST", f"{PREFIX}/auth/login", body, {"Content-Type": "application/x-www-form-urlencoded"})
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"Connexion administrateur impossible ({response.status})")
+    return json.loads(data)["access_token"]
+
+
+def summarize(latencies, statuses, elapsed, rejections=()):
+    latencies = sorted(latencies)
+    requests = len(latencies)
+    ok = sum(count for status, count in statuses.items() if status.isdigit() and int(status) < 400)
+    rejected = sum(count for status, count in statuses.items() if status.isdigit() and int(status) in rejections)
+    errors = requests - ok - rejected
+    summary = {
+        "requests": requests,
+        "throughput": round(requests / elapsed, 2),
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "rejected": rejected,
+        "statuses": dict(sorted(statuses.items())),
+    }
+    if latencies:
+        summary["latency_ms"] = {
+            "mean": round(sum(latencies) / requests * 1000, 2),
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2),
+        }
+    return summary
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(dirty)
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def run(args):
+    url = prepare_database(args)
+    print(f"Base : {url} ({args.books} livres, {args.history} emprunts, {args.users} comptes)")
+    process = start_server(args, url)
+    try:
+        admin_token = admin_login(args)
+        now = time.perf_counter()
+        measure_from = now + args.warmup
+        deadline = measure_from + args.duration
+        users = [VirtualUser(index, args, admin_token, measure_from) for index in range(args.users)]
+        threads = [
+            # Démarrage progressif pendant l'échauffement
+            threading.Thread(target=user.run, args=(now + args.warmup * index / args.users, deadline, args.mix))
+            for index, user in enumerate(users)
+        ]
+        print(f"{args.users} utilisateurs virtuels, {args.warmup:g} s d'échauffement puis {args.duration:g} s "
+              f"de mesure, {args.workers} worker(s) uvicorn, coût bcrypt {args.rounds}")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - measure_from
+    finally:
+        process.terminate()
+        process.wait()
+
+    latencies, statuses = defaultdict(list), defaultdict(Counter)
+    for user in users:
+        for endpoint, samples in user.samples.items():
+            latencies[endpoint].extend(samples)
+            statuses[endpoint].update(user.statuses[endpoint])
+    endpoints = {
+        endpoint: summarize(latencies[endpoint], statuses[endpoint], elapsed, REJECTIONS.get(endpoint, ()))
+        for endpoint in sorted(latencies)
+    }
+    total = summarize([latency for samples in latencies.values() for latency in samples], sum(statuses.values(), Counter()), elapsed)
+    total["rejected"] = sum(summary["rejected"] for summary in endpoints.values())
+    total["errors"] = sum(summary["errors"] for summary in endpoints.values())
+    total["error_rate"] = round(total["errors"] / total["requests"], 4) if total["requests"] else 0.0
+
+    commit, dirty = git_revision()
+    return {
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "elapsed": round(elapsed, 2),
+            "config": {
+                "users": args.users, "duration": args.duration, "warmup": args.warmup, "workers": args.workers,
+                "mix": args.mix, "think_time": args.think_time, "books": args.books, "history": args.history,
+                "rounds": args.rounds, "log_level": args.log_level, "seed": args.seed,
+            },
+        },
+        "total": total,
+        "endpoints": endpoints,
+    }
+
+
+def print_report(result, baseline=None):
+    def row(name, summary, reference):
+        latency = summary.get("latency_ms", {})
+        line = (f"  {name:<34} {summary['requests']:7d} {summary['throughput']:8.1f}/s "
+                f"{latency.get('p50', float('nan')):8.1f} {latency.get('p95', float('nan')):8.1f} "
+                f"{latency.get('p99', float('nan')):8.1f} ms  err {summary['error_rate']:6.1%}  rej {summary['rejected']:5d}")
+        if reference and reference.get("latency_ms") and latency:
+            delta = latency["p95"] / reference["latency_ms"]["p95"] - 1 if reference["latency_ms"]["p95"] else 0.0
+            line += f"  | p95 {reference['latency_ms']['p95']:8.1f} ms ({delta:+.0%}), {reference['throughput']:.1f}/s"
+        return line
+
+    print(f"  {'endpoint':<34} {'requêtes':>7} {'débit':>10} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, summary in result["endpoints"].items():
+        print(row(endpoint, summary, (baseline or {}).get("endpoints", {}).get(endpoint)))
+    print(row("total", result["total"], (baseline or {}).get("total")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="utilisateurs virtuels concurrents")
+    parser.add_argument("--duration", type=float, default=30, help="durée de la mesure (s)")
+    parser.add_argument("--warmup", type=float, default=5, help="échauffement non mesuré (s)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"poids des scénarios ({DEFAULT_MIX})")
+    parser.add_argument("--think-time", type=float, default=0.0, help="pause moyenne entre deux actions (s)")
+    parser.add_argument("--workers", type=int, default=1, help="workers uvicorn")
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--history", type=int, default=20_000, help="emprunts rendus en base (statistiques)")
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--log-level", default="WARNING", help="LOG_LEVEL du serveur")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--timeout", type=float, default=60, help="délai maximal d'une requête (s)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="fichier JSON (par défaut results/load-<commit>-<date>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="exécution de référence à comparer")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    result = run(args)
+    output = args.output
+    if output is None:
+        commit = (result["meta"]["commit"] or "unknown")[:10] + ("-dirty" if result["meta"]["dirty"] else "")
+        output = os.path.join(RESULTS_DIRECTORY, f"load-{commit}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(result, file, indent=2, ensure_ascii=False)
+
+    if baseline:
+        print(f"Référence : {args.compare} (commit {(baseline['meta'].get('commit') or '?')[:10]})")
+    print_report(result, baseline)
+    print(f"Résultats : {output}")
+    return 1 if result["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
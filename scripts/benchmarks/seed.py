@@ -0,0 +1,92 @@
+"""
+Création d'une base SQLite volumineuse pour les benchmarks.
+"""
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Ajouter le répertoire racine au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+
+from src.models import Base, Book, User, Loan
+
+CHUNK_SIZE = 10_000
+
+
+def temp_database_url(name: str = "bench") -> str:
+    """
+    URL d'une base SQLite temporaire (fichier) pour un benchmark.
+    """
+    directory = tempfile.mkdtemp(prefix="biblio-")
+    return f"sqlite:///{os.path.join(directory, name + '.db')}"
+
+
+def _insert_chunked(engine: Engine, table, rows) -> None:
+    chunk = []
+    with engine.begin() as connection:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= CHUNK_SIZE:
+                connection.execute(insert(table), chunk)
+                chunk = []
+        if chunk:
+            connection.execute(insert(table), chunk)
+
+
+def seed_database(url: str, *, books: int, users: int, loans: int, seed: int = 42) -> Engine:
+    """
+    Crée le schéma et insère `books` livres, `users` utilisateurs et `loans` emprunts.
+    """
+    rng = random.Random(seed)
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+
+    _insert_chunked(engine, Book.__table__, (
+        {
+            "title": f"Titre {i} {rng.choice(['roman', 'essai', 'histoire', 'poésie'])}",
+            "author": f"Auteur {i % 5000}",
+            "isbn": f"{i:013d}",
+            "publication_year": rng.randint(1900, 2020),
+            "description": f"Description du livre {i}",
+            "quantity": rng.randint(0, 10),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(1, books + 1)
+    ))
+    _insert_chunked(engine, User.__table__, (
+        {
+            "email": f"user{i}@example.com",
+            "hashed_password": "x",
+            "full_name": f"Utilisateur {i}",
+            "is_active": rng.random() > 0.1,
+            "is_admin": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(1, users + 1)
+    ))
+
+    def loan_rows():
+        for _ in range(loans):
+            loan_date = now - timedelta(days=rng.randint(0, 365))
+            returned = rng.random() < 0.8
+            yield {
+                "user_id": rng.randint(1, users),
+                "book_id": rng.randint(1, books),
+                "loan_date": loan_date,
+                "due_date": loan_date + timedelta(days=14),
+                "return_date": loan_date + timedelta(days=rng.randint(1, 20)) if returned else None,
+                "extended": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+
+    _insert_chunked(engine, Loan.__table__, loan_rows())
+    return engine
@@ -0,0 +1,55 @@
+import argparse
+import sys
+import os
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.session import SessionLocal
+from src.exceptions import CustomException
+from src.models.books import Book
+from src.models.categories import Category
+from src.repositories.books import BookRepository
+from src.repositories.categories import CategoryRepository
+from src.services.imports import BookImportService, detect_format, DEFAULT_BATCH_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Importe un catalogue de livres (CSV avec en-tête ou JSONL) par lots."
+    )
+    parser.add_argument("path", help="Fichier à importer")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Format (par défaut : extension du fichier)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-errors", type=int, default=20, help="Nombre d'erreurs affichées")
+    args = parser.parse_args()
+
+    try:
+        fmt = detect_format(args.path, args.format)
+    except CustomException as e:
+        print(e.message, file=sys.stderr)
+        return 2
+
+    def progress(report):
+        print(f"\rLot {report.batches} : {report.total} lignes lues, {report.imported} créées, {report.failed} rejetées",
+              end="", flush=True)
+
+    db = SessionLocal()
+    try:
+        service = BookImportService(BookRepository(Book, db), CategoryRepository(Category, db), batch_size=args.batch_size)
+        with open(args.path, "rb") as stream:
+            report = service.import_file(stream, fmt, on_progress=progress)
+    finally:
+        db.close()
+    print()
+
+    for error in report.errors[:args.max_errors]:
+        print(f"ligne {error.line} ({error.isbn or '?'}) : {'; '.join(error.errors)}")
+    if report.failed > args.max_errors:
+        print(f"... {report.failed - args.max_errors} autre(s) ligne(s) rejetée(s)")
+    print(f"{report.imported} livre(s) importé(s), {report.failed} ligne(s) rejetée(s) sur {report.total}.")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
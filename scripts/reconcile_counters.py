@@ -0,0 +1,36 @@
+import argparse
+import sys
+import os
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.session import SessionLocal
+from src.models.counters import LibraryCounter
+from src.repositories.counters import CounterRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recalcule les compteurs de la bibliothèque à partir des tables de base."
+    )
+    parser.add_argument("--check", action="store_true", help="Signaler les écarts sans corriger")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = CounterRepository(LibraryCounter, db).reconcile(fix=not args.check)
+    finally:
+        db.close()
+
+    if not drift:
+        print("Compteurs à jour, aucun écart.")
+        return 0
+    for name, values in drift.items():
+        print(f"{name}: stocké={values['stored']} réel={values['actual']}")
+    print("Écarts signalés." if args.check else "Compteurs corrigés.")
+    return 1 if args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+import argparse
+import sys
+import os
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import settings
+from src.utils.jwt_keys import read_key_file, rotate_key
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ajoute une clé JWT au trousseau partagé et la rend active. "
+                    "Les workers la prennent en compte sans redémarrage ; les tokens "
+                    "signés avec les anciennes clés restent valides jusqu'à leur retrait."
+    )
+    parser.add_argument("--file", default=settings.JWT_KEYS_FILE, help="Fichier de clés (JWT_KEYS_FILE)")
+    parser.add_argument("--retire", nargs="*", default=[], metavar="KID", help="Clés à retirer du trousseau")
+    args = parser.parse_args()
+
+    if not args.file:
+        print("JWT_KEYS_FILE n'est pas défini.")
+        return 1
+    kid = rotate_key(args.file, retire=args.retire)
+    print(f"Clé active : {kid}")
+    print(f"Clés du trousseau : {', '.join(read_key_file(args.file)['keys'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
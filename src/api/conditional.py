@@ -0,0 +1,82 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+logger = logging.getLogger(__name__)
+
+# Les clients (frontend, navigateurs) peuvent stocker la réponse mais doivent
+# la revalider à chaque fois : 304 tant que les données n'ont pas changé
+PUBLIC_CACHE_CONTROL = "no-cache"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(request: Request, state: Any) -> str:
+    """
+    ETag faible dérivé de l'état des données et de la requête (chemin et
+    paramètres) : deux requêtes différentes n'ont jamais le même ETag.
+    """
+    raw = json.dumps([request.url.path, sorted(request.query_params.multi_items()), state], default=str)
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Comparaison faible (RFC 9110) : le préfixe W/ est ignoré
+    if header.strip() == "*":
+        return True
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _http_date(value: datetime) -> str:
+    # Les dates de la base sont en UTC, sans fuseau
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Évalue If-None-Match, ou à défaut If-Modified-Since (RFC 9110 §13.2.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    state: Any,
+    last_modified: Optional[datetime] = None,
+    private: bool = False
+) -> Optional[Response]:
+    """
+    Renvoie une réponse 304 si le client a déjà la représentation courante ;
+    sinon ajoute ETag, Last-Modified et Cache-Control à `response` et renvoie
+    None (la route exécute alors sa requête principale).
+    """
+    etag = make_etag(request, state)
+    headers: Dict[str, str] = {
+        "ETag": etag,
+        "Cache-Control": PRIVATE_CACHE_CONTROL if private else PUBLIC_CACHE_CONTROL,
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    if is_not_modified(request, etag, last_modified):
+        logger.debug(f"304 Not Modified pour {request.url.path}")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
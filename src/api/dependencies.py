@@ -2,41 +2,39 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..db.session import get_db
+from ..db.session import get_db, get_async_db
 from ..models.users import User
-from ..repositories.users import UserRepository
-from ..services.users import UserService
+from ..repositories.users import UserRepository, AsyncUserRepository
+from ..services.users import UserService, AsyncUserService
 from ..api.schemas.token import TokenPayload
-from ..utils.security import ALGORITHM
+from ..utils.principal_cache import cache_principal, cached_principal, principal_generation
+from ..utils.jwt_keys import ALGORITHM, verification_key
 from ..config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+def decode_token(token: str) -> TokenPayload:
     """
-    Dépendance pour obtenir l'utilisateur actuel à partir du token JWT.
+    Décode et valide le token JWT, avec la clé du trousseau désignée par son `kid`.
     """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
+        key = verification_key(jwt.get_unverified_header(token).get("kid"))
+        if key is None:
+            raise JWTError("Clé de signature inconnue")
+        payload = jwt.decode(token, key, algorithms=[ALGORITHM])
+        return TokenPayload(**payload)
     except (JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Impossible de valider les informations d'identification",
         )
-    
-    repository = UserRepository(User, db)
-    service = UserService(repository)
-    user = service.get(id=token_data.sub)
-    
+
+
+def ensure_user_found(user: User) -> User:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -45,18 +43,71 @@ def get_current_user(
     return user
 
 
+def ensure_user_active(user: User) -> User:
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Utilisateur inactif",
+        )
+    return user
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Dépendance pour obtenir l'utilisateur actuel à partir du token JWT.
+    Un token déjà vu est résolu par le cache, sans décodage ni requête.
+    """
+    cached = cached_principal(token)
+    if cached is not None:
+        return db.merge(cached, load=False)
+    generation = principal_generation()
+    token_data = decode_token(token)
+    repository = UserRepository(User, db)
+    service = UserService(repository)
+    user = ensure_user_found(service.get(id=token_data.sub))
+    cache_principal(token, user, token_data.exp, generation)
+    return user
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
     """
     Dépendance pour obtenir l'utilisateur actif actuel.
     """
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Utilisateur inactif",
-        )
-    return current_user
+    return ensure_user_active(current_user)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Version asynchrone de get_current_user, pour les routes asynchrones
+    (évite d'occuper un thread du pool pour l'authentification).
+    """
+    cached = cached_principal(token)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+    generation = principal_generation()
+    token_data = decode_token(token)
+    repository = AsyncUserRepository(User, db)
+    service = AsyncUserService(repository)
+    user = ensure_user_found(await service.get(id=token_data.sub))
+    cache_principal(token, user, token_data.exp, generation)
+    return user
+
+
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    """
+    Version asynchrone de get_current_active_user.
+    """
+    return ensure_user_active(current_user)
 
 
 def get_current_admin_user(
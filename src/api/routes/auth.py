@@ -1,14 +1,14 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
-from ...db.session import get_db
+from ...db.session import get_async_db
 from ...models.users import User as UserModel
 from ..schemas.token import Token
-from ...repositories.users import UserRepository
-from ...services.users import UserService
+from ...repositories.users import AsyncUserRepository
+from ...services.users import AsyncUserService
 from ...utils.security import create_access_token
 from ...config import settings
 from src.exceptions import CustomException  # Ajout de l'import
@@ -19,18 +19,20 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login_access_token(
-    db: Session = Depends(get_db),
+async def login_access_token(
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
     """
     OAuth2 compatible token login, get an access token for future requests.
+
+    Asynchrone : bcrypt s'exécute dans le pool de hachage, pas dans un thread du serveur.
     """
     logger.info("Login attempt for user: %s", form_data.username)
-    repository = UserRepository(UserModel, db)
-    service = UserService(repository)
+    repository = AsyncUserRepository(UserModel, db)
+    service = AsyncUserService(repository)
     try:
-        user = service.authenticate(email=form_data.username, password=form_data.password)
+        user = await service.authenticate(email=form_data.username, password=form_data.password)
         if not user:
             logger.warning("Failed login for user: %s (invalid credentials)", form_data.username)
             raise CustomException("Email ou mot de passe incorrect", status_code=status.HTTP_401_UNAUTHORIZED)
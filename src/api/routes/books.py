@@ -1,16 +1,20 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from typing import List, Any, Optional
-from ...utils.pagination import PaginationParams, paginate, Page
-from ...db.session import get_db
+from ...utils.pagination import PaginationParams, Page
+from ...db.session import get_db, get_read_db, get_async_db, get_async_read_db
 from ...models.books import Book as BookModel
-from ...models.books import book_category  # nécessaire pour la jointure
-from ..schemas.books import Book, BookCreate, BookUpdate
-from ...repositories.books import BookRepository
-from ...services.books import BookService
-from ..dependencies import get_current_active_user, get_current_admin_user
+from ..schemas.books import Book, BookCreate, BookUpdate, BookImportReport
+from ...models.categories import Category as CategoryModel
+from ...repositories.books import BookRepository, AsyncBookRepository
+from ...repositories.categories import CategoryRepository
+from ...services.books import BookService, AsyncBookService
+from ...services.imports import BookImportService, detect_format, DEFAULT_BATCH_SIZE
+from ..conditional import conditional_response
+from ..serialization import json_response
+from ..dependencies import get_current_active_user, get_current_admin_user, get_current_active_user_async
 from src.exceptions import CustomException  # Ajout de l'import
 
 logger = logging.getLogger(__name__)
@@ -18,18 +22,25 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/", response_model=Page[Book])
-def read_books(
-    db: Session = Depends(get_db),
+async def read_books(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     sort_by: Optional[str] = Query(None),
-    sort_desc: bool = Query(False)
+    sort_desc: bool = Query(False),
+    cursor: Optional[str] = Query(None, description="Curseur opaque renvoyé par la page précédente"),
+    keyset: bool = Query(False, description="Pagination par curseur (sans skip ni total)"),
+    include_total: Optional[bool] = Query(None, description="Calculer le total (par défaut : oui en mode offset, non en mode curseur)")
 ) -> Any:
-    logger.info("Fetching books: skip=%s, limit=%s, sort_by=%s, sort_desc=%s", skip, limit, sort_by, sort_desc)
-    repository = BookRepository(BookModel, db)
-    query = db.query(BookModel)
-    params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
-    return paginate(query, params, BookModel)
+    logger.info("Fetching books: skip=%s, limit=%s, sort_by=%s, sort_desc=%s, keyset=%s", skip, limit, sort_by, sort_desc, keyset or cursor is not None)
+    service = AsyncBookService(AsyncBookRepository(BookModel, db))
+    not_modified = conditional_response(request, response, *await service.get_state())
+    if not_modified:
+        return not_modified
+    params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc, cursor=cursor, keyset=keyset, include_total=include_total)
+    return json_response(Page[Book], await service.paginate(params=params), response)
 
 @router.post("/", response_model=Book, status_code=status.HTTP_201_CREATED)
 def create_book(
@@ -58,18 +69,62 @@ def create_book(
             detail="Erreur interne lors de la création du livre"
         )
 
-@router.get("/{id}", response_model=Book)
-def read_book(
+@router.post("/import", response_model=BookImportReport)
+def import_books(
     *,
     db: Session = Depends(get_db),
+    file: UploadFile = File(..., description="Fichier CSV (avec en-tête) ou JSONL"),
+    format: Optional[str] = Query(None, description="csv ou jsonl (par défaut : extension du fichier)"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Import en masse de livres. Le fichier est lu en flux et traité par lots ;
+    les lignes invalides ou en doublon sont rejetées et listées dans le rapport.
+    """
+    logger.info("Importing books from %s (batch_size=%s)", file.filename, batch_size)
+    try:
+        fmt = detect_format(file.filename, format)
+        service = BookImportService(BookRepository(BookModel, db), CategoryRepository(CategoryModel, db), batch_size=batch_size)
+        report = service.import_file(file.file, fmt)
+        logger.info("Books imported: %s created, %s rejected", report.imported, report.failed)
+        return report
+    except CustomException as e:
+        logger.error("Error importing books: %s", e)
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message
+        )
+    except UnicodeDecodeError as e:
+        logger.error("Error importing books: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Le fichier doit être encodé en UTF-8"
+        )
+    except Exception as e:
+        logger.error("Unexpected error importing books: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur interne lors de l'import des livres"
+        )
+
+@router.get("/{id}", response_model=Book)
+async def read_book(
+    *,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     id: int,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_active_user_async)
 ) -> Any:
     logger.info("Fetching book with ID: %s", id)
-    repository = BookRepository(BookModel, db)
-    service = BookService(repository)
+    repository = AsyncBookRepository(BookModel, db)
+    service = AsyncBookService(repository)
     try:
-        book = service.get(id=id)
+        not_modified = conditional_response(request, response, *await service.get_state(book_id=id), private=True)
+        if not_modified:
+            return not_modified
+        book = await service.get(id=id)
         if not book:
             logger.warning("Book not found: ID %s", id)
             raise CustomException("Livre non trouvé", status_code=status.HTTP_404_NOT_FOUND)
@@ -154,7 +209,7 @@ def delete_book(
 @router.get("/search/title/{title}", response_model=List[Book])
 def search_books_by_title(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     title: str,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -163,7 +218,7 @@ def search_books_by_title(
     service = BookService(repository)
     try:
         books = service.get_by_title(title=title)
-        return books
+        return json_response(List[Book], books)
     except Exception as e:
         logger.error("Error searching books by title: %s", e)
         raise HTTPException(
@@ -174,7 +229,7 @@ def search_books_by_title(
 @router.get("/search/author/{author}", response_model=List[Book])
 def search_books_by_author(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     author: str,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -183,7 +238,7 @@ def search_books_by_author(
     service = BookService(repository)
     try:
         books = service.get_by_author(author=author)
-        return books
+        return json_response(List[Book], books)
     except Exception as e:
         logger.error("Error searching books by author: %s", e)
         raise HTTPException(
@@ -194,7 +249,7 @@ def search_books_by_author(
 @router.get("/search/isbn/{isbn}", response_model=Book)
 def search_book_by_isbn(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     isbn: str,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -220,8 +275,10 @@ def search_book_by_isbn(
         )
 
 @router.get("/search/", response_model=Page[Book])
-def search_books(
-    db: Session = Depends(get_db),
+async def search_books(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     query: Optional[str] = Query(None, min_length=1),
     category_id: Optional[int] = Query(None),
     author: Optional[str] = Query(None),
@@ -230,31 +287,31 @@ def search_books(
     limit: int = Query(100, ge=1, le=100),
     sort_by: Optional[str] = Query(None),
     sort_desc: bool = Query(False),
-    current_user = Depends(get_current_active_user)
+    cursor: Optional[str] = Query(None, description="Curseur opaque renvoyé par la page précédente"),
+    keyset: bool = Query(False, description="Pagination par curseur (sans skip ni total)"),
+    include_total: Optional[bool] = Query(None, description="Calculer le total (par défaut : oui en mode offset, non en mode curseur)"),
+    current_user = Depends(get_current_active_user_async)
 ) -> Any:
     logger.info("Advanced search: query=%s, category_id=%s, author=%s, publication_year=%s", query, category_id, author, publication_year)
-    repository = BookRepository(BookModel, db)
+    service = AsyncBookService(AsyncBookRepository(BookModel, db))
     try:
-        search_query = db.query(BookModel)
-        if query:
-            search_query = search_query.filter(
-                or_(
-                    BookModel.title.ilike(f"%{query}%"),
-                    BookModel.author.ilike(f"%{query}%"),
-                    BookModel.isbn.ilike(f"%{query}%"),
-                    BookModel.description.ilike(f"%{query}%")
-                )
-            )
-        if category_id:
-            search_query = search_query.join(book_category).filter(
-                book_category.c.category_id == category_id
-            )
-        if author:
-            search_query = search_query.filter(BookModel.author.ilike(f"%{author}%"))
-        if publication_year:
-            search_query = search_query.filter(BookModel.publication_year == publication_year)
-        params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
-        return paginate(search_query, params, BookModel)
+        not_modified = conditional_response(request, response, *await service.get_state(), private=True)
+        if not_modified:
+            return not_modified
+        params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc, cursor=cursor, keyset=keyset, include_total=include_total)
+        page = await service.search(
+            params=params,
+            query=query,
+            category_id=category_id,
+            author=author,
+            publication_year=publication_year
+        )
+        return json_response(Page[Book], page, response)
+    except CustomException as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message
+        )
     except Exception as e:
         logger.error("Error in advanced search: %s", e)
         raise HTTPException(
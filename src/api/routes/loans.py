@@ -1,20 +1,22 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Any
 from datetime import datetime, timedelta
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from ...db.session import get_db
+from ...db.session import get_db, get_read_db, get_async_db
 from ...models.loans import Loan as LoanModel
 from ...models.books import Book as BookModel
 from ...models.users import User as UserModel
-from ..schemas.loans import Loan, LoanCreate, LoanUpdate, LoanWithDetails
-from ...repositories.loans import LoanRepository
+from ..schemas.loans import Loan, LoanCreate, LoanUpdate, LoanWithDetails, LoanBatchResult
+from ...repositories.loans import LoanRepository, AsyncLoanRepository
 from ...repositories.books import BookRepository
 from ...repositories.users import UserRepository
-from ...services.loans import LoanService
-from ..dependencies import get_current_active_user, get_current_admin_user
+from ...services.loans import LoanService, AsyncLoanService, MAX_BATCH_SIZE
+from ..serialization import json_response
+from ..dependencies import get_current_active_user, get_current_admin_user, get_current_active_user_async
 from src.exceptions import CustomException  # Ajout de l'import
 
 logger = logging.getLogger(__name__)
@@ -26,14 +28,30 @@ class LoanRequest(BaseModel):
     loan_period_days: int = 14
 
 
+class LoanBatchRequest(BaseModel):
+    book_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    loan_period_days: int = 14
+
+
+class LoanBatchReturnRequest(BaseModel):
+    loan_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+def batch_result(items: List[dict]) -> dict:
+    succeeded = sum(1 for item in items if item["status_code"] < 400)
+    return {"succeeded": succeeded, "failed": len(items) - succeeded, "items": items}
+
+
 @router.get("/me", response_model=List[LoanWithDetails])
-def get_my_loans(
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+async def get_my_loans(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_active_user_async)
 ):
-    from sqlalchemy.orm import joinedload
-    loans = db.query(LoanModel).options(joinedload(LoanModel.book)).filter(LoanModel.user_id == current_user.id).all()
-    return loans
+    service = AsyncLoanService(AsyncLoanRepository(LoanModel, db))
+    try:
+        return json_response(List[LoanWithDetails], await service.get_loans_by_user(user_id=current_user.id))
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
 
 
 @router.post("/me", response_model=Loan, status_code=status.HTTP_201_CREATED)
@@ -60,6 +78,63 @@ def create_my_loan(
         raise HTTPException(status_code=500, detail="Erreur lors de la création de l'emprunt")
 
 
+@router.post("/me/batch", response_model=LoanBatchResult)
+def create_my_loans(
+    *,
+    db: Session = Depends(get_db),
+    data: LoanBatchRequest,
+    current_user = Depends(get_current_active_user)
+):
+    """
+    Emprunt de plusieurs livres en une requête et une transaction.
+    Chaque livre a son propre résultat (201, 403, 404 ou 409).
+    """
+    logger.info(f"User {current_user.id} borrows books {data.book_ids}")
+    loan_repository = LoanRepository(LoanModel, db)
+    book_repository = BookRepository(BookModel, db)
+    user_repository = UserRepository(UserModel, db)
+    service = LoanService(loan_repository, book_repository, user_repository)
+    try:
+        items = service.create_loans(
+            user_id=current_user.id,
+            book_ids=data.book_ids,
+            loan_period_days=data.loan_period_days
+        )
+        return batch_result(items)
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        logger.error(f"Unexpected error in batch checkout for user {current_user.id}: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors de la création des emprunts")
+
+
+@router.post("/return/batch", response_model=LoanBatchResult)
+def return_loans(
+    *,
+    db: Session = Depends(get_db),
+    data: LoanBatchReturnRequest,
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Retour de plusieurs emprunts en une requête et une transaction.
+    Chaque emprunt a son propre résultat (200, 404 ou 409).
+    """
+    logger.info(f"Admin {current_user.id} returns loans {data.loan_ids}")
+    loan_repository = LoanRepository(LoanModel, db)
+    book_repository = BookRepository(BookModel, db)
+    user_repository = UserRepository(UserModel, db)
+    service = LoanService(loan_repository, book_repository, user_repository)
+    try:
+        items = service.return_loans(loan_ids=data.loan_ids)
+        return batch_result(items)
+    except CustomException as e:
+        logger.error(f"Error returning loans {data.loan_ids}: {e}")
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        logger.error(f"Unexpected error returning loans {data.loan_ids}: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors du retour des emprunts")
+
+
 # --- ENSUITE seulement les routes dynamiques ---
 @router.get("/{id}", response_model=Loan)
 def read_loan(
@@ -141,7 +216,7 @@ def extend_loan(
 
 @router.get("/active/", response_model=List[Loan])
 def read_active_loans(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin_user)
 ) -> Any:
     logger.info(f"Admin {current_user.id} requests active loans")
@@ -152,7 +227,7 @@ def read_active_loans(
     try:
         loans = service.get_active_loans()
         logger.debug(f"Found {len(loans)} active loans")
-        return loans
+        return json_response(List[Loan], loans)
     except CustomException as e:
         logger.error(f"Error fetching active loans: {e}")
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -163,7 +238,7 @@ def read_active_loans(
 
 @router.get("/overdue/", response_model=List[Loan])
 def read_overdue_loans(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin_user)
 ) -> Any:
     logger.info(f"Admin {current_user.id} requests overdue loans")
@@ -174,7 +249,7 @@ def read_overdue_loans(
     try:
         loans = service.get_overdue_loans()
         logger.debug(f"Found {len(loans)} overdue loans")
-        return loans
+        return json_response(List[Loan], loans)
     except CustomException as e:
         logger.error(f"Error fetching overdue loans: {e}")
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -186,7 +261,7 @@ def read_overdue_loans(
 @router.get("/user/{user_id}", response_model=List[Loan])
 def read_user_loans(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user_id: int,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -204,7 +279,7 @@ def read_user_loans(
     try:
         loans = service.get_loans_by_user(user_id=user_id)
         logger.debug(f"Found {len(loans)} loans for user {user_id}")
-        return loans
+        return json_response(List[Loan], loans)
     except CustomException as e:
         logger.error(f"Error fetching loans for user {user_id}: {e}")
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -216,7 +291,7 @@ def read_user_loans(
 @router.get("/book/{book_id}", response_model=List[Loan])
 def read_book_loans(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     book_id: int,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
@@ -228,7 +303,7 @@ def read_book_loans(
     try:
         loans = service.get_loans_by_book(book_id=book_id)
         logger.debug(f"Found {len(loans)} loans for book {book_id}")
-        return loans
+        return json_response(List[Loan], loans)
     except CustomException as e:
         logger.error(f"Error fetching loans for book {book_id}: {e}")
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -241,7 +316,7 @@ from sqlalchemy.orm import joinedload
 
 @router.get("/", response_model=List[LoanWithDetails])
 def read_all_loans(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin_user),
     user_id: int = Query(None, description="Filtrer par ID utilisateur"),
     user_name: str = Query(None, description="Filtrer par nom"),
@@ -287,4 +362,4 @@ def read_all_loans(
     else:
         query = query.order_by(sort_column.asc())
     loans = query.all()
-    return loans
\ No newline at end of file
+    return json_response(List[LoanWithDetails], loans)
@@ -1,10 +1,13 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List
 
-from ...db.session import get_db
+from ...db.session import get_read_db
 from ...services.stats import StatsService
+from ...utils.cache import cache_stats
+from ...utils.principal_cache import principal_stats
+from ..conditional import conditional_response
 from ..dependencies import get_current_admin_user
 from src.exceptions import CustomException  # Ajout de l'import
 
@@ -15,7 +18,9 @@ router = APIRouter()
 
 @router.get("/general", response_model=Dict[str, Any])
 def get_general_stats(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin_user)
 ) -> Any:
     """
@@ -24,6 +29,9 @@ def get_general_stats(
     logger.info("Fetching general stats by user: %s", getattr(current_user, "id", None))
     service = StatsService(db)
     try:
+        not_modified = conditional_response(request, response, *service.get_state(), private=True)
+        if not_modified:
+            return not_modified
         result = service.get_general_stats()
         logger.debug("General stats result: %s", result)
         return result
@@ -37,7 +45,9 @@ def get_general_stats(
 
 @router.get("/most-borrowed-books", response_model=List[Dict[str, Any]])
 def get_most_borrowed_books(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     limit: int = 10,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
@@ -47,6 +57,9 @@ def get_most_borrowed_books(
     logger.info("Fetching most borrowed books (limit=%d) by user: %s", limit, getattr(current_user, "id", None))
     service = StatsService(db)
     try:
+        not_modified = conditional_response(request, response, *service.get_state(), private=True)
+        if not_modified:
+            return not_modified
         result = service.get_most_borrowed_books(limit=limit)
         logger.debug("Most borrowed books result: %s", result)
         return result
@@ -60,7 +73,9 @@ def get_most_borrowed_books(
 
 @router.get("/most-active-users", response_model=List[Dict[str, Any]])
 def get_most_active_users(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     limit: int = 10,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
@@ -70,6 +85,9 @@ def get_most_active_users(
     logger.info("Fetching most active users (limit=%d) by user: %s", limit, getattr(current_user, "id", None))
     service = StatsService(db)
     try:
+        not_modified = conditional_response(request, response, *service.get_state(), private=True)
+        if not_modified:
+            return not_modified
         result = service.get_most_active_users(limit=limit)
         logger.debug("Most active users result: %s", result)
         return result
@@ -83,7 +101,9 @@ def get_most_active_users(
 
 @router.get("/monthly-loans", response_model=List[Dict[str, Any]])
 def get_monthly_loans(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     months: int = 12,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
@@ -93,6 +113,9 @@ def get_monthly_loans(
     logger.info("Fetching monthly loans (months=%d) by user: %s", months, getattr(current_user, "id", None))
     service = StatsService(db)
     try:
+        not_modified = conditional_response(request, response, *service.get_state(), private=True)
+        if not_modified:
+            return not_modified
         result = service.get_monthly_loans(months=months)
         logger.debug("Monthly loans result: %s", result)
         return result
@@ -101,4 +124,15 @@ def get_monthly_loans(
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
         logger.error(f"Unexpected error fetching monthly loans: {e}")
-        raise HTTPException(status_code=500, detail="Erreur lors de la récupération des emprunts mensuels")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Erreur lors de la récupération des emprunts mensuels")
+
+
+@router.get("/cache", response_model=Dict[str, Any])
+def get_cache_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Compteurs des caches de ce worker : cache applicatif et cache des
+    utilisateurs authentifiés (avec son taux de succès).
+    """
+    return {"cache": cache_stats(), "principals": principal_stats()}
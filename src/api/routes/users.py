@@ -3,15 +3,17 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Any
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from ...db.session import get_db
 from ...models.users import User as UserModel
 from ..schemas.users import User, UserCreate, UserUpdate
 from ...repositories.users import UserRepository
 from ...services.users import UserService
+from ..serialization import json_response
 from ..dependencies import get_current_active_user, get_current_admin_user
 from src.exceptions import CustomException  # Ajout de l'import
-from ...utils.security import verify_password, get_password_hash
+from ...utils.security import get_password_hash_async, verify_password_async
 
 logger = logging.getLogger(__name__)
 
@@ -33,11 +35,11 @@ def read_users(
     service = UserService(repository)
     users = service.get_multi(skip=skip, limit=limit)
     logger.debug("Fetched %d users", len(users))
-    return users
+    return json_response(List[User], users)
 
 
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate
@@ -45,13 +47,20 @@ def create_user(
     #current_user = Depends(get_current_admin_user)
 ) -> Any:
     """
-    Crée un nouvel utilisateur.
+    Crée un nouvel utilisateur. Le hash est calculé dans le pool de hachage,
+    les accès à la base dans le pool de threads.
     """
     logger.info("Creating user with email: %s", user_in.email)
     repository = UserRepository(UserModel, db)
     service = UserService(repository)
     try:
-        user = service.create(obj_in=user_in)
+        # Email déjà pris : refusé avant le hachage (route sans authentification,
+        # qui ne doit pas occuper le pool de hachage)
+        if await run_in_threadpool(service.get_by_email, email=user_in.email):
+            logger.warning("Email already registered: %s", user_in.email)
+            raise CustomException("L'email est déjà utilisé", status_code=status.HTTP_409_CONFLICT)
+        hashed_password = await get_password_hash_async(user_in.password)
+        user = await run_in_threadpool(service.create, obj_in=user_in, hashed_password=hashed_password)
         logger.info("User created with id: %s", user.id)
         return user
     except CustomException as e:
@@ -259,7 +268,7 @@ class ChangePasswordRequest(BaseModel):
 
 
 @router.post("/me/change-password")
-def change_password(
+async def change_password(
     data: ChangePasswordRequest,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -267,10 +276,13 @@ def change_password(
     """
     Permet à l'utilisateur connecté de changer son mot de passe.
     """
+    # Le hash n'est pas en cache avec l'utilisateur : lecture en base hors de la boucle
+    hashed_password = await run_in_threadpool(lambda: current_user.hashed_password)
     # Vérifie l'ancien mot de passe
-    if not verify_password(data.current_password, current_user.hashed_password):
+    if not await verify_password_async(data.current_password, hashed_password):
         raise HTTPException(status_code=400, detail="Mot de passe actuel incorrect")
-    # Met à jour le mot de passe
-    current_user.hashed_password = get_password_hash(data.new_password)
-    db.commit()
+    # Met à jour le mot de passe (et invalide les sessions en cache)
+    new_hash = await get_password_hash_async(data.new_password)
+    service = UserService(UserRepository(UserModel, db))
+    await run_in_threadpool(service.update, db_obj=current_user, obj_in={"hashed_password": new_hash})
     return {"message": "Mot de passe changé avec succès"}
@@ -1,28 +1,17 @@
-import logging
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
-logger = logging.getLogger(__name__)
-
 class CategoryBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=50, description="Nom de la catégorie")
     description: Optional[str] = Field(None, max_length=200, description="Description de la catégorie")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        logger.debug(f"CategoryBase created with data: {data}")
-
 class CategoryCreate(CategoryBase):
     pass
 
 class CategoryUpdate(CategoryBase):
     name: Optional[str] = Field(None, min_length=1, max_length=50, description="Nom de la catégorie")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        logger.debug(f"CategoryUpdate created with data: {data}")
-
 class CategoryInDBBase(CategoryBase):
     id: int
     created_at: datetime
@@ -31,10 +20,6 @@ class CategoryInDBBase(CategoryBase):
     class Config:
         from_attributes = True
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        logger.debug(f"CategoryInDBBase created with data: {data}")
-
 class Category(CategoryInDBBase):
     pass
 
@@ -49,17 +34,9 @@ class BookBase(BaseModel):
     language: Optional[str] = Field(None, max_length=50, description="Langue du livre")
     pages: Optional[int] = Field(None, gt=0, description="Nombre de pages")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        logger.debug(f"BookBase created with data: {data}")
-
 class BookCreate(BookBase):
     category_ids: Optional[List[int]] = Field(None, description="IDs des catégories")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        logger.debug(f"BookCreate created with data: {data}")
-
 class BookUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=100, description="Titre du livre")
     author: Optional[str] = Field(None, min_length=1, max_length=100, description="Auteur du livre")
@@ -72,10 +49,6 @@ class BookUpdate(BaseModel):
     pages: Optional[int] = Field(None, gt=0, description="Nombre de pages")
     category_ids: Optional[List[int]] = Field(None, description="IDs des catégories")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        logger.debug(f"BookUpdate created with data: {data}")
-
 class BookInDBBase(BookBase):
     id: int
     created_at: datetime
@@ -84,13 +57,18 @@ class BookInDBBase(BookBase):
     class Config:
         from_attributes = True
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        logger.debug(f"BookInDBBase created with data: {data}")
-
 class Book(BookInDBBase):
     categories: List[Category] = []
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        logger.debug(f"Book created with data: {data}")
\ No newline at end of file
+class BookImportError(BaseModel):
+    line: int = Field(..., description="Numéro de ligne dans le fichier importé")
+    isbn: Optional[str] = Field(None, description="ISBN de la ligne, s'il a pu être lu")
+    errors: List[str] = Field(..., description="Erreurs de validation ou d'insertion")
+
+class BookImportReport(BaseModel):
+    total: int = Field(0, description="Nombre de lignes lues")
+    imported: int = Field(0, description="Nombre de livres créés")
+    failed: int = Field(0, description="Nombre de lignes rejetées")
+    batches: int = Field(0, description="Nombre de lots traités")
+    errors: List[BookImportError] = Field(default_factory=list, description="Erreurs par ligne (tronquées)")
+    errors_truncated: bool = Field(False, description="Vrai si toutes les erreurs ne sont pas listées")
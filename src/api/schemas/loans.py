@@ -1,12 +1,9 @@
-import logging
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from .users import User
 from .books import Book
 
-logger = logging.getLogger(__name__)
-
 class LoanBase(BaseModel):
     user_id: int = Field(..., description="ID de l'utilisateur")
     book_id: int = Field(..., description="ID du livre")
@@ -15,24 +12,14 @@ class LoanBase(BaseModel):
     due_date: datetime = Field(..., description="Date d'échéance")
     extended: bool = Field(False, description="Indique si l'emprunt a été prolongé")
 
-    def __init__(self, **data):
-        logger.debug(f"Creating LoanBase with data: {data}")
-        super().__init__(**data)
-
 class LoanCreate(LoanBase):
-    def __init__(self, **data):
-        logger.debug(f"Creating LoanCreate with data: {data}")
-        super().__init__(**data)
+    pass
 
 class LoanUpdate(BaseModel):
     return_date: Optional[datetime] = Field(None, description="Date de retour")
     due_date: Optional[datetime] = Field(None, description="Date d'échéance")
     extended: Optional[bool] = Field(None, description="Indique si l'emprunt a été prolongé")
 
-    def __init__(self, **data):
-        logger.debug(f"Updating Loan with data: {data}")
-        super().__init__(**data)
-
 class LoanInDBBase(LoanBase):
     id: int
     created_at: datetime
@@ -41,19 +28,21 @@ class LoanInDBBase(LoanBase):
     class Config:
         from_attributes = True
 
-    def __init__(self, **data):
-        logger.debug(f"Creating LoanInDBBase with data: {data}")
-        super().__init__(**data)
-
 class Loan(LoanInDBBase):
-    def __init__(self, **data):
-        logger.debug(f"Creating Loan with data: {data}")
-        super().__init__(**data)
+    pass
 
 class LoanWithDetails(Loan):
     user: User
     book: Book
 
-    def __init__(self, **data):
-        logger.debug(f"Creating LoanWithDetails with data: {data}")
-        super().__init__(**data)
\ No newline at end of file
+class LoanBatchItem(BaseModel):
+    book_id: Optional[int] = Field(None, description="ID du livre demandé (emprunt groupé)")
+    loan_id: Optional[int] = Field(None, description="ID de l'emprunt demandé (retour groupé)")
+    status_code: int = Field(..., description="Code HTTP équivalent pour cet élément")
+    detail: Optional[str] = Field(None, description="Motif du refus")
+    loan: Optional[Loan] = Field(None, description="Emprunt créé ou retourné")
+
+class LoanBatchResult(BaseModel):
+    succeeded: int = Field(..., description="Nombre d'éléments traités avec succès")
+    failed: int = Field(..., description="Nombre d'éléments refusés")
+    items: List[LoanBatchItem] = Field(..., description="Résultat par élément, dans l'ordre de la demande")
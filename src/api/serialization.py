@@ -0,0 +1,32 @@
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    """
+    TypeAdapter construit une seule fois par schéma (List[Book], Page[Book]...).
+    """
+    return TypeAdapter(schema)
+
+
+def serialize(schema: Any, content: Any) -> bytes:
+    """
+    Valide `content` (objets ORM ou modèles) contre `schema` et l'encode en JSON
+    en un seul passage côté pydantic-core, sans dictionnaires intermédiaires.
+    """
+    adapter = type_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def json_response(schema: Any, content: Any, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """
+    Réponse JSON déjà sérialisée : FastAPI ne repasse pas par response_model
+    (qui reste déclaré pour la documentation OpenAPI). Les en-têtes posés sur
+    la réponse injectée (ETag, Cache-Control...) sont repris.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return Response(serialize(schema, content), status_code=status_code, headers=headers, media_type="application/json")
@@ -1,20 +1,85 @@
 from pydantic import AnyHttpUrl
 from pydantic_settings import BaseSettings
-from typing import List, Optional, Union
-import secrets
+from typing import Dict, List, Optional, Union
 
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Library Management System"
     API_V1_STR: str = "/api/v1"
-    SECRET_KEY: str = secrets.token_urlsafe(32)
+    # Clé JWT unique (kid "default") ; voir aussi JWT_KEYS / JWT_KEYS_FILE
+    SECRET_KEY: Optional[str] = None
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 jours
 
+    # Trousseau de clés JWT partagé par les workers (src.utils.jwt_keys) :
+    # fichier {"active": kid, "keys": {kid: secret}}, généré s'il n'existe
+    # pas et qu'aucune clé n'est configurée ; scripts/rotate_jwt_key.py
+    JWT_KEYS_FILE: Optional[str] = "jwt_keys.json"
+    JWT_KEYS: Dict[str, str] = {}  # kid -> secret, ajoutées à celles du fichier
+    JWT_ACTIVE_KID: Optional[str] = None
+    JWT_KEYS_RELOAD_INTERVAL: int = 30  # secondes
+
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = ["http://localhost:8000", "http://localhost:5000", "http://127.0.0.1:5000"]
 
     # Base de données
     DATABASE_URL: str = "sqlite:///./library.db"
+    # Réplica en lecture seule (bases serveur). Pour SQLite, par défaut :
+    # connexion mode=ro sur le même fichier.
+    DATABASE_READ_URL: Optional[str] = None
+
+    # Pool de connexions (ignoré pour une base SQLite en mémoire)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # secondes
+    DB_POOL_RECYCLE: int = 1800  # secondes
+    DB_POOL_PRE_PING: bool = False
+
+    # Profil SQLite appliqué à chaque connexion (PRAGMA)
+    SQLITE_PROFILE_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE: str = "MEMORY"
+
+    # Cache applicatif : "memory" (par processus, LRU borné en entrées et en
+    # taille), "sqlite" (fichier partagé par les workers d'un hôte, de
+    # préférence sur /dev/shm) ou "redis"
+    CACHE_BACKEND: str = "memory"
+    CACHE_MAX_ENTRIES: int = 10_000
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_SQLITE_PATH: str = "./cache.db"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "biblio:"
+    # Diffusion des invalidations entre workers (backend "memory" uniquement)
+    CACHE_INVALIDATION_BUS: bool = True
+    CACHE_BUS_POLL_INTERVAL: float = 0.1  # secondes
+    # Durée de validité de la vue en mémoire des versions de tables
+    TABLE_VERSIONS_MAX_AGE: float = 1.0  # secondes
+    # Cache des utilisateurs authentifiés par token (0 : désactivé)
+    PRINCIPAL_CACHE_TTL: int = 30  # secondes
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Mots de passe : bcrypt dans un pool de processus dédié
+    BCRYPT_ROUNDS: int = 12  # les hashs d'un autre coût sont recalculés à la connexion
+    PASSWORD_HASH_WORKERS: int = 2  # 0 : dans les threads du serveur
+    PASSWORD_HASH_MAX_PENDING: int = 64  # au-delà : 503
+
+    # Journalisation : écritures dans un thread dédié (QueueListener)
+    LOG_LEVEL: str = "INFO"
+    # Niveaux par logger, ex. LOG_LEVELS='{"src.repositories": "WARNING"}'
+    LOG_LEVELS: Dict[str, str] = {}
+    LOG_FILE: Optional[str] = "app.log"  # None : console uniquement
+    # Rotation par taille ; 0 : rotation externe (obligatoire avec plusieurs workers)
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
+    LOG_JSON: bool = False
+    # Fraction des messages INFO/DEBUG conservée par préfixe de logger,
+    # ex. LOG_SAMPLING='{"src.repositories": 0.1, "src.utils.security": 0.01}'
+    LOG_SAMPLING: Dict[str, float] = {}
+    # Trace (DEBUG) de la construction et du chargement des objets ORM
+    MODEL_INSTRUMENTATION: bool = False
 
     class Config:
         case_sensitive = True
@@ -7,13 +7,20 @@ from ..models.books import Book
 from ..models.loans import Loan
 from ..models.categories import Category
 from ..utils.security import get_password_hash
+from .unit_of_work import unit_of_work
 
 logger = logging.getLogger(__name__)
 
 def init_db(db: Session) -> None:
     """
-    Initialise la base de données avec des données de test.
+    Initialise la base de données avec des données de test, en une seule transaction.
     """
+    with unit_of_work(db):
+        _seed(db)
+    logger.info("Base de données initialisée")
+
+def _seed(db: Session) -> None:
+    # Flush seulement : le commit unique est fait par init_db
     # Créer un administrateur
     admin = db.query(User).filter(User.email == "admin@example.com").first()
     if not admin:
@@ -26,7 +33,7 @@ def init_db(db: Session) -> None:
         }
         admin = User(**admin_data)
         db.add(admin)
-        db.commit()
+        db.flush()
         logger.info("Administrateur créé")
     
     # Créer des catégories
@@ -45,7 +52,7 @@ def init_db(db: Session) -> None:
         if not category:
             category = Category(**category_data)
             db.add(category)
-    db.commit()
+    db.flush()
     logger.info("Catégories créées")
 
     # Récupérer les catégories (ajout des nouvelles)
@@ -157,7 +164,7 @@ def init_db(db: Session) -> None:
             for category in categories:
                 book.categories.append(category)
     
-    db.commit()
+    db.flush()
     logger.info("Livres créés")
     
     # Créer un utilisateur normal
@@ -174,7 +181,7 @@ def init_db(db: Session) -> None:
         }
         user = User(**user_data)
         db.add(user)
-        db.commit()
+        db.flush()
         logger.info("Utilisateur créé")
     
     # Créer des emprunts
@@ -266,5 +273,5 @@ def init_db(db: Session) -> None:
             loan2 = Loan(**loan2_data)
             db.add(loan2)
         
-        db.commit()
+        db.flush()
         logger.info("Emprunts créés")
\ No newline at end of file
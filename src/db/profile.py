@@ -0,0 +1,86 @@
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from ..config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+
+def sqlite_pragmas(config: Settings = settings) -> Dict[str, Any]:
+    """
+    PRAGMA du profil SQLite de production : journal WAL (lectures non
+    bloquées par les écritures), synchronous=NORMAL (sûr en WAL), attente
+    sur verrou au lieu d'une erreur immédiate, cache de pages et mmap élargis,
+    tables temporaires en mémoire.
+    """
+    if not config.SQLITE_PROFILE_ENABLED:
+        return {}
+    return {
+        "journal_mode": config.SQLITE_JOURNAL_MODE,
+        "synchronous": config.SQLITE_SYNCHRONOUS,
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,
+        # Valeur négative : taille en KiB plutôt qu'en nombre de pages
+        "cache_size": -config.SQLITE_CACHE_SIZE_KB,
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "temp_store": config.SQLITE_TEMP_STORE,
+    }
+
+
+def sqlite_read_pragmas(config: Settings = settings) -> Dict[str, Any]:
+    """
+    PRAGMA des connexions en lecture seule : le mode de journal ne peut pas
+    être modifié sans droit d'écriture, il est laissé au moteur principal.
+    """
+    pragmas = sqlite_pragmas(config)
+    pragmas.pop("journal_mode", None)
+    if pragmas:
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+
+def _is_memory_database(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(database_url: str, config: Settings = settings) -> Dict[str, Any]:
+    """
+    Arguments de create_engine/create_async_engine : connect_args SQLite et
+    dimensionnement du pool (sauf base en mémoire, qui n'a pas de pool à file d'attente).
+    """
+    url = make_url(database_url)
+    options: Dict[str, Any] = {}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    if not _is_memory_database(url):
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            pool_pre_ping=config.DB_POOL_PRE_PING,
+        )
+    return options
+
+
+def apply_sqlite_profile(engine: Engine, pragmas: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Applique les PRAGMA à chaque nouvelle connexion du moteur (sans effet
+    hors SQLite). Pour un moteur asynchrone, passer `async_engine.sync_engine`.
+    """
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    logger.info(f"Profil SQLite appliqué: {pragmas}")
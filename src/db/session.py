@@ -1,19 +1,83 @@
 import logging
+import os
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from ..config import settings
+from .profile import engine_options, apply_sqlite_profile, sqlite_read_pragmas
 
 logger = logging.getLogger(__name__)
 
-engine = create_engine(
-    settings.DATABASE_URL, 
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
-)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+apply_sqlite_profile(engine)
 logger.info(f"Database engine created for URL: {settings.DATABASE_URL}")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def read_database_url(url: str, replica_url: Optional[str] = None) -> Optional[str]:
+    """
+    URL des lectures analytiques : le réplica s'il est configuré, sinon pour
+    un fichier SQLite une connexion URI mode=ro sur le même fichier. None si
+    aucune connexion distincte n'est possible (base en mémoire, serveur sans réplica).
+    """
+    if replica_url:
+        return replica_url
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:") or parsed.database.startswith("file:"):
+        return None
+    database = "file:" + os.path.abspath(parsed.database)
+    return parsed.set(database=database, query={"mode": "ro", "uri": "true"}).render_as_string(hide_password=False)
+
+READ_DATABASE_URL = read_database_url(settings.DATABASE_URL, settings.DATABASE_READ_URL)
+
+# Moteur en lecture seule : les lectures longues (statistiques, listes,
+# recherches) ne bloquent pas les écritures. À défaut, moteur principal.
+if READ_DATABASE_URL:
+    read_engine = create_engine(READ_DATABASE_URL, **engine_options(READ_DATABASE_URL))
+    apply_sqlite_profile(read_engine, sqlite_read_pragmas())
+    logger.info(f"Read-only database engine created for URL: {READ_DATABASE_URL}")
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Pilotes asynchrones associés aux pilotes synchrones par défaut
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """
+    Convertit une URL de base de données synchrone vers le pilote asynchrone équivalent.
+    """
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+# Moteur asynchrone, utilisé par les routes de lecture à fort trafic
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL), **engine_options(settings.DATABASE_URL)
+)
+apply_sqlite_profile(async_engine.sync_engine)
+logger.info(f"Async database engine created for URL: {async_engine.url}")
+
+if READ_DATABASE_URL:
+    async_read_engine = create_async_engine(
+        async_database_url(READ_DATABASE_URL), **engine_options(READ_DATABASE_URL)
+    )
+    apply_sqlite_profile(async_read_engine.sync_engine, sqlite_read_pragmas())
+else:
+    async_read_engine = async_engine
+
+# expire_on_commit=False : pas de rechargement implicite (impossible en asynchrone)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 # Dépendance pour obtenir la session de base de données
@@ -24,4 +88,29 @@ def get_db():
         yield db
     finally:
         db.close()
-        logger.debug("Database session closed")
\ No newline at end of file
+        logger.debug("Database session closed")
+
+# Dépendance pour les lectures seules (statistiques, listes, recherches)
+def get_read_db():
+    db = ReadSessionLocal()
+    logger.debug("Read-only database session created")
+    try:
+        yield db
+    finally:
+        db.close()
+        logger.debug("Read-only database session closed")
+
+# Dépendance asynchrone pour obtenir la session de base de données
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        logger.debug("Async database session created")
+        yield db
+    logger.debug("Async database session closed")
+
+
+# Dépendance asynchrone pour les lectures seules
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        logger.debug("Async read-only database session created")
+        yield db
+    logger.debug("Async read-only database session closed")
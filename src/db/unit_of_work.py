@@ -0,0 +1,61 @@
+import logging
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_DEPTH_KEY = "unit_of_work_depth"
+_CALLBACKS_KEY = "unit_of_work_after_commit"
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Regroupe les écritures des repositories dans une seule transaction.
+
+    Dans le bloc, create/update/remove se contentent d'un flush ; le commit
+    unique a lieu à la sortie du bloc le plus externe (rollback en cas
+    d'exception). Les blocs imbriqués rejoignent la transaction englobante.
+
+        with unit_of_work(db):
+            book = repository.create(obj_in=data)
+            repository.add_category(book_id=book.id, category_id=1)
+    """
+    depth = db.info.get(_DEPTH_KEY, 0)
+    db.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            db.commit()
+            logger.debug("Unité de travail validée")
+            for callback in db.info.pop(_CALLBACKS_KEY, []):
+                callback()
+    except Exception:
+        if depth == 0:
+            db.rollback()
+            db.info.pop(_CALLBACKS_KEY, None)
+            logger.debug("Unité de travail annulée")
+        raise
+    finally:
+        db.info[_DEPTH_KEY] = depth
+
+
+def in_unit_of_work(db: Session) -> bool:
+    """
+    Indique si la session est dans un bloc unit_of_work.
+    """
+    return db.info.get(_DEPTH_KEY, 0) > 0
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    Exécute `callback` après le commit : immédiatement hors unité de travail,
+    à la sortie du bloc sinon (rien n'est exécuté en cas de rollback).
+    Sert aux invalidations de cache, qui ne doivent pas précéder le commit.
+    """
+    if in_unit_of_work(db):
+        db.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+    else:
+        callback()
@@ -1,11 +1,163 @@
+import atexit
+import copy
+import json
 import logging
+import math
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, WatchedFileHandler
+from typing import Dict, List, Optional
 
-def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        handlers=[
-            logging.FileHandler("app.log", encoding="utf-8"),
-            logging.StreamHandler()
-        ]
-    )
\ No newline at end of file
+from .config import settings
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_atexit_registered = False
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Une ligne JSON par message : horodatage UTC, niveau, logger, message,
+    processus et thread, plus l'exception formatée s'il y en a une.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Ne conserve qu'une fraction des messages INFO et DEBUG des loggers
+    configurés : `rates` associe un préfixe de logger ("src.repositories")
+    à la fraction gardée (0.1 = un message sur dix, le premier inclus).
+    Le tirage est déterministe, par logger. WARNING et au-delà passent toujours.
+    """
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        # Par logger : [fraction gardée, messages vus]
+        self._state: Dict[str, List] = {}
+        self._lock = threading.Lock()
+
+    def rate(self, name: str) -> float:
+        # Préfixe le plus long configuré
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        state = self._state.get(record.name)
+        if state is None:
+            state = self._state.setdefault(record.name, [self.rate(record.name), 0])
+        rate = state[0]
+        if rate >= 1:
+            return True
+        with self._lock:
+            seen = state[1]
+            state[1] += 1
+        return math.floor(seen * rate) > math.floor((seen - 1) * rate)
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Seul handler exécuté dans le thread appelant : il fige le message et
+    l'exception puis met l'enregistrement en file. Le formatage final et les
+    écritures se font dans le thread du QueueListener.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def build_handlers(config=settings) -> List[logging.Handler]:
+    """
+    Handlers de sortie (console et fichier), exécutés par le QueueListener.
+
+    Le fichier tourne par taille (LOG_MAX_BYTES) quand un seul processus
+    l'écrit. Avec LOG_MAX_BYTES=0 (plusieurs workers, voir run.py), la
+    rotation est externe (logrotate...) : chaque processus rouvre le fichier
+    quand il a été déplacé, aucun ne le renomme sous les autres.
+    """
+    formatter = JsonFormatter() if config.LOG_JSON else logging.Formatter(TEXT_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if config.LOG_FILE and config.LOG_MAX_BYTES > 0:
+        handlers.append(RotatingFileHandler(
+            config.LOG_FILE,
+            maxBytes=config.LOG_MAX_BYTES,
+            backupCount=config.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        ))
+    elif config.LOG_FILE:
+        handlers.append(WatchedFileHandler(config.LOG_FILE, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging(config=settings) -> QueueListener:
+    """
+    Installe la chaîne de journalisation : QueueHandler sur le logger racine
+    (avec l'échantillonnage éventuel), QueueListener qui écrit en arrière-plan,
+    et niveaux par logger. Un nouvel appel remplace la configuration précédente.
+    """
+    global _listener, _queue_handler, _atexit_registered
+    stop_logging()
+
+    log_queue = queue.SimpleQueue()
+    handler = LogQueueHandler(log_queue)
+    if config.LOG_SAMPLING:
+        handler.addFilter(SamplingFilter(config.LOG_SAMPLING))
+
+    root = logging.getLogger()
+    root.setLevel(config.LOG_LEVEL.upper())
+    root.addHandler(handler)
+    for name, level in config.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, *build_handlers(config), respect_handler_level=True)
+    _listener.start()
+    _queue_handler = handler
+    if not _atexit_registered:
+        atexit.register(stop_logging)
+        _atexit_registered = True
+    return _listener
+
+
+def stop_logging() -> None:
+    """
+    Vide la file, arrête le thread d'écriture et ferme les fichiers.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -1,17 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
 from .api.routes import api_router
+from .db.session import engine
 from .models import base, books, users, loans  # Importer les modèles pour Alembic
 from src.logging_config import setup_logging
+from src.models.instrumentation import enable_model_instrumentation
 from src.exceptions import CustomException, custom_exception_handler
+from src.utils.cache import start_invalidation_bus, stop_invalidation_bus
+from src.utils import security
 
 setup_logging()
+if settings.MODEL_INSTRUMENTATION:
+    enable_model_instrumentation()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Chaque worker a son cache en mémoire (et son cache d'utilisateurs
+    # authentifiés) : les invalidations sont diffusées
+    local_cache = settings.CACHE_BACKEND == "memory" or settings.PRINCIPAL_CACHE_TTL > 0
+    if settings.CACHE_INVALIDATION_BUS and local_cache:
+        start_invalidation_bus(engine, settings.CACHE_BUS_POLL_INTERVAL)
+    yield
+    stop_invalidation_bus()
+    security.password_hasher.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # orjson pour toutes les réponses qui passent par response_model
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Enregistre le handler pour CustomException
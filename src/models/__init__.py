@@ -2,4 +2,8 @@ from .base import Base
 from .categories import Category, book_category
 from .books import Book
 from .users import User
-from .loans import Loan
\ No newline at end of file
+from .loans import Loan
+from .search import BOOK_FTS_TABLE, BOOK_FTS_COLUMNS
+from .counters import LibraryCounter, COUNTER_NAMES
+from .cache import CacheInvalidation
+from .versions import TableVersion, VERSIONED_TABLES
\ No newline at end of file
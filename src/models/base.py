@@ -17,5 +17,5 @@ class Base:
     def __tablename__(cls) -> str:
         # Convert CamelCase to snake_case
         tablename = re.sub(r'(?<!^)(?=[A-Z])', '_', cls.__name__).lower()
-        logger.debug(f"Generated tablename '{tablename}' for class '{cls.__name__}'")
+        logger.debug("Generated tablename '%s' for class '%s'", tablename, cls.__name__)
         return tablename
\ No newline at end of file
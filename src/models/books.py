@@ -32,10 +32,5 @@ class Book(Base):
     loans = relationship("Loan", back_populates="book", cascade="all, delete-orphan")
     categories = relationship("Category", secondary=book_category, back_populates="books")
 
-    def __init__(self, **kwargs):
-        logger.debug(f"Creating Book with data: {kwargs}")
-        super().__init__(**kwargs)
-
     def __repr__(self):
-        logger.debug(f"Repr called for Book: {self.title} by {self.author}")
         return f"<Book(title='{self.title}', author='{self.author}', isbn='{self.isbn}')>"
@@ -0,0 +1,20 @@
+import logging
+from sqlalchemy import Column, String, Text
+
+from .base import Base
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInvalidation(Base):
+    """
+    Journal des invalidations de cache publiées par les workers. L'id sert de
+    numéro de séquence : chaque worker relit les lignes au-delà du dernier id vu.
+    """
+    # Étiquettes invalidées, encodées en JSON (liste vide : tout le cache)
+    tags = Column(Text, nullable=False, default="[]")
+    # Worker émetteur (hôte:pid:jeton), pour ignorer ses propres invalidations
+    origin = Column(String(100), nullable=False)
+
+    def __repr__(self):
+        return f"<CacheInvalidation(id={self.id!r}, tags={self.tags!r}, origin={self.origin!r})>"
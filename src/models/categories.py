@@ -25,10 +25,8 @@ class Category(Base):
     books = relationship("Book", secondary=book_category, back_populates="categories")
 
     def __init__(self, name, description=None):
-        logger.debug(f"Creating Category: name={name}, description={description}")
         self.name = name
         self.description = description
 
     def __repr__(self):
-        logger.debug(f"Repr called for Category: {self.name}")
         return f"<Category(name={self.name!r}, description={self.description!r})>"
@@ -0,0 +1,116 @@
+import logging
+from collections import Counter
+from typing import Dict
+
+from sqlalchemy import Column, Integer, String, case, event, update
+from sqlalchemy.orm import Session, attributes
+
+from .base import Base
+from .books import Book
+from .users import User
+from .loans import Loan
+
+logger = logging.getLogger(__name__)
+
+COUNTER_NAMES = (
+    "total_books",
+    "unique_books",
+    "total_users",
+    "active_users",
+    "total_loans",
+    "active_loans",
+)
+
+
+class LibraryCounter(Base):
+    """
+    Compteur global de la bibliothèque, tenu à jour dans la transaction de
+    chaque écriture ORM sur les livres, utilisateurs et emprunts.
+    """
+    name = Column(String(50), nullable=False, unique=True, index=True)
+    value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<LibraryCounter(name={self.name!r}, value={self.value!r})>"
+
+
+def _old_value(obj, key):
+    history = attributes.get_history(obj, key)
+    if history.deleted:
+        return history.deleted[0]
+    return history.unchanged[0] if history.unchanged else None
+
+
+def _changed(obj, key) -> bool:
+    # Sans chargement : un attribut expiré et non modifié n'a pas changé
+    return attributes.get_history(obj, key, passive=attributes.PASSIVE_NO_INITIALIZE).has_changes()
+
+
+def compute_deltas(session: Session) -> Dict[str, int]:
+    """
+    Calcule les variations des compteurs à partir des objets nouveaux,
+    modifiés et supprimés de la session, avant flush.
+    """
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Book):
+            deltas["unique_books"] += 1
+            deltas["total_books"] += obj.quantity or 0
+        elif isinstance(obj, User):
+            deltas["total_users"] += 1
+            # is_active vaut True par défaut à l'insertion
+            deltas["active_users"] += 0 if obj.is_active is False else 1
+        elif isinstance(obj, Loan):
+            deltas["total_loans"] += 1
+            deltas["active_loans"] += 1 if obj.return_date is None else 0
+    for obj in session.deleted:
+        if isinstance(obj, Book):
+            deltas["unique_books"] -= 1
+            deltas["total_books"] -= _old_value(obj, "quantity") or 0
+        elif isinstance(obj, User):
+            deltas["total_users"] -= 1
+            deltas["active_users"] -= 1 if _old_value(obj, "is_active") else 0
+        elif isinstance(obj, Loan):
+            deltas["total_loans"] -= 1
+            deltas["active_loans"] -= 1 if _old_value(obj, "return_date") is None else 0
+    for obj in session.dirty:
+        if isinstance(obj, Book) and _changed(obj, "quantity"):
+            deltas["total_books"] += (obj.quantity or 0) - (_old_value(obj, "quantity") or 0)
+        elif isinstance(obj, User) and _changed(obj, "is_active"):
+            deltas["active_users"] += int(bool(obj.is_active)) - int(bool(_old_value(obj, "is_active")))
+        elif isinstance(obj, Loan) and _changed(obj, "return_date"):
+            was_active = _old_value(obj, "return_date") is None
+            deltas["active_loans"] += int(obj.return_date is None) - int(was_active)
+    return {name: delta for name, delta in deltas.items() if delta}
+
+
+def apply_deltas(connection, deltas: Dict[str, int]) -> None:
+    """
+    Applique des variations aux compteurs en une seule requête UPDATE atomique.
+    Les compteurs absents (base non initialisée) sont ignorés.
+    """
+    if not deltas:
+        return
+    table = LibraryCounter.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.name.in_(list(deltas)))
+        .values(value=table.c.value + case(deltas, value=table.c.name, else_=0))
+    )
+    logger.debug("Compteurs mis à jour: %s", deltas)
+
+
+@event.listens_for(Session, "before_flush")
+def _track_counters(session, flush_context, instances):
+    # Les lignes ne sont pas encore écrites : les anciennes valeurs restent lisibles
+    apply_deltas(session.connection(), compute_deltas(session))
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+# Charger l'ancienne valeur lors d'une affectation, même si l'attribut a été
+# expiré par un commit, pour que l'historique permette de calculer le delta.
+for _attribute in (Book.quantity, User.is_active, Loan.return_date):
+    event.listen(_attribute, "set", _keep_old_value, active_history=True)
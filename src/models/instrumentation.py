@@ -0,0 +1,40 @@
+import logging
+
+from sqlalchemy import event
+
+from .base import Base
+
+logger = logging.getLogger(__name__)
+
+_enabled = False
+
+
+def _log_init(target, args, kwargs) -> None:
+    logger.debug("Création de %s avec %s", type(target).__name__, kwargs)
+
+
+def _log_load(target, context) -> None:
+    logger.debug("Chargement de %r", target)
+
+
+def enable_model_instrumentation() -> None:
+    """
+    Trace au niveau DEBUG la construction et le chargement des objets de
+    tous les modèles (événements "init" et "load" de SQLAlchemy). Désactivée
+    par défaut : sans écouteur, construire ou charger un objet ne coûte rien
+    de plus. Les messages sont formatés seulement si DEBUG est actif pour
+    src.models.instrumentation.
+    """
+    global _enabled
+    if not _enabled:
+        event.listen(Base, "init", _log_init, propagate=True)
+        event.listen(Base, "load", _log_load, propagate=True)
+        _enabled = True
+
+
+def disable_model_instrumentation() -> None:
+    global _enabled
+    if _enabled:
+        event.remove(Base, "init", _log_init)
+        event.remove(Base, "load", _log_load)
+        _enabled = False
@@ -1,5 +1,5 @@
 import logging
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint, Index, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint, Index, Boolean, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -20,9 +20,17 @@ class Loan(Base):
         CheckConstraint('due_date > loan_date', name='check_due_date_after_loan_date'),
         CheckConstraint('return_date IS NULL OR return_date >= loan_date', name='check_return_date_after_loan_date'),
         # Index pour les recherches fréquentes
-        Index('idx_loan_user_id', 'user_id'),
+        # (user_id, return_date) couvre aussi les recherches par user_id seul
+        Index('idx_loan_user_return_date', 'user_id', 'return_date'),
         Index('idx_loan_book_id', 'book_id'),
         Index('idx_loan_return_date', 'return_date'),
+        # Un seul emprunt actif par utilisateur et par livre (index partiel)
+        Index(
+            'uq_loan_active_user_book', 'user_id', 'book_id',
+            unique=True,
+            sqlite_where=text('return_date IS NULL'),
+            postgresql_where=text('return_date IS NULL'),
+        ).ddl_if(dialect=('sqlite', 'postgresql')),
     )
     
     # Relations
@@ -30,7 +38,6 @@ class Loan(Base):
     book = relationship("Book", back_populates="loans")
 
     def __init__(self, user_id, book_id, due_date, loan_date=None, return_date=None, extended=False):
-        logger.debug(f"Creating Loan: user_id={user_id}, book_id={book_id}, due_date={due_date}, loan_date={loan_date}, return_date={return_date}, extended={extended}")
         self.user_id = user_id
         self.book_id = book_id
         self.due_date = due_date
@@ -38,11 +45,14 @@ class Loan(Base):
         self.return_date = return_date
         self.extended = extended
 
+    def __repr__(self):
+        return f"<Loan(id={self.id!r}, user_id={self.user_id!r}, book_id={self.book_id!r}, due_date={self.due_date!r})>"
+
     def extend_loan(self, new_due_date):
-        logger.info(f"Extending loan {self} to new due date: {new_due_date}")
+        logger.info("Extending loan %s to new due date: %s", self, new_due_date)
         self.due_date = new_due_date
         self.extended = True
 
     def mark_returned(self, return_date=None):
-        logger.info(f"Marking loan {self} as returned on {return_date or datetime.utcnow()}")
-        self.return_date = return_date or datetime.utcnow()
\ No newline at end of file
+        self.return_date = return_date or datetime.utcnow()
+        logger.info("Marking loan %s as returned on %s", self, self.return_date)
\ No newline at end of file
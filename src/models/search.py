@@ -0,0 +1,49 @@
+import logging
+from sqlalchemy import DDL, event
+
+from .books import Book
+
+logger = logging.getLogger(__name__)
+
+# Index plein texte (SQLite FTS5) du catalogue, en mode "contenu externe" :
+# la table virtuelle ne stocke que l'index, les données restent dans `book`.
+BOOK_FTS_TABLE = "book_fts"
+BOOK_FTS_COLUMNS = ("title", "author", "isbn", "description")
+
+_columns = ", ".join(BOOK_FTS_COLUMNS)
+_new_values = ", ".join(f"new.{c}" for c in BOOK_FTS_COLUMNS)
+_old_values = ", ".join(f"old.{c}" for c in BOOK_FTS_COLUMNS)
+
+BOOK_FTS_CREATE = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {BOOK_FTS_TABLE} USING fts5("
+    f"{_columns}, content='book', content_rowid='id', "
+    f"tokenize='unicode61 remove_diacritics 2')",
+    # Les triggers maintiennent l'index à jour pour toute écriture sur `book`
+    # (BookRepository.create/update/remove, init_db, imports...)
+    f"CREATE TRIGGER IF NOT EXISTS {BOOK_FTS_TABLE}_ai AFTER INSERT ON book BEGIN "
+    f"INSERT INTO {BOOK_FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); "
+    f"END",
+    f"CREATE TRIGGER IF NOT EXISTS {BOOK_FTS_TABLE}_ad AFTER DELETE ON book BEGIN "
+    f"INSERT INTO {BOOK_FTS_TABLE}({BOOK_FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); "
+    f"END",
+    # Seules les colonnes indexées déclenchent une réindexation (pas `quantity`)
+    f"CREATE TRIGGER IF NOT EXISTS {BOOK_FTS_TABLE}_au AFTER UPDATE OF {_columns} ON book BEGIN "
+    f"INSERT INTO {BOOK_FTS_TABLE}({BOOK_FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); "
+    f"INSERT INTO {BOOK_FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); "
+    f"END",
+]
+
+BOOK_FTS_REBUILD = f"INSERT INTO {BOOK_FTS_TABLE}({BOOK_FTS_TABLE}) VALUES ('rebuild')"
+
+BOOK_FTS_DROP = [
+    f"DROP TRIGGER IF EXISTS {BOOK_FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {BOOK_FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {BOOK_FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {BOOK_FTS_TABLE}",
+]
+
+# Création automatique avec Base.metadata.create_all (SQLite uniquement)
+for statement in BOOK_FTS_CREATE:
+    event.listen(Book.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in BOOK_FTS_DROP:
+    event.listen(Book.__table__, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
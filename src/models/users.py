@@ -23,10 +23,5 @@ class User(Base):
     # Relations
     loans = relationship("Loan", back_populates="user", cascade="all, delete-orphan")
 
-    def __init__(self, **kwargs):
-        logger.debug(f"Creating User with: {kwargs}")
-        super().__init__(**kwargs)
-
     def __repr__(self):
-        logger.debug(f"User __repr__ called for: {self.email}")
         return f"<User(email={self.email}, full_name={self.full_name})>"
\ No newline at end of file
@@ -0,0 +1,82 @@
+import logging
+from datetime import datetime
+from itertools import chain
+from typing import Iterable, Set
+
+from sqlalchemy import Column, Integer, String, event, insert, select, update
+from sqlalchemy.orm import Session
+
+from .base import Base
+
+logger = logging.getLogger(__name__)
+
+VERSIONED_TABLES = ("book", "category", "user", "loan")
+
+# Drapeau de session : des versions ont changé dans la transaction en cours
+VERSIONS_CHANGED_KEY = "table_versions_changed"
+
+
+class TableVersion(Base):
+    """
+    Numéro de version d'une table, incrémenté dans la transaction de chaque
+    écriture sur cette table. updated_at donne la date de la dernière écriture.
+    """
+    name = Column(String(50), nullable=False, unique=True, index=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion(name={self.name!r}, version={self.version!r})>"
+
+
+def changed_tables(session: Session) -> Set[str]:
+    """
+    Tables versionnées touchées par les objets nouveaux, modifiés et
+    supprimés de la session, avant flush. Un changement de collection
+    (catégories d'un livre) rend le livre modifié.
+    """
+    tables = set()
+    for obj in chain(session.new, session.deleted, session.dirty):
+        name = getattr(obj, "__tablename__", None)
+        if name in VERSIONED_TABLES and (obj not in session.dirty or session.is_modified(obj)):
+            tables.add(name)
+    return tables
+
+
+def bump_versions(connection, names: Iterable[str]) -> None:
+    """
+    Incrémente la version des tables en une requête UPDATE. Les lignes
+    absentes (base non initialisée) sont créées à la version 1.
+    """
+    names = sorted(set(names))
+    if not names:
+        return
+    table = TableVersion.__table__
+    now = datetime.utcnow()
+    result = connection.execute(
+        update(table)
+        .where(table.c.name.in_(names))
+        .values(version=table.c.version + 1, updated_at=now)
+    )
+    if result.rowcount != len(names):
+        existing = set(connection.execute(select(table.c.name).where(table.c.name.in_(names))).scalars())
+        connection.execute(insert(table), [
+            {"name": name, "version": 1, "created_at": now, "updated_at": now}
+            for name in names if name not in existing
+        ])
+    logger.debug("Versions incrémentées: %s", names)
+
+
+def bump_session_versions(session: Session, names: Iterable[str]) -> None:
+    """
+    Incrémente les versions dans la transaction de la session (écritures
+    Core qui ne passent pas par le flush) et le signale pour l'après-commit.
+    """
+    names = set(names)
+    if names:
+        bump_versions(session.connection(), names)
+        session.info[VERSIONS_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "before_flush")
+def _track_versions(session, flush_context, instances):
+    bump_session_versions(session, changed_tables(session))
@@ -1,11 +1,14 @@
 import logging
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models.base import Base
+from ..db.unit_of_work import in_unit_of_work
 from src.exceptions import CustomException  # Ajout de l'import
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -23,6 +26,18 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.db = db
         logger.debug(f"BaseRepository initialized for model {self.model.__name__}")
 
+    def _commit(self, *objs: Any) -> None:
+        """
+        Valide la transaction et recharge `objs`. Dans une unité de travail,
+        se contente d'un flush : le commit a lieu à la sortie du bloc.
+        """
+        if in_unit_of_work(self.db):
+            self.db.flush()
+            return
+        self.db.commit()
+        for obj in objs:
+            self.db.refresh(obj)
+
     def get(self, id: int):
         """
         Récupère un objet par son ID.
@@ -31,6 +46,16 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = self.db.query(self.model).filter(self.model.id == id).first()
         return obj  # Pas d'exception ici
 
+    def get_many(self, *, ids: Iterable[int]) -> List[ModelType]:
+        """
+        Récupère plusieurs objets par leurs IDs en une seule requête.
+        """
+        ids = set(ids)
+        if not ids:
+            return []
+        logger.debug(f"Fetching {len(ids)} {self.model.__name__} objects by id")
+        return self.db.query(self.model).filter(self.model.id.in_(ids)).all()
+
     def get_multi(
         self, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
@@ -48,8 +73,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             obj_in_data = obj_in.dict() if hasattr(obj_in, "dict") else dict(obj_in)
             db_obj = self.model(**obj_in_data)
             self.db.add(db_obj)
-            self.db.commit()
-            self.db.refresh(db_obj)
+            self._commit(db_obj)
             logger.info(f"Created new {self.model.__name__} with id={db_obj.id}")
             return db_obj
         except Exception as e:
@@ -70,8 +94,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             for field, value in update_data.items():
                 setattr(db_obj, field, value)
             self.db.add(db_obj)
-            self.db.commit()
-            self.db.refresh(db_obj)
+            self._commit(db_obj)
             logger.info(f"Updated {self.model.__name__} with id={db_obj.id}")
         except Exception as e:
             logger.error(f"Erreur lors de la mise à jour de {self.model.__name__} : {e}")
@@ -87,9 +110,65 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if not obj:
                 raise CustomException("Objet non trouvé", status_code=404)
             self.db.delete(obj)
-            self.db.commit()
+            self._commit()
             logger.info(f"Removed {self.model.__name__} with id={id}")
         except Exception as e:
             logger.error(f"Erreur lors de la suppression de {self.model.__name__} : {e}")
             raise CustomException("Erreur lors de la suppression", status_code=500)
-        return obj
\ No newline at end of file
+        return obj
+
+
+T = TypeVar("T")
+
+class AsyncBaseRepository(Generic[ModelType]):
+    """
+    Version asynchrone (lecture) de BaseRepository, sur une AsyncSession.
+
+    Le chargement paresseux n'est pas possible en asynchrone : les relations
+    sérialisées dans les réponses doivent être listées dans `load_options`.
+    """
+    load_options: Sequence[Any] = ()
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        self.model = model
+        self.db = db
+        logger.debug(f"AsyncBaseRepository initialized for model {self.model.__name__}")
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Exécute du code de repository synchrone (construction de requêtes,
+        pagination...) sur la connexion asynchrone, sans bloquer la boucle.
+        """
+        return await self.db.run_sync(lambda session: fn(session, *args, **kwargs))
+
+    async def get(self, id: int) -> Optional[ModelType]:
+        """
+        Récupère un objet par son ID.
+        """
+        logger.debug(f"Fetching {self.model.__name__} with id={id} (async)")
+        result = await self.db.execute(
+            select(self.model).options(*self.load_options).where(self.model.id == id)
+        )
+        return result.scalars().first()
+
+    async def get_many(self, *, ids: Iterable[int]) -> List[ModelType]:
+        """
+        Récupère plusieurs objets par leurs IDs en une seule requête.
+        """
+        ids = set(ids)
+        if not ids:
+            return []
+        result = await self.db.execute(
+            select(self.model).options(*self.load_options).where(self.model.id.in_(ids))
+        )
+        return list(result.scalars().all())
+
+    async def get_multi(self, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        """
+        Récupère plusieurs objets avec pagination.
+        """
+        logger.debug(f"Fetching multiple {self.model.__name__} objects: skip={skip}, limit={limit} (async)")
+        result = await self.db.execute(
+            select(self.model).options(*self.load_options).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
@@ -1,28 +1,39 @@
 import logging
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple, Callable
 
-from .base import BaseRepository
+from .base import BaseRepository, AsyncBaseRepository
+from .search import BookSearchEngine
+from .stats import book_totals, fetch_totals, table_state
+from .versions import versions_view
 from ..models.books import Book
 from ..models.categories import Category, book_category
-from ..utils.cache import cache, invalidate_cache
+from ..models.counters import apply_deltas
+from ..models.versions import bump_session_versions
+from ..utils.cache import cache, invalidate_on_commit
+from ..utils.pagination import PaginationParams, Page, paginate, count_async, count_cache_key, count_tag
 from src.exceptions import CustomException  # Ajout de l'import
 
 logger = logging.getLogger(__name__)
 
 class BookRepository(BaseRepository[Book, None, None]):
+    @property
+    def search_engine(self) -> BookSearchEngine:
+        return BookSearchEngine(self.db)
+
     def get_by_isbn(self, *, isbn: str) -> Optional[Book]:
         logger.debug(f"Recherche du livre avec ISBN: {isbn}")
         return self.db.query(Book).filter(Book.isbn == isbn).first()
     
     def get_by_title(self, *, title: str) -> List[Book]:
         logger.debug(f"Recherche des livres avec titre contenant: {title}")
-        return self.db.query(Book).filter(Book.title.ilike(f"%{title}%")).all()
+        return self.search_engine.filter(self.db.query(Book), title, columns=("title",)).all()
     
     def get_by_author(self, *, author: str) -> List[Book]:
         logger.debug(f"Recherche des livres avec auteur contenant: {author}")
-        return self.db.query(Book).filter(Book.author.ilike(f"%{author}%")).all()
+        return self.search_engine.filter(self.db.query(Book), author, columns=("author",)).all()
     
     def get_with_categories(self, *, id: int) -> Optional[Book]:
         logger.debug(f"Recherche du livre avec ID {id} et ses catégories")
@@ -33,21 +44,82 @@ class BookRepository(BaseRepository[Book, None, None]):
         return self.db.query(Book).options(joinedload(Book.categories)).offset(skip).limit(limit).all()
     
     def search(self, *, query: str) -> List[Book]:
-        logger.debug(f"Recherche des livres par titre, auteur ou ISBN contenant: {query}")
-        return self.db.query(Book).filter(
-            or_(
-                Book.title.ilike(f"%{query}%"),
-                Book.author.ilike(f"%{query}%"),
-                Book.isbn.ilike(f"%{query}%")
-            )
-        ).all()
+        logger.debug(f"Recherche plein texte des livres (titre, auteur, ISBN, description): {query}")
+        return self.search_engine.filter(self.db.query(Book), query).all()
     
+    def search_query(
+        self,
+        *,
+        query: Optional[str] = None,
+        category_id: Optional[int] = None,
+        author: Optional[str] = None,
+        publication_year: Optional[int] = None,
+        rank: bool = True
+    ) -> Query:
+        """
+        Requête de recherche avancée (plein texte, catégorie, auteur, année),
+        à paginer. `rank` trie par pertinence sur `query`.
+        """
+        logger.debug(f"Recherche avancée: query={query}, category_id={category_id}, author={author}, publication_year={publication_year}")
+        search_query = self.db.query(Book)
+        if query:
+            search_query = self.search_engine.filter(search_query, query, rank=rank)
+        if category_id:
+            search_query = search_query.join(book_category).filter(
+                book_category.c.category_id == category_id
+            )
+        if author:
+            search_query = self.search_engine.filter(search_query, author, columns=("author",), rank=False)
+        if publication_year:
+            search_query = search_query.filter(Book.publication_year == publication_year)
+        return search_query
+
     def get_by_category(self, *, category_id: int, skip: int = 0, limit: int = 100) -> List[Book]:
         logger.debug(f"Recherche des livres pour la catégorie ID {category_id} (skip={skip}, limit={limit})")
         return self.db.query(Book).join(book_category).filter(
             book_category.c.category_id == category_id
         ).offset(skip).limit(limit).all()
     
+    def get_existing_isbns(self, *, isbns: Iterable[str]) -> Set[str]:
+        """
+        Renvoie, parmi `isbns`, ceux déjà présents en base (une seule requête).
+        """
+        isbns = set(isbns)
+        if not isbns:
+            return set()
+        return set(self.db.execute(select(Book.isbn).where(Book.isbn.in_(isbns))).scalars())
+
+    def bulk_insert(self, *, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insère des livres en une seule requête (executemany, sans commit) et
+        renvoie {isbn: id}. Les lignes doivent déjà être validées.
+        """
+        if not rows:
+            return {}
+        logger.debug(f"Insertion groupée de {len(rows)} livre(s)")
+        self.db.execute(insert(Book.__table__), rows)
+        # L'insertion Core ne passe pas par le flush : compteurs et version mis à jour ici
+        apply_deltas(self.db.connection(), {
+            "unique_books": len(rows),
+            "total_books": sum(row["quantity"] for row in rows),
+        })
+        bump_session_versions(self.db, {"book"})
+        ids = dict(self.db.execute(
+            select(Book.isbn, Book.id).where(Book.isbn.in_([row["isbn"] for row in rows]))
+        ).all())
+        self._invalidate_caches()
+        return ids
+
+    def bulk_add_categories(self, *, links: Iterable[Tuple[int, int]]) -> None:
+        """
+        Associe des catégories aux livres, `links` étant des couples
+        (book_id, category_id), en une seule requête (sans commit).
+        """
+        rows = [{"book_id": book_id, "category_id": category_id} for book_id, category_id in set(links)]
+        if rows:
+            self.db.execute(insert(book_category), rows)
+            bump_session_versions(self.db, {"book"})
+
     def add_category(self, *, book_id: int, category_id: int) -> None:
         logger.info(f"Ajout de la catégorie ID {category_id} au livre ID {book_id}")
         book = self.get(id=book_id)
@@ -61,8 +133,11 @@ class BookRepository(BaseRepository[Book, None, None]):
             raise CustomException(f"Catégorie avec l'ID {category_id} non trouvée", status_code=404)
         
         book.categories.append(category)
+        # La représentation du livre change : date de modification (ETag, Last-Modified)
+        book.updated_at = datetime.utcnow()
         try:
-            self.db.commit()
+            invalidate_on_commit(self.db, count_tag("books"))
+            self._commit()
             logger.info(f"Catégorie ID {category_id} ajoutée au livre ID {book_id}")
         except Exception as e:
             logger.error(f"Erreur lors de l'ajout de la catégorie : {e}")
@@ -81,32 +156,31 @@ class BookRepository(BaseRepository[Book, None, None]):
             raise CustomException(f"Catégorie avec l'ID {category_id} non trouvée", status_code=404)
         
         book.categories.remove(category)
+        book.updated_at = datetime.utcnow()
         try:
-            self.db.commit()
+            invalidate_on_commit(self.db, count_tag("books"))
+            self._commit()
             logger.info(f"Catégorie ID {category_id} supprimée du livre ID {book_id}")
         except Exception as e:
             logger.error(f"Erreur lors de la suppression de la catégorie : {e}")
             raise CustomException("Erreur lors de la suppression de la catégorie du livre", status_code=500)
     
-    @cache(expiry=60)  # Cache pendant 1 minute
+    @cache(expiry=60, tags=("books",))  # Cache pendant 1 minute
     def get_stats(self) -> Dict[str, Any]:
         logger.info("Récupération des statistiques sur les livres")
         try:
-            total_books = self.db.query(func.sum(Book.quantity)).scalar() or 0
-            unique_books = self.db.query(func.count(Book.id)).scalar() or 0
-            avg_publication_year = self.db.query(func.avg(Book.publication_year)).scalar() or 0
+            stats = fetch_totals(self.db, book_totals())
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des statistiques : {e}")
             raise CustomException("Erreur lors de la récupération des statistiques sur les livres", status_code=500)
         
-        stats = {
-            "total_books": total_books,
-            "unique_books": unique_books,
-            "avg_publication_year": avg_publication_year
-        }
         logger.debug(f"Statistiques récupérées: {stats}")
         return stats
 
+    def _invalidate_caches(self) -> None:
+        # Statistiques et comptages invalidés ensemble au commit
+        invalidate_on_commit(self.db, "books", count_tag("books"))
+
     def create(self, *, obj_in: Any) -> Any:
         logger.info("Création d'un nouveau livre")
         obj_in_data = obj_in.dict() if hasattr(obj_in, "dict") else dict(obj_in)
@@ -115,8 +189,8 @@ class BookRepository(BaseRepository[Book, None, None]):
         db_obj = self.model(**filtered_data)
         try:
             self.db.add(db_obj)
-            self.db.commit()
-            self.db.refresh(db_obj)
+            self._invalidate_caches()
+            self._commit(db_obj)
             logger.info(f"Livre créé avec ID {db_obj.id}")
         except Exception as e:
             logger.error(f"Erreur lors de la création du livre : {e}")
@@ -126,9 +200,9 @@ class BookRepository(BaseRepository[Book, None, None]):
     def update(self, *, db_obj: Book, obj_in: Any) -> Book:
         logger.info(f"Mise à jour du livre ID {db_obj.id}")
         try:
+            self._invalidate_caches()
             book = super().update(db_obj=db_obj, obj_in=obj_in)
-            invalidate_cache("src.repositories.books")
-            logger.debug("Cache invalidé après mise à jour")
+            logger.debug("Cache invalidé au commit de la mise à jour")
         except Exception as e:
             logger.error(f"Erreur lors de la mise à jour du livre : {e}")
             raise CustomException("Erreur lors de la mise à jour du livre", status_code=500)
@@ -137,10 +211,73 @@ class BookRepository(BaseRepository[Book, None, None]):
     def remove(self, *, id: int) -> Book:
         logger.info(f"Suppression du livre ID {id}")
         try:
+            self._invalidate_caches()
             book = super().remove(id=id)
-            invalidate_cache("src.repositories.books")
-            logger.debug("Cache invalidé après suppression")
+            logger.debug("Cache invalidé au commit de la suppression")
         except Exception as e:
             logger.error(f"Erreur lors de la suppression du livre : {e}")
             raise CustomException("Erreur lors de la suppression du livre", status_code=500)
         return book
+
+
+class AsyncBookRepository(AsyncBaseRepository[Book]):
+    # Les catégories font partie de la réponse : chargées avec les livres
+    load_options = (selectinload(Book.categories),)
+
+    @staticmethod
+    def _count_key(session: Session, **filters: Any) -> str:
+        # Les versions font partie de la clé : un total mis en cache avant une
+        # écriture (y compris d'un autre worker) n'est plus jamais relu
+        return count_cache_key(
+            "books",
+            book_version=versions_view.version(session, "book").version,
+            category_version=versions_view.version(session, "category").version,
+            **filters
+        )
+
+    async def get_state(self, *, book_id: Optional[int] = None) -> Tuple[List[Any], Optional[datetime]]:
+        """
+        État des livres et catégories (ou d'un seul livre) pour les requêtes
+        conditionnelles : (signature, date de dernière modification).
+        """
+        return await self.run_sync(lambda session: table_state(session, Book, Category, book_id=book_id))
+
+    async def _paginate(self, build: Callable[[Session], Query], params: PaginationParams, **filters: Any) -> Page:
+        # Le total est lu ou calculé hors de run_sync : un calcul déjà en cours
+        # pour la même clé est attendu sans bloquer la boucle (voir count_async)
+        counted = None
+        if params.include_total:
+            count_key = await self.run_sync(lambda session: self._count_key(session, **filters))
+            counted = await count_async(count_key, lambda: self.run_sync(lambda session: build(session).count()))
+        return await self.run_sync(lambda session: paginate(build(session), params, Book, counted=counted))
+
+    async def paginate(self, *, params: PaginationParams) -> Page:
+        """
+        Liste paginée des livres (mêmes modes et cache de total que paginate).
+        """
+        return await self._paginate(lambda session: session.query(Book).options(*self.load_options), params)
+
+    async def search(
+        self,
+        *,
+        params: PaginationParams,
+        query: Optional[str] = None,
+        category_id: Optional[int] = None,
+        author: Optional[str] = None,
+        publication_year: Optional[int] = None
+    ) -> Page:
+        """
+        Recherche avancée paginée, construite par BookRepository.search_query.
+        """
+        def build(session: Session) -> Query:
+            return BookRepository(Book, session).search_query(
+                query=query,
+                category_id=category_id,
+                author=author,
+                publication_year=publication_year,
+                # Tri par pertinence uniquement si aucun tri explicite n'est demandé
+                rank=not params.sort_by
+            ).options(*self.load_options)
+        return await self._paginate(
+            build, params, query=query, category_id=category_id, author=author, publication_year=publication_year
+        )
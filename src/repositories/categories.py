@@ -1,9 +1,13 @@
 import logging
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from .base import BaseRepository
 from ..models.categories import Category
+from ..models.versions import bump_session_versions
+from ..utils.cache import invalidate_on_commit
+from ..utils.pagination import count_tag
 from src.exceptions import CustomException  # Ajout de l'import
 
 logger = logging.getLogger(__name__)
@@ -20,7 +24,7 @@ class CategoryRepository(BaseRepository[Category, None, None]):
             logger.error(f"Erreur lors de la recherche de la catégorie '{name}': {e}")
             raise CustomException("Erreur lors de la recherche de la catégorie", status_code=500)
         if category:
-            logger.info(f"Catégorie trouvée: {category}")
+            logger.info("Catégorie trouvée: %s", category)
         else:
             logger.info(f"Aucune catégorie trouvée pour le nom: {name}")
         return category
@@ -38,10 +42,41 @@ class CategoryRepository(BaseRepository[Category, None, None]):
                 if description:
                     category_data["description"] = description
                 category = self.create(obj_in=category_data)
-                logger.info(f"Catégorie créée: {category}")
+                logger.info("Catégorie créée: %s", category)
             else:
                 logger.info(f"Catégorie '{name}' déjà existante.")
         except Exception as e:
             logger.error(f"Erreur lors de la récupération ou création de la catégorie '{name}': {e}")
             raise CustomException("Erreur lors de la récupération ou création de la catégorie", status_code=500)
-        return category
\ No newline at end of file
+        return category
+
+    def get_or_create_many(self, *, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Renvoie {nom: id} pour les catégories demandées, en créant les
+        manquantes en une seule insertion (sans commit).
+        """
+        names = set(names)
+        if not names:
+            return {}
+        logger.debug(f"Résolution de {len(names)} catégorie(s)")
+        query = select(Category.name, Category.id).where(Category.name.in_(names))
+        try:
+            ids = dict(self.db.execute(query).all())
+            missing = names - ids.keys()
+            if missing:
+                self.db.execute(insert(Category.__table__), [{"name": name} for name in sorted(missing)])
+                bump_session_versions(self.db, {"category"})
+                ids.update(self.db.execute(query.where(Category.name.in_(missing))).all())
+                logger.info(f"{len(missing)} catégorie(s) créée(s): {sorted(missing)}")
+        except Exception as e:
+            logger.error(f"Erreur lors de la création des catégories : {e}")
+            raise CustomException("Erreur lors de la création des catégories", status_code=500)
+        return ids
+
+    def remove(self, *, id: int) -> Category:
+        """
+        Supprime une catégorie et invalide les comptages de livres filtrés par catégorie.
+        """
+        invalidate_on_commit(self.db, count_tag("books"))
+        category = super().remove(id=id)
+        return category
@@ -0,0 +1,51 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict
+
+from .base import BaseRepository
+from .stats import book_totals, user_totals, loan_totals, fetch_totals
+from ..models.counters import LibraryCounter, COUNTER_NAMES
+from src.exceptions import CustomException
+
+logger = logging.getLogger(__name__)
+
+
+class CounterRepository(BaseRepository[LibraryCounter, None, None]):
+    def get_values(self) -> Dict[str, int]:
+        """
+        Récupère la valeur de tous les compteurs.
+        """
+        logger.debug("Lecture des compteurs de la bibliothèque")
+        return {c.name: c.value for c in self.db.query(LibraryCounter).all()}
+
+    def reconcile(self, *, fix: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Recalcule les compteurs à partir des tables de base et renvoie les écarts
+        ({nom: {"stored": ..., "actual": ...}}). Si `fix` est vrai, les compteurs
+        sont réécrits (ou créés) avec les valeurs exactes.
+        """
+        logger.info("Réconciliation des compteurs (fix=%s)", fix)
+        try:
+            totals = fetch_totals(self.db, book_totals(), user_totals(), loan_totals(datetime.utcnow()))
+            counters = {c.name: c for c in self.db.query(LibraryCounter).all()}
+            drift = {}
+            for name in COUNTER_NAMES:
+                actual = int(totals[name])
+                counter = counters.get(name)
+                stored = counter.value if counter else None
+                if stored == actual:
+                    continue
+                drift[name] = {"stored": stored, "actual": actual}
+                if fix:
+                    if counter:
+                        counter.value = actual
+                    else:
+                        self.db.add(LibraryCounter(name=name, value=actual))
+            if fix:
+                self._commit()
+        except Exception as e:
+            logger.error(f"Erreur lors de la réconciliation des compteurs : {e}")
+            raise CustomException("Erreur lors de la réconciliation des compteurs", status_code=500)
+        if drift:
+            logger.warning("Écarts détectés sur les compteurs: %s", drift)
+        return drift
@@ -1,13 +1,22 @@
 import logging
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from typing import List, Optional, Dict, Any, Iterable, Set
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, update, case, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 
-from .base import BaseRepository
+from .base import BaseRepository, AsyncBaseRepository
+from .stats import loan_totals, fetch_totals
 from ..models.loans import Loan
 from ..models.books import Book
 from ..models.users import User
+from ..models.counters import apply_deltas
+from ..models.versions import bump_session_versions
+from ..utils.cache import invalidate_on_commit
+from ..db.unit_of_work import in_unit_of_work
 from src.exceptions import CustomException  # Ajout de l'import
 
 logger = logging.getLogger(__name__)
@@ -24,6 +33,235 @@ class LoanRepository(BaseRepository[Loan, None, None]):
             logger.error(f"Erreur lors de la récupération des emprunts actifs : {e}")
             raise CustomException("Erreur lors de la récupération des emprunts actifs", status_code=500)
     
+    def has_active_loan(self, *, user_id: int, book_id: int) -> bool:
+        """
+        Indique si l'utilisateur a un emprunt non retourné de ce livre.
+        """
+        logger.debug("Checking active loan for user_id=%d, book_id=%d", user_id, book_id)
+        try:
+            return self.db.query(
+                self.db.query(Loan.id).filter(
+                    Loan.user_id == user_id,
+                    Loan.book_id == book_id,
+                    Loan.return_date == None
+                ).exists()
+            ).scalar()
+        except Exception as e:
+            logger.error(f"Erreur lors de la vérification de l'emprunt actif : {e}")
+            raise CustomException("Erreur lors de la vérification des emprunts actifs", status_code=500)
+
+    def count_active_loans_by_user(self, *, user_id: int) -> int:
+        """
+        Compte les emprunts non retournés d'un utilisateur (index user_id, return_date).
+        """
+        logger.debug("Counting active loans for user_id=%d", user_id)
+        try:
+            return self.db.query(func.count(Loan.id)).filter(
+                Loan.user_id == user_id,
+                Loan.return_date == None
+            ).scalar() or 0
+        except Exception as e:
+            logger.error(f"Erreur lors du comptage des emprunts actifs : {e}")
+            raise CustomException("Erreur lors du comptage des emprunts actifs", status_code=500)
+
+    def checkout(self, *, user_id: int, book_id: int, loan_date: datetime, due_date: datetime) -> Optional[Loan]:
+        """
+        Emprunt atomique : décrément conditionnel du stock et création de
+        l'emprunt dans une seule transaction. Renvoie None si aucun exemplaire
+        n'est disponible (le stock ne peut jamais devenir négatif).
+        """
+        logger.debug("Checkout for user_id=%d, book_id=%d", user_id, book_id)
+        try:
+            # UPDATE ... WHERE quantity > 0 : le verrou d'écriture est pris dès
+            # cette requête, deux emprunts concurrents ne lisent pas le même stock
+            result = self.db.execute(
+                update(Book)
+                .where(Book.id == book_id, Book.quantity > 0)
+                .values(quantity=Book.quantity - 1)
+            )
+            if result.rowcount != 1:
+                # Aucune ligne modifiée : rien à annuler
+                return None
+            # L'UPDATE en masse ne passe pas par le flush : compteur et version mis à jour ici
+            apply_deltas(self.db.connection(), {"total_books": -1})
+            bump_session_versions(self.db, {"book"})
+            loan = Loan(user_id=user_id, book_id=book_id, loan_date=loan_date, due_date=due_date, return_date=None)
+            self.db.add(loan)
+            invalidate_on_commit(self.db, "books")
+            self._commit(loan)
+        except IntegrityError as e:
+            # Index unique partiel : emprunt actif créé entre la vérification et l'écriture
+            if not in_unit_of_work(self.db):
+                self.db.rollback()
+            logger.warning(f"L'utilisateur {user_id} a déjà emprunté le livre {book_id} et ne l'a pas encore rendu : {e}")
+            raise CustomException("L'utilisateur a déjà emprunté ce livre et ne l'a pas encore rendu", status_code=409)
+        except Exception as e:
+            if not in_unit_of_work(self.db):
+                self.db.rollback()
+            logger.error(f"Erreur lors de l'emprunt du livre {book_id} : {e}")
+            raise CustomException("Erreur lors de la création de l'emprunt", status_code=500)
+        return loan
+
+    def checkin(self, *, loan_id: int, book_id: int, return_date: datetime) -> bool:
+        """
+        Retour atomique : l'emprunt n'est marqué retourné que s'il ne l'était
+        pas encore, et le stock est réincrémenté dans la même transaction.
+        Renvoie False si l'emprunt a déjà été retourné.
+        """
+        logger.debug("Checkin for loan_id=%d, book_id=%d", loan_id, book_id)
+        try:
+            result = self.db.execute(
+                update(Loan)
+                .where(Loan.id == loan_id, Loan.return_date == None)
+                .values(return_date=return_date)
+            )
+            if result.rowcount != 1:
+                return False
+            deltas = {"active_loans": -1}
+            result = self.db.execute(
+                update(Book)
+                .where(Book.id == book_id)
+                .values(quantity=Book.quantity + 1)
+            )
+            if result.rowcount == 1:
+                deltas["total_books"] = 1
+            apply_deltas(self.db.connection(), deltas)
+            bump_session_versions(self.db, {"book", "loan"})
+            invalidate_on_commit(self.db, "books")
+            self._commit()
+        except Exception as e:
+            if not in_unit_of_work(self.db):
+                self.db.rollback()
+            logger.error(f"Erreur lors du retour de l'emprunt {loan_id} : {e}")
+            raise CustomException("Erreur lors du retour de l'emprunt", status_code=500)
+        return True
+
+    def get_active_book_ids(self, *, user_id: int) -> Set[int]:
+        """
+        IDs des livres empruntés et non rendus par l'utilisateur (une requête).
+        """
+        logger.debug("Fetching active loan book ids for user_id=%d", user_id)
+        try:
+            return set(self.db.execute(
+                select(Loan.book_id).where(Loan.user_id == user_id, Loan.return_date == None)
+            ).scalars())
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des emprunts actifs de l'utilisateur {user_id} : {e}")
+            raise CustomException("Erreur lors de la vérification des emprunts actifs", status_code=500)
+
+    def checkout_many(
+        self,
+        *,
+        user_id: int,
+        book_ids: Iterable[int],
+        loan_date: datetime,
+        due_date: datetime
+    ) -> Dict[int, Loan]:
+        """
+        Emprunt groupé : un seul UPDATE conditionnel du stock pour tous les
+        livres, les emprunts créés dans la même transaction. Renvoie
+        {book_id: emprunt} pour les livres dont un exemplaire était disponible
+        et qui n'étaient pas déjà empruntés par l'utilisateur.
+        """
+        book_ids = set(book_ids)
+        logger.debug("Batch checkout for user_id=%d, book_ids=%s", user_id, sorted(book_ids))
+        try:
+            decremented = set(self.db.execute(
+                update(Book)
+                .where(Book.id.in_(book_ids), Book.quantity > 0)
+                .values(quantity=Book.quantity - 1)
+                .returning(Book.id)
+            ).scalars())
+            if not decremented:
+                return {}
+            # ON CONFLICT DO NOTHING : un emprunt actif créé entre la vérification
+            # et l'écriture (index unique partiel) n'écarte que son propre livre
+            now = datetime.utcnow()
+            inserted = dict(self.db.execute(
+                self._insert_ignoring_conflicts(Loan.__table__)
+                .values([
+                    {"user_id": user_id, "book_id": book_id, "loan_date": loan_date, "due_date": due_date,
+                     "return_date": None, "extended": False, "created_at": now, "updated_at": now}
+                    for book_id in sorted(decremented)
+                ])
+                .returning(Loan.book_id, Loan.id)
+            ).all())
+            conflicts = decremented - set(inserted)
+            if conflicts:
+                logger.warning(f"L'utilisateur {user_id} a déjà emprunté les livres {sorted(conflicts)} et ne les a pas encore rendus")
+                self.db.execute(
+                    update(Book)
+                    .where(Book.id.in_(conflicts))
+                    .values(quantity=Book.quantity + 1)
+                )
+            if not inserted:
+                return {}
+            # Insertion Core : compteurs et version mis à jour ici
+            apply_deltas(self.db.connection(), {
+                "total_books": -len(inserted),
+                "total_loans": len(inserted),
+                "active_loans": len(inserted),
+            })
+            bump_session_versions(self.db, {"book", "loan"})
+            invalidate_on_commit(self.db, "books")
+            self._commit()
+            loans = {
+                loan.book_id: loan
+                for loan in self.db.query(Loan).filter(Loan.id.in_(inserted.values()))
+            }
+        except Exception as e:
+            if not in_unit_of_work(self.db):
+                self.db.rollback()
+            logger.error(f"Erreur lors de l'emprunt groupé pour l'utilisateur {user_id} : {e}")
+            raise CustomException("Erreur lors de la création des emprunts", status_code=500)
+        return loans
+
+    def _insert_ignoring_conflicts(self, table):
+        dialect = self.db.get_bind().dialect.name
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        return insert(table).on_conflict_do_nothing()
+
+    def checkin_many(self, *, loan_ids: Iterable[int], return_date: datetime) -> Set[int]:
+        """
+        Retour groupé : marque retournés les emprunts encore ouverts et
+        réincrémente le stock de chaque livre en un seul UPDATE, dans la même
+        transaction. Renvoie les IDs des emprunts effectivement retournés.
+        """
+        loan_ids = set(loan_ids)
+        logger.debug("Batch checkin for loan_ids=%s", sorted(loan_ids))
+        try:
+            rows = self.db.execute(
+                update(Loan)
+                .where(Loan.id.in_(loan_ids), Loan.return_date == None)
+                .values(return_date=return_date)
+                .returning(Loan.id, Loan.book_id)
+            ).all()
+            if not rows:
+                return set()
+            copies = Counter(book_id for _, book_id in rows)
+            restocked = set(self.db.execute(
+                update(Book)
+                .where(Book.id.in_(copies))
+                .values(quantity=Book.quantity + case(copies, value=Book.id, else_=0))
+                .returning(Book.id)
+            ).scalars())
+            apply_deltas(self.db.connection(), {
+                "active_loans": -len(rows),
+                "total_books": sum(copies[book_id] for book_id in restocked),
+            })
+            bump_session_versions(self.db, {"book", "loan"})
+            returned = {loan_id for loan_id, _ in rows}
+            invalidate_on_commit(self.db, "books")
+            self._commit()
+            if not in_unit_of_work(self.db):
+                self.db.query(Loan).filter(Loan.id.in_(returned)).all()
+        except Exception as e:
+            if not in_unit_of_work(self.db):
+                self.db.rollback()
+            logger.error(f"Erreur lors du retour groupé des emprunts {sorted(loan_ids)} : {e}")
+            raise CustomException("Erreur lors du retour des emprunts", status_code=500)
+        return returned
+
     def get_overdue_loans(self) -> List[Loan]:
         """
         Récupère les emprunts en retard.
@@ -96,12 +334,10 @@ class LoanRepository(BaseRepository[Loan, None, None]):
         now = datetime.utcnow()
         logger.info("Fetching loan statistics at %s", now)
         try:
-            total_loans = self.db.query(func.count(Loan.id)).scalar() or 0
-            active_loans = self.db.query(func.count(Loan.id)).filter(Loan.return_date == None).scalar() or 0
-            overdue_loans = self.db.query(func.count(Loan.id)).filter(
-                Loan.return_date == None,
-                Loan.due_date < now
-            ).scalar() or 0
+            totals = fetch_totals(self.db, loan_totals(now))
+            total_loans = totals["total_loans"]
+            active_loans = totals["active_loans"]
+            overdue_loans = totals["overdue_loans"]
             
             # Emprunts par mois (12 derniers mois)
             start_date = now - timedelta(days=365)
@@ -125,4 +361,24 @@ class LoanRepository(BaseRepository[Loan, None, None]):
             }
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des statistiques sur les emprunts : {e}")
-            raise CustomException("Erreur lors de la récupération des statistiques sur les emprunts", status_code=500)
\ No newline at end of file
+            raise CustomException("Erreur lors de la récupération des statistiques sur les emprunts", status_code=500)
+
+
+class AsyncLoanRepository(AsyncBaseRepository[Loan]):
+    async def get_loans_by_user_with_details(self, *, user_id: int) -> List[Loan]:
+        """
+        Récupère les emprunts d'un utilisateur avec le livre (et ses
+        catégories) et l'utilisateur, chargés d'avance.
+        """
+        logger.info("Fetching loans with details for user_id=%d (async)", user_id)
+        try:
+            result = await self.db.execute(
+                select(Loan).options(
+                    joinedload(Loan.book).selectinload(Book.categories),
+                    joinedload(Loan.user)
+                ).where(Loan.user_id == user_id)
+            )
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des emprunts pour l'utilisateur {user_id} : {e}")
+            raise CustomException("Erreur lors de la récupération des emprunts de l'utilisateur", status_code=500)
@@ -0,0 +1,120 @@
+import logging
+import re
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event, func, literal_column, or_, select, table, column, text
+from sqlalchemy.orm import Query, Session
+
+from ..models.books import Book
+from ..models.search import BOOK_FTS_TABLE, BOOK_FTS_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Poids bm25 par colonne indexée : un terme trouvé dans le titre compte
+# davantage qu'un terme trouvé dans la description.
+BM25_WEIGHTS = {"title": 10.0, "author": 5.0, "isbn": 2.0, "description": 1.0}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+book_fts = table(BOOK_FTS_TABLE, column("rowid"))
+
+# URL de base -> (index FTS présent, instant de la vérification)
+_fts_available: Dict[str, Tuple[bool, float]] = {}
+
+# Index absent : nouvelle vérification au plus une fois par intervalle (secondes)
+FTS_RECHECK_INTERVAL = 60
+
+
+def reset_fts_availability(*args, **kwargs) -> None:
+    """
+    Oublie l'état mémorisé de l'index (création ou suppression du schéma).
+    """
+    _fts_available.clear()
+
+
+# create_all / drop_all créent et suppriment l'index avec la table `book`
+event.listen(Book.__table__, "after_create", reset_fts_availability)
+event.listen(Book.__table__, "after_drop", reset_fts_availability)
+
+
+class BookSearchEngine:
+    """
+    Moteur de recherche plein texte du catalogue, adossé à l'index FTS5 `book_fts`.
+    Se replie sur des filtres `ilike` si l'index n'est pas disponible (autre SGBD,
+    migration non appliquée).
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_available(self) -> bool:
+        """
+        Indique si l'index FTS5 est utilisable sur la base courante.
+        """
+        bind = self.db.get_bind()
+        if bind.dialect.name != "sqlite":
+            return False
+        key = str(bind.engine.url)
+        now = time.monotonic()
+        known = _fts_available.get(key)
+        if known is not None and (known[0] or now - known[1] < FTS_RECHECK_INTERVAL):
+            return known[0]
+        found = self.db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": BOOK_FTS_TABLE}
+        ).first() is not None
+        if not found and known is None:
+            # Signalé une fois, pas à chaque recherche
+            logger.warning("Index plein texte '%s' absent, repli sur ilike", BOOK_FTS_TABLE)
+        _fts_available[key] = (found, now)
+        return found
+
+    @staticmethod
+    def build_match(terms: str, columns: Optional[Sequence[str]] = None) -> Optional[str]:
+        """
+        Construit une expression MATCH FTS5 à partir d'une saisie utilisateur :
+        chaque mot devient un préfixe entre guillemets (aucune syntaxe FTS n'est
+        interprétée), tous les mots sont requis.
+        """
+        tokens = _TOKEN_RE.findall(terms or "")
+        if not tokens:
+            return None
+        expression = " ".join(f'"{token}"*' for token in tokens)
+        if columns:
+            return f"{{{' '.join(columns)}}} : ({expression})"
+        return expression
+
+    def filter(
+        self,
+        query: Query,
+        terms: str,
+        *,
+        columns: Optional[Sequence[str]] = None,
+        rank: bool = True
+    ) -> Query:
+        """
+        Restreint une requête sur `Book` aux livres correspondant aux termes,
+        triés par pertinence (bm25) si `rank` est vrai.
+        """
+        columns = tuple(columns or BOOK_FTS_COLUMNS)
+        match = self.build_match(terms, columns)
+        if match is None or not self.is_available():
+            return self._filter_ilike(query, terms, columns)
+
+        logger.debug("Recherche plein texte: %s", match)
+        weights = [BM25_WEIGHTS[c] for c in BOOK_FTS_COLUMNS]
+        matches = select(
+            book_fts.c.rowid.label("book_id"),
+            func.bm25(literal_column(BOOK_FTS_TABLE), *weights).label("rank")
+        ).where(
+            literal_column(BOOK_FTS_TABLE).op("MATCH")(match)
+        ).subquery()
+        query = query.join(matches, matches.c.book_id == Book.id)
+        if rank:
+            query = query.order_by(matches.c.rank, Book.id)
+        return query
+
+    @staticmethod
+    def _filter_ilike(query: Query, terms: str, columns: Sequence[str]) -> Query:
+        pattern = f"%{terms}%"
+        return query.filter(or_(*(getattr(Book, c).ilike(pattern) for c in columns)))
@@ -0,0 +1,107 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, select, true
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery
+
+from ..models.books import Book
+from ..models.users import User
+from ..models.loans import Loan
+from ..models.counters import LibraryCounter, COUNTER_NAMES
+from .versions import UNVERSIONED, get_versions
+
+logger = logging.getLogger(__name__)
+
+# Agrégats partagés par StatsService, BookRepository.get_stats et
+# LoanRepository.get_loans_stats. Chaque fonction renvoie une sous-requête
+# d'une seule ligne (un seul parcours de table, agrégats conditionnels) ;
+# fetch_totals les combine pour tout récupérer en un aller-retour.
+
+
+def book_totals() -> Subquery:
+    return select(
+        func.coalesce(func.sum(Book.quantity), 0).label("total_books"),
+        func.count(Book.id).label("unique_books"),
+        func.coalesce(func.avg(Book.publication_year), 0).label("avg_publication_year"),
+    ).subquery("book_totals")
+
+
+def user_totals() -> Subquery:
+    return select(
+        func.count(User.id).label("total_users"),
+        func.coalesce(func.sum(case((User.is_active == True, 1), else_=0)), 0).label("active_users"),
+    ).subquery("user_totals")
+
+
+def loan_totals(now: datetime) -> Subquery:
+    active = Loan.return_date == None
+    return select(
+        func.count(Loan.id).label("total_loans"),
+        func.coalesce(func.sum(case((active, 1), else_=0)), 0).label("active_loans"),
+        func.coalesce(func.sum(case((active & (Loan.due_date < now), 1), else_=0)), 0).label("overdue_loans"),
+    ).subquery("loan_totals")
+
+
+def fetch_totals(db: Session, *totals: Subquery) -> Dict[str, Any]:
+    """
+    Exécute les sous-requêtes d'agrégats en une seule requête et renvoie
+    toutes leurs colonnes dans un dictionnaire.
+    """
+    from_clause = totals[0]
+    for subquery in totals[1:]:
+        # Produit cartésien explicite de sous-requêtes à une ligne
+        from_clause = from_clause.join(subquery, true())
+    columns = [column for subquery in totals for column in subquery.c]
+    row = db.execute(select(*columns).select_from(from_clause)).mappings().one()
+    return dict(row)
+
+
+def counter_totals() -> Subquery:
+    """
+    Compteurs maintenus incrémentalement (table library_counter), pivotés en
+    une ligne. Une valeur NULL signifie que le compteur n'est pas initialisé.
+    """
+    return select(*(
+        func.max(case((LibraryCounter.name == name, LibraryCounter.value))).label(name)
+        for name in COUNTER_NAMES
+    )).subquery("counter_totals")
+
+
+def overdue_totals(now: datetime) -> Subquery:
+    """
+    Emprunts en retard : dépend de l'heure, donc non maintenu en compteur.
+    Le filtre sur return_date IS NULL s'appuie sur idx_loan_return_date.
+    """
+    return select(
+        func.count(Loan.id).label("overdue_loans"),
+    ).where(
+        Loan.return_date == None,
+        Loan.due_date < now
+    ).subquery("overdue_totals")
+
+
+def table_state(db: Session, *models, book_id: Optional[int] = None) -> Tuple[List[Any], Optional[datetime]]:
+    """
+    État des tables pour la validation des réponses HTTP : version de chaque
+    table, lue en base (une requête indexée) et non dans versions_view, qui
+    peut retarder sur les écritures des autres workers : un 304 ne doit
+    jamais confirmer une représentation périmée. Avec `book_id`, la version
+    de la table des livres est remplacée par la date de modification de ce
+    livre (None s'il n'existe pas).
+    Renvoie (signature, date de dernière modification).
+    """
+    state, modified = [], []
+    versions = get_versions(db)
+    for model in models:
+        if model is Book and book_id is not None:
+            updated_at = db.execute(select(Book.updated_at).where(Book.id == book_id)).scalar()
+            state.append(updated_at)
+            modified.append(updated_at)
+            continue
+        version = versions.get(model.__tablename__, UNVERSIONED)
+        state.append(version.version)
+        modified.append(version.updated_at)
+    modified = [value for value in modified if value is not None]
+    return state, max(modified) if modified else None
@@ -1,8 +1,12 @@
 import logging
+from typing import Any, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from .base import BaseRepository
+from .base import BaseRepository, AsyncBaseRepository
 from ..models.users import User
+from ..utils.cache import invalidate_on_commit
+from ..utils.principal_cache import principal_tag
 from src.exceptions import CustomException  # Ajout de l'import
 
 logger = logging.getLogger(__name__)
@@ -19,7 +23,38 @@ class UserRepository(BaseRepository[User, None, None]):
             logger.error(f"Erreur lors de la recherche de l'utilisateur avec l'email '{email}': {e}")
             raise CustomException("Erreur lors de la recherche de l'utilisateur", status_code=500)
         if user:
-            logger.info(f"Utilisateur trouvé: {user}")
+            logger.info("Utilisateur trouvé: %s", user)
         else:
             logger.warning(f"Aucun utilisateur trouvé avec l'email: {email}")
-        return user
\ No newline at end of file
+        return user
+
+    def update(self, *, db_obj: User, obj_in: Any) -> User:
+        """
+        Met à jour un utilisateur ; ses sessions en cache sont oubliées après le commit.
+        """
+        invalidate_on_commit(self.db, principal_tag(db_obj.id))
+        return super().update(db_obj=db_obj, obj_in=obj_in)
+
+    def remove(self, *, id: int) -> User:
+        invalidate_on_commit(self.db, principal_tag(id))
+        return super().remove(id=id)
+
+
+class AsyncUserRepository(AsyncBaseRepository[User]):
+    async def get_by_email(self, *, email: str) -> Optional[User]:
+        """
+        Récupère un utilisateur par son email.
+        """
+        logger.debug("Recherche de l'utilisateur avec l'email: %s (async)", email)
+        result = await self.db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+    async def set_password_hash(self, *, db_obj: User, hashed_password: str) -> User:
+        """
+        Remplace le hash du mot de passe (recalcul au coût configuré). Le
+        hash n'est pas dans le cache des utilisateurs authentifiés : pas
+        d'invalidation.
+        """
+        db_obj.hashed_password = hashed_password
+        await self.db.commit()
+        return db_obj
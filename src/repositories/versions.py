@@ -0,0 +1,78 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.versions import TableVersion, VERSIONS_CHANGED_KEY
+
+logger = logging.getLogger(__name__)
+
+
+class Version(NamedTuple):
+    version: int
+    updated_at: Optional[datetime]
+
+
+UNVERSIONED = Version(0, None)
+
+
+def get_versions(db: Session) -> Dict[str, Version]:
+    """
+    Versions de toutes les tables en une requête (quelques lignes, indexées).
+    """
+    table = TableVersion.__table__
+    rows = db.execute(select(table.c.name, table.c.version, table.c.updated_at)).all()
+    return {name: Version(version, updated_at) for name, version, updated_at in rows}
+
+
+class TableVersionsView:
+    """
+    Vue en mémoire des versions de tables, relue au plus toutes les `max_age`
+    secondes, et dès le commit d'une écriture locale. Une écriture d'un autre
+    worker est donc visible au plus `max_age` secondes plus tard.
+    """
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._versions: Optional[Dict[str, Version]] = None
+        self._loaded_at = 0.0
+        # Une lecture commencée avant une invalidation n'est pas conservée
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> Dict[str, Version]:
+        with self._lock:
+            if self._versions is not None and time.monotonic() - self._loaded_at < self.max_age:
+                return self._versions
+            generation = self._generation
+        versions = get_versions(db)
+        with self._lock:
+            if generation == self._generation:
+                self._versions, self._loaded_at = versions, time.monotonic()
+        return versions
+
+    def version(self, db: Session, name: str) -> Version:
+        return self.get(db).get(name, UNVERSIONED)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._versions = None
+            self._generation += 1
+
+
+versions_view = TableVersionsView(settings.TABLE_VERSIONS_MAX_AGE)
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_versions_view(session):
+    if session.info.pop(VERSIONS_CHANGED_KEY, False):
+        versions_view.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_versions_flag(session):
+    session.info.pop(VERSIONS_CHANGED_KEY, None)
@@ -6,7 +6,7 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from ..models.base import Base
-from ..repositories.base import BaseRepository
+from ..repositories.base import BaseRepository, AsyncBaseRepository
 from src.exceptions import CustomException  # Ajout de l'import
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -54,7 +54,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
         try:
-            logger.info(f"Updating object {db_obj} with data: {obj_in}")
+            logger.info("Updating object %s with data: %s", db_obj, obj_in)
             return self.repository.update(db_obj=db_obj, obj_in=obj_in)
         except Exception as e:
             logger.error(f"Error updating object: {e}")
@@ -66,4 +66,29 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             return self.repository.remove(id=id)
         except Exception as e:
             logger.error(f"Error removing object with id={id}: {e}")
-            raise CustomException(f"Erreur lors de la suppression de l'objet: {e}")
\ No newline at end of file
+            raise CustomException(f"Erreur lors de la suppression de l'objet: {e}")
+
+
+class AsyncBaseService(Generic[ModelType]):
+    """
+    Service de base asynchrone (lecture).
+    """
+    def __init__(self, repository: AsyncBaseRepository):
+        self.repository = repository
+        logger.debug(f"{self.__class__.__name__} initialized with repository {repository.__class__.__name__}")
+    
+    async def get(self, id: Any) -> Optional[ModelType]:
+        try:
+            logger.info(f"Getting object with id={id}")
+            return await self.repository.get(id=id)
+        except Exception as e:
+            logger.error(f"Error getting object with id={id}: {e}")
+            raise CustomException(f"Erreur lors de la récupération de l'objet: {e}")
+    
+    async def get_multi(self, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        try:
+            logger.info(f"Getting multiple objects with skip={skip}, limit={limit}")
+            return await self.repository.get_multi(skip=skip, limit=limit)
+        except Exception as e:
+            logger.error(f"Error getting multiple objects: {e}")
+            raise CustomException(f"Erreur lors de la récupération des objets: {e}")
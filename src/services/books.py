@@ -1,11 +1,14 @@
 import logging
-from typing import List, Optional, Any, Dict, Union
+from datetime import datetime
+from typing import List, Optional, Any, Dict, Tuple, Union
 from sqlalchemy.orm import Session
 
-from ..repositories.books import BookRepository
+from ..db.unit_of_work import unit_of_work
+from ..repositories.books import BookRepository, AsyncBookRepository
 from ..models.books import Book
 from ..api.schemas.books import BookCreate, BookUpdate
-from .base import BaseService
+from ..utils.pagination import PaginationParams, Page
+from .base import BaseService, AsyncBaseService
 from src.exceptions import CustomException  # Ajout de l'import
 
 logger = logging.getLogger(__name__)
@@ -43,6 +46,7 @@ class BookService(BaseService[Book, BookCreate, BookUpdate]):
     def create(self, *, obj_in: BookCreate) -> Book:
         """
         Crée un nouveau livre, en vérifiant que l'ISBN n'est pas déjà utilisé.
+        Le livre et ses catégories (category_ids) sont écrits en un seul commit.
         """
         logger.info("Tentative de création d'un livre avec ISBN: %s", obj_in.isbn)
         existing_book = self.get_by_isbn(isbn=obj_in.isbn)
@@ -50,7 +54,14 @@ class BookService(BaseService[Book, BookCreate, BookUpdate]):
             logger.warning("Échec de création: ISBN déjà utilisé (%s)", obj_in.isbn)
             raise CustomException("L'ISBN est déjà utilisé")  # Utilisation de CustomException
         
-        book = self.repository.create(obj_in=obj_in)
+        category_ids = getattr(obj_in, "category_ids", None)
+        if not category_ids:
+            book = self.repository.create(obj_in=obj_in)
+        else:
+            with unit_of_work(self.repository.db):
+                book = self.repository.create(obj_in=obj_in)
+                for category_id in category_ids:
+                    self.repository.add_category(book_id=book.id, category_id=category_id)
         logger.info("Livre créé avec succès: %s", book)
         return book
     
@@ -78,4 +89,47 @@ class BookService(BaseService[Book, BookCreate, BookUpdate]):
         Recherche des livres par un terme donné (dans le titre, l'auteur, ou la description).
         """
         logger.info("Recherche de livres avec le terme: %s", query)
-        return self.repository.search(query=query)
\ No newline at end of file
+        return self.repository.search(query=query)
+
+
+class AsyncBookService(AsyncBaseService[Book]):
+    """
+    Service asynchrone de consultation des livres.
+    """
+    def __init__(self, repository: AsyncBookRepository):
+        super().__init__(repository)
+        self.repository = repository
+    
+    async def get_state(self, *, book_id: Optional[int] = None) -> Tuple[List[Any], Optional[datetime]]:
+        """
+        Signature et date de dernière modification du catalogue (ou d'un livre).
+        """
+        return await self.repository.get_state(book_id=book_id)
+
+    async def paginate(self, *, params: PaginationParams) -> Page:
+        """
+        Liste paginée des livres.
+        """
+        logger.info("Liste paginée des livres: %s", params)
+        return await self.repository.paginate(params=params)
+    
+    async def search(
+        self,
+        *,
+        params: PaginationParams,
+        query: Optional[str] = None,
+        category_id: Optional[int] = None,
+        author: Optional[str] = None,
+        publication_year: Optional[int] = None
+    ) -> Page:
+        """
+        Recherche avancée paginée (plein texte, catégorie, auteur, année).
+        """
+        logger.info("Recherche avancée: query=%s, category_id=%s, author=%s, publication_year=%s", query, category_id, author, publication_year)
+        return await self.repository.search(
+            params=params,
+            query=query,
+            category_id=category_id,
+            author=author,
+            publication_year=publication_year
+        )
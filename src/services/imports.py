@@ -0,0 +1,203 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from ..api.schemas.books import BookCreate, BookImportError, BookImportReport
+from ..db.unit_of_work import unit_of_work
+from ..repositories.books import BookRepository
+from ..repositories.categories import CategoryRepository
+from src.exceptions import CustomException
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "jsonl")
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+# Séparateur des noms de catégories dans une cellule CSV
+CATEGORY_SEPARATOR = "|"
+
+Row = Tuple[int, Union[Dict[str, Any], Exception]]
+
+
+def detect_format(filename: Optional[str], fmt: Optional[str] = None) -> str:
+    """
+    Détermine le format d'import à partir du paramètre explicite ou de l'extension.
+    """
+    fmt = (fmt or (filename or "").rsplit(".", 1)[-1]).lower()
+    if fmt == "ndjson":
+        fmt = "jsonl"
+    if fmt not in IMPORT_FORMATS:
+        raise CustomException(f"Format d'import non supporté (attendu : {', '.join(IMPORT_FORMATS)})", status_code=400)
+    return fmt
+
+
+def read_rows(stream: BinaryIO, fmt: str) -> Iterator[Row]:
+    """
+    Lit un flux CSV (avec en-tête) ou JSONL ligne par ligne, sans le charger
+    en mémoire. Produit (numéro de ligne, données) ; une ligne illisible
+    produit (numéro de ligne, exception).
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, ValueError("Nombre de colonnes incorrect")
+            else:
+                yield reader.line_num, row
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f"JSON invalide : {e}")
+            continue
+        if isinstance(data, dict):
+            yield line_number, data
+        else:
+            yield line_number, ValueError("Objet JSON attendu")
+
+
+def _category_names(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(CATEGORY_SEPARATOR)
+    names = [str(name).strip() for name in value]
+    names = [name for name in names if name]
+    for name in names:
+        if len(name) > 50:
+            raise ValueError(f"categories: nom trop long ({name[:20]}...)")
+    return names
+
+
+def _clean(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Cellules CSV vides : champ absent plutôt que chaîne vide
+    return {
+        key.strip(): value.strip() if isinstance(value, str) else value
+        for key, value in data.items()
+        if key and value is not None and value != ""
+    }
+
+
+class BookImportService:
+    """
+    Import en masse de livres : validation par lots avec les règles de
+    BookCreate, détection des ISBN en doublon en une requête par lot,
+    création groupée des catégories et insertion executemany, un commit par lot.
+    """
+    def __init__(
+        self,
+        book_repository: BookRepository,
+        category_repository: CategoryRepository,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        self.book_repository = book_repository
+        self.category_repository = category_repository
+        self.batch_size = batch_size
+
+    def import_rows(
+        self,
+        rows: Iterable[Row],
+        on_progress: Optional[Callable[[BookImportReport], None]] = None
+    ) -> BookImportReport:
+        report = BookImportReport()
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch, report, on_progress)
+                batch = []
+        if batch:
+            self._import_batch(batch, report, on_progress)
+        logger.info(f"Import terminé : {report.imported} livre(s) créé(s), {report.failed} ligne(s) rejetée(s) sur {report.total}")
+        return report
+
+    def import_file(
+        self,
+        stream: BinaryIO,
+        fmt: str,
+        on_progress: Optional[Callable[[BookImportReport], None]] = None
+    ) -> BookImportReport:
+        return self.import_rows(read_rows(stream, fmt), on_progress)
+
+    def _reject(self, report: BookImportReport, line: int, isbn: Optional[str], errors: List[str]) -> None:
+        report.failed += 1
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            report.errors.append(BookImportError(line=line, isbn=isbn, errors=errors))
+        else:
+            report.errors_truncated = True
+
+    def _validate(self, batch: List[Row], report: BookImportReport) -> List[Tuple[int, Dict[str, Any], List[str]]]:
+        valid = []
+        for line, data in batch:
+            if isinstance(data, Exception):
+                self._reject(report, line, None, [str(data)])
+                continue
+            data = _clean(data)
+            try:
+                categories = _category_names(data.pop("categories", None))
+                book = BookCreate(**data)
+            except ValidationError as e:
+                errors = [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+                self._reject(report, line, data.get("isbn"), errors)
+                continue
+            except ValueError as e:
+                self._reject(report, line, data.get("isbn"), [str(e)])
+                continue
+            valid.append((line, book.model_dump(exclude={"category_ids"}), categories))
+        return valid
+
+    def _import_batch(
+        self,
+        batch: List[Row],
+        report: BookImportReport,
+        on_progress: Optional[Callable[[BookImportReport], None]]
+    ) -> None:
+        report.total += len(batch)
+        report.batches += 1
+        valid = self._validate(batch, report)
+
+        existing = self.book_repository.get_existing_isbns(isbns=(data["isbn"] for _, data, _ in valid))
+        rows, seen = [], set()
+        for line, data, categories in valid:
+            isbn = data["isbn"]
+            if isbn in existing:
+                self._reject(report, line, isbn, ["ISBN déjà utilisé"])
+            elif isbn in seen:
+                self._reject(report, line, isbn, ["ISBN en double dans le fichier"])
+            else:
+                seen.add(isbn)
+                rows.append((line, data, categories))
+
+        if rows:
+            now = datetime.utcnow()
+            try:
+                with unit_of_work(self.book_repository.db):
+                    category_ids = self.category_repository.get_or_create_many(
+                        names=(name for _, _, categories in rows for name in categories)
+                    )
+                    book_ids = self.book_repository.bulk_insert(
+                        rows=[dict(data, created_at=now, updated_at=now) for _, data, _ in rows]
+                    )
+                    self.book_repository.bulk_add_categories(links=(
+                        (book_ids[data["isbn"]], category_ids[name])
+                        for _, data, categories in rows for name in categories
+                    ))
+                report.imported += len(rows)
+            except Exception as e:
+                # Lot annulé en entier (ex. ISBN inséré entre-temps par un autre import)
+                logger.error(f"Erreur lors de l'insertion du lot {report.batches} : {e}")
+                for line, data, _ in rows:
+                    self._reject(report, line, data["isbn"], ["Erreur lors de l'insertion du lot"])
+
+        logger.info(f"Import : lot {report.batches}, {report.total} ligne(s) lue(s), {report.imported} créée(s), {report.failed} rejetée(s)")
+        if on_progress:
+            on_progress(report)
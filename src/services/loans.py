@@ -3,18 +3,21 @@ from typing import List, Optional, Any, Dict, Union
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
-from ..repositories.loans import LoanRepository
+from ..repositories.loans import LoanRepository, AsyncLoanRepository
 from ..repositories.books import BookRepository
 from ..repositories.users import UserRepository
 from ..models.loans import Loan
 from ..models.books import Book
 from ..models.users import User
 from ..api.schemas.loans import LoanCreate, LoanUpdate
-from .base import BaseService
+from .base import BaseService, AsyncBaseService
 from src.exceptions import CustomException
 
 logger = logging.getLogger(__name__)
 
+MAX_ACTIVE_LOANS = 5
+MAX_BATCH_SIZE = 20
+
 class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
     """
     Service pour la gestion des emprunts.
@@ -72,31 +75,26 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
             logger.warning(f"Le livre {book_id} n'est pas disponible pour l'emprunt")
             raise CustomException("Le livre n'est pas disponible pour l'emprunt", status_code=409)
         
-        active_loans = self.loan_repository.get_active_loans()
-        for loan in active_loans:
-            if loan.user_id == user_id and loan.book_id == book_id:
-                logger.warning(f"L'utilisateur {user_id} a déjà emprunté le livre {book_id} et ne l'a pas encore rendu")
-                raise CustomException("L'utilisateur a déjà emprunté ce livre et ne l'a pas encore rendu", status_code=409)
-        
-        user_active_loans = [loan for loan in active_loans if loan.user_id == user_id]
-        if len(user_active_loans) >= 5:
-            logger.warning(f"L'utilisateur {user_id} a atteint la limite d'emprunts simultanés (5)")
-            raise CustomException("L'utilisateur a atteint la limite d'emprunts simultanés (5)", status_code=403)
-        
-        loan_data = {
-            "user_id": user_id,
-            "book_id": book_id,
-            "loan_date": datetime.utcnow(),
-            "due_date": datetime.utcnow() + timedelta(days=loan_period_days),
-            "return_date": None
-        }
-        
-        loan = self.loan_repository.create(obj_in=loan_data)
-        logger.info(f"Emprunt créé avec succès pour user_id={user_id}, book_id={book_id}, loan_id={loan.id}")
+        if self.loan_repository.has_active_loan(user_id=user_id, book_id=book_id):
+            logger.warning(f"L'utilisateur {user_id} a déjà emprunté le livre {book_id} et ne l'a pas encore rendu")
+            raise CustomException("L'utilisateur a déjà emprunté ce livre et ne l'a pas encore rendu", status_code=409)
+        
+        if self.loan_repository.count_active_loans_by_user(user_id=user_id) >= MAX_ACTIVE_LOANS:
+            logger.warning(f"L'utilisateur {user_id} a atteint la limite d'emprunts simultanés ({MAX_ACTIVE_LOANS})")
+            raise CustomException(f"L'utilisateur a atteint la limite d'emprunts simultanés ({MAX_ACTIVE_LOANS})", status_code=403)
         
-        book.quantity -= 1
-        self.book_repository.update(db_obj=book, obj_in={"quantity": book.quantity})
-        logger.info(f"Quantité du livre {book_id} mise à jour à {book.quantity}")
+        now = datetime.utcnow()
+        loan = self.loan_repository.checkout(
+            user_id=user_id,
+            book_id=book_id,
+            loan_date=now,
+            due_date=now + timedelta(days=loan_period_days)
+        )
+        if loan is None:
+            # Dernier exemplaire emprunté entre la vérification et l'écriture
+            logger.warning(f"Le livre {book_id} n'est plus disponible pour l'emprunt")
+            raise CustomException("Le livre n'est pas disponible pour l'emprunt", status_code=409)
+        logger.info(f"Emprunt créé avec succès pour user_id={user_id}, book_id={book_id}, loan_id={loan.id}")
         
         return loan
     
@@ -111,18 +109,114 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
             logger.warning(f"L'emprunt {loan_id} a déjà été retourné")
             raise CustomException("L'emprunt a déjà été retourné", status_code=409)
         
-        loan_data = {"return_date": datetime.utcnow()}
-        loan = self.loan_repository.update(db_obj=loan, obj_in=loan_data)
+        if not self.loan_repository.checkin(loan_id=loan.id, book_id=loan.book_id, return_date=datetime.utcnow()):
+            logger.warning(f"L'emprunt {loan_id} a déjà été retourné")
+            raise CustomException("L'emprunt a déjà été retourné", status_code=409)
         logger.info(f"Emprunt {loan_id} marqué comme retourné")
         
-        book = self.book_repository.get(id=loan.book_id)
-        if book:
-            book.quantity += 1
-            self.book_repository.update(db_obj=book, obj_in={"quantity": book.quantity})
-            logger.info(f"Quantité du livre {book.id} mise à jour à {book.quantity}")
-        
         return loan
     
+    def create_loans(
+        self,
+        *,
+        user_id: int,
+        book_ids: List[int],
+        loan_period_days: int = 14
+    ) -> List[Dict[str, Any]]:
+        """
+        Emprunt de plusieurs livres en une transaction, avec les mêmes règles
+        que create_loan. Renvoie un résultat par livre demandé
+        (book_id, status_code, detail, loan).
+        """
+        logger.info(f"Tentative d'emprunt groupé pour user_id={user_id}, book_ids={book_ids}")
+        user = self.user_repository.get(id=user_id)
+        if not user:
+            logger.error(f"Utilisateur avec l'ID {user_id} non trouvé")
+            raise CustomException(f"Utilisateur avec l'ID {user_id} non trouvé", status_code=404)
+        
+        if not user.is_active:
+            logger.warning(f"L'utilisateur {user_id} est inactif et ne peut pas emprunter de livres")
+            raise CustomException("L'utilisateur est inactif et ne peut pas emprunter de livres", status_code=403)
+        
+        books = {book.id: book for book in self.book_repository.get_many(ids=book_ids)}
+        borrowed = self.loan_repository.get_active_book_ids(user_id=user_id)
+        active_count = len(borrowed)
+        results = []
+        for book_id in book_ids:
+            book = books.get(book_id)
+            if not book:
+                status_code, detail = 404, f"Livre avec l'ID {book_id} non trouvé"
+            elif book.quantity <= 0:
+                status_code, detail = 409, "Le livre n'est pas disponible pour l'emprunt"
+            elif book_id in borrowed:
+                status_code, detail = 409, "L'utilisateur a déjà emprunté ce livre et ne l'a pas encore rendu"
+            elif active_count >= MAX_ACTIVE_LOANS:
+                status_code, detail = 403, f"L'utilisateur a atteint la limite d'emprunts simultanés ({MAX_ACTIVE_LOANS})"
+            else:
+                borrowed.add(book_id)
+                active_count += 1
+                status_code, detail = None, None
+            results.append({"book_id": book_id, "status_code": status_code, "detail": detail, "loan": None})
+        
+        accepted = [result["book_id"] for result in results if result["status_code"] is None]
+        loans = {}
+        if accepted:
+            now = datetime.utcnow()
+            loans = self.loan_repository.checkout_many(
+                user_id=user_id,
+                book_ids=accepted,
+                loan_date=now,
+                due_date=now + timedelta(days=loan_period_days)
+            )
+        if len(loans) < len(accepted):
+            # Emprunt actif créé entre la vérification et l'écriture (autre requête)
+            borrowed = self.loan_repository.get_active_book_ids(user_id=user_id) - set(loans)
+        for result in results:
+            if result["status_code"] is not None:
+                continue
+            loan = loans.get(result["book_id"])
+            if loan:
+                result.update(status_code=201, loan=loan)
+            elif result["book_id"] in borrowed:
+                result.update(status_code=409, detail="L'utilisateur a déjà emprunté ce livre et ne l'a pas encore rendu")
+            else:
+                # Dernier exemplaire emprunté entre la vérification et l'écriture
+                result.update(status_code=409, detail="Le livre n'est pas disponible pour l'emprunt")
+        logger.info(f"Emprunt groupé pour user_id={user_id} : {len(loans)} créé(s) sur {len(book_ids)} demandé(s)")
+        return results
+    
+    def return_loans(self, *, loan_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Retour de plusieurs emprunts en une transaction. Renvoie un résultat
+        par emprunt (loan_id, status_code, detail, loan).
+        """
+        logger.info(f"Tentative de retour groupé des emprunts {loan_ids}")
+        loans = {loan.id: loan for loan in self.loan_repository.get_many(ids=loan_ids)}
+        results, pending = [], set()
+        for loan_id in loan_ids:
+            loan = loans.get(loan_id)
+            if not loan:
+                status_code, detail = 404, f"Emprunt avec l'ID {loan_id} non trouvé"
+            elif loan.return_date or loan_id in pending:
+                status_code, detail = 409, "L'emprunt a déjà été retourné"
+            else:
+                pending.add(loan_id)
+                status_code, detail = None, None
+            results.append({"loan_id": loan_id, "status_code": status_code, "detail": detail, "loan": None})
+        
+        returned = set()
+        if pending:
+            returned = self.loan_repository.checkin_many(loan_ids=pending, return_date=datetime.utcnow())
+        for result in results:
+            if result["status_code"] is not None:
+                continue
+            if result["loan_id"] in returned:
+                result.update(status_code=200, loan=loans[result["loan_id"]])
+            else:
+                result.update(status_code=409, detail="L'emprunt a déjà été retourné")
+        logger.info(f"Retour groupé : {len(returned)} emprunt(s) retourné(s) sur {len(loan_ids)} demandé(s)")
+        return results
+    
     def extend_loan(self, *, loan_id: int, extension_days: int = 7) -> Loan:
         logger.info(f"Tentative de prolongation de l'emprunt {loan_id}")
         loan = self.loan_repository.get(id=loan_id)
@@ -147,3 +241,16 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
         logger.info(f"Nouvelle date d'échéance pour l'emprunt {loan_id}: {new_due_date}")
         
         return self.loan_repository.update(db_obj=loan, obj_in=loan_data)
+
+
+class AsyncLoanService(AsyncBaseService[Loan]):
+    """
+    Service asynchrone de consultation des emprunts.
+    """
+    def __init__(self, loan_repository: AsyncLoanRepository):
+        super().__init__(loan_repository)
+        self.loan_repository = loan_repository
+    
+    async def get_loans_by_user(self, *, user_id: int) -> List[Loan]:
+        logger.info(f"Récupération des emprunts pour l'utilisateur {user_id}")
+        return await self.loan_repository.get_loans_by_user_with_details(user_id=user_id)
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy import func
 from sqlalchemy.orm import Session
@@ -8,10 +8,24 @@ from sqlalchemy.exc import SQLAlchemyError
 from ..models.books import Book
 from ..models.users import User
 from ..models.loans import Loan
+from ..models.counters import COUNTER_NAMES
+from ..repositories.stats import (
+    book_totals, user_totals, loan_totals, counter_totals, overdue_totals, fetch_totals, table_state
+)
 from src.exceptions import CustomException
 
 logger = logging.getLogger(__name__)
 
+GENERAL_STATS_KEYS = (
+    "total_books",
+    "unique_books",
+    "total_users",
+    "active_users",
+    "total_loans",
+    "active_loans",
+    "overdue_loans",
+)
+
 class StatsService:
     """
     Service pour les statistiques de la bibliothèque.
@@ -19,36 +33,34 @@ class StatsService:
     def __init__(self, db: Session):
         self.db = db
         logger.debug("StatsService initialized with db session %s", db)
+
+    def get_state(self) -> Tuple[List[Any], Optional[datetime]]:
+        """
+        Signature et date de dernière modification des données des statistiques.
+        Les retards dépendent de l'heure : la signature change aussi à chaque minute.
+        """
+        state, last_modified = table_state(self.db, Book, User, Loan)
+        minute = datetime.utcnow().replace(second=0, microsecond=0)
+        return state + [minute], max(last_modified, minute) if last_modified else minute
     
     def get_general_stats(self) -> Dict[str, Any]:
         """
         Récupère des statistiques générales sur la bibliothèque.
         """
         logger.info("Fetching general library statistics")
+        now = datetime.utcnow()
         try:
-            total_books = self.db.query(func.sum(Book.quantity)).scalar() or 0
-            unique_books = self.db.query(func.count(Book.id)).scalar() or 0
-            total_users = self.db.query(func.count(User.id)).scalar() or 0
-            active_users = self.db.query(func.count(User.id)).filter(User.is_active == True).scalar() or 0
-            total_loans = self.db.query(func.count(Loan.id)).scalar() or 0
-            active_loans = self.db.query(func.count(Loan.id)).filter(Loan.return_date == None).scalar() or 0
-            overdue_loans = self.db.query(func.count(Loan.id)).filter(
-                Loan.return_date == None,
-                Loan.due_date < datetime.utcnow()
-            ).scalar() or 0
+            # Compteurs maintenus à chaque écriture : lecture en O(1)
+            totals = fetch_totals(self.db, counter_totals(), overdue_totals(now))
+            if any(totals[name] is None for name in COUNTER_NAMES):
+                # Compteurs non initialisés : une seule requête sur les tables de base
+                logger.warning("Compteurs non initialisés, calcul à partir des tables de base")
+                totals = fetch_totals(self.db, book_totals(), user_totals(), loan_totals(now))
         except SQLAlchemyError as e:
             logger.error(f"Erreur lors de la récupération des statistiques générales : {e}")
             raise CustomException("Erreur lors de la récupération des statistiques générales", status_code=500)
         
-        stats = {
-            "total_books": total_books,
-            "unique_books": unique_books,
-            "total_users": total_users,
-            "active_users": active_users,
-            "total_loans": total_loans,
-            "active_loans": active_loans,
-            "overdue_loans": overdue_loans
-        }
+        stats = {key: totals[key] for key in GENERAL_STATS_KEYS}
         logger.debug("General stats: %s", stats)
         return stats
     
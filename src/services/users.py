@@ -2,11 +2,11 @@ import logging
 from typing import Optional, List, Any, Dict, Union
 from sqlalchemy.orm import Session
 
-from ..repositories.users import UserRepository
+from ..repositories.users import UserRepository, AsyncUserRepository
 from ..models.users import User
 from ..api.schemas.users import UserCreate, UserUpdate
-from ..utils.security import get_password_hash, verify_password
-from .base import BaseService
+from ..utils.security import get_password_hash, verify_and_update_password, verify_and_update_password_async
+from .base import BaseService, AsyncBaseService
 from src.exceptions import CustomException  # Ajout de l'import
 
 logger = logging.getLogger(__name__)
@@ -26,9 +26,10 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         logger.debug(f"Recherche de l'utilisateur avec l'email: {email}")
         return self.repository.get_by_email(email=email)
     
-    def create(self, *, obj_in: UserCreate) -> User:
+    def create(self, *, obj_in: UserCreate, hashed_password: Optional[str] = None) -> User:
         """
-        Crée un nouvel utilisateur avec un mot de passe hashé.
+        Crée un nouvel utilisateur avec un mot de passe hashé (`hashed_password`
+        si le hash a déjà été calculé, par get_password_hash_async).
         """
         logger.info(f"Tentative de création d'un utilisateur avec l'email: {obj_in.email}")
         existing_user = self.get_by_email(email=obj_in.email)
@@ -36,7 +37,8 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             logger.warning(f"Création échouée: l'email {obj_in.email} est déjà utilisé.")
             raise CustomException("L'email est déjà utilisé", status_code=409)
         
-        hashed_password = get_password_hash(obj_in.password)
+        if hashed_password is None:
+            hashed_password = get_password_hash(obj_in.password)
         user_data = obj_in.dict()
         del user_data["password"]
         user_data["hashed_password"] = hashed_password
@@ -83,9 +85,13 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         if not user:
             logger.warning(f"Authentification échouée: utilisateur {email} non trouvé.")
             raise CustomException("Utilisateur non trouvé", status_code=404)
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not valid:
             logger.warning(f"Authentification échouée: mot de passe incorrect pour {email}.")
             raise CustomException("Mot de passe incorrect", status_code=401)
+        if new_hash:
+            logger.info("Hash du mot de passe recalculé au coût configuré pour: %s", email)
+            self.repository.update(db_obj=user, obj_in={"hashed_password": new_hash})
         logger.info(f"Authentification réussie pour l'utilisateur: {email}")
         return user
     
@@ -101,4 +107,37 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         Vérifie si un utilisateur est administrateur.
         """
         logger.debug(f"Vérification du statut administrateur pour l'utilisateur: {user.email}")
-        return user.is_admin
\ No newline at end of file
+        return user.is_admin
+
+
+class AsyncUserService(AsyncBaseService[User]):
+    """
+    Service asynchrone de consultation des utilisateurs (authentification des routes asynchrones).
+    """
+    def __init__(self, repository: AsyncUserRepository):
+        super().__init__(repository)
+        self.repository = repository
+
+    async def authenticate(self, *, email: str, password: str) -> User:
+        """
+        Authentifie un utilisateur sans bloquer la boucle : bcrypt s'exécute
+        dans le pool de hachage. Un hash d'un autre coût que BCRYPT_ROUNDS
+        est remplacé au passage.
+        """
+        logger.debug("Tentative d'authentification pour l'email: %s", email)
+        user = await self.repository.get_by_email(email=email)
+        if not user:
+            logger.warning("Authentification échouée: utilisateur %s non trouvé.", email)
+            raise CustomException("Utilisateur non trouvé", status_code=404)
+        valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+        if not valid:
+            logger.warning("Authentification échouée: mot de passe incorrect pour %s.", email)
+            raise CustomException("Mot de passe incorrect", status_code=401)
+        if new_hash:
+            logger.info("Hash du mot de passe recalculé au coût configuré pour: %s", email)
+            await self.repository.set_password_hash(db_obj=user, hashed_password=new_hash)
+        logger.info("Authentification réussie pour l'utilisateur: %s", email)
+        return user
+
+    def is_active(self, *, user: User) -> bool:
+        return user.is_active
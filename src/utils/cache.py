@@ -1,15 +1,76 @@
 import logging
+import inspect
+from datetime import date, datetime
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Tuple
-import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 import hashlib
 import json
 
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config import Settings, settings
+from .cache_backends import CacheBackend, DEFAULT_EXPIRY, LRUCache, RedisCache, SQLiteCache
+from .cache_bus import InvalidationBus
+
 logger = logging.getLogger(__name__)
 
-# Cache en mémoire simple
-cache_store: Dict[str, Tuple[float, Any]] = {}
-DEFAULT_EXPIRY = 300  # 5 minutes
+CACHE_BACKENDS = ("memory", "sqlite", "redis")
+
+
+def create_cache_backend(config: Settings) -> CacheBackend:
+    """
+    Construit le backend choisi par CACHE_BACKEND : mémoire du processus,
+    fichier SQLite partagé par les workers d'un hôte, ou serveur Redis.
+    """
+    backend = config.CACHE_BACKEND.lower()
+    if backend == "memory":
+        return LRUCache(max_entries=config.CACHE_MAX_ENTRIES, max_bytes=config.CACHE_MAX_BYTES)
+    if backend == "sqlite":
+        return SQLiteCache(config.CACHE_SQLITE_PATH, max_entries=config.CACHE_MAX_ENTRIES)
+    if backend == "redis":
+        return RedisCache.from_url(config.CACHE_REDIS_URL, prefix=config.CACHE_KEY_PREFIX)
+    raise ValueError(f"CACHE_BACKEND inconnu : {config.CACHE_BACKEND} (attendu : {', '.join(CACHE_BACKENDS)})")
+
+
+cache_store: CacheBackend = create_cache_backend(settings)
+logger.info(f"Backend de cache : {type(cache_store).__name__}")
+
+# Bus d'invalidation entre workers, démarré avec l'application (voir main.py)
+invalidation_bus: Optional[InvalidationBus] = None
+
+# Étiquettes à invalider au commit d'une session (voir invalidate_on_commit),
+# et drapeau : déjà publiées dans sa transaction
+PENDING_INVALIDATIONS_KEY = "cache_invalidations_pending"
+PUBLISHED_INVALIDATIONS_KEY = "cache_invalidations_published"
+
+# Caches spécialisés du processus (utilisateurs authentifiés...), invalidés
+# avec cache_store par invalidate_cache et par le bus
+local_stores: List[CacheBackend] = []
+
+
+def register_local_store(store: CacheBackend) -> CacheBackend:
+    """
+    Soumet un cache du processus aux invalidations par étiquettes.
+    """
+    local_stores.append(store)
+    return store
+
+
+def _key_default(value: Any) -> Any:
+    # Sérialisation des arguments non JSON : valeur stable plutôt qu'une erreur
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if hasattr(value, "__dict__"):
+        return {k: v for k, v in vars(value).items() if not k.startswith("_")}
+    return repr(value)
 
 
 def cache_key(*args, **kwargs) -> str:
@@ -17,45 +78,205 @@ def cache_key(*args, **kwargs) -> str:
     Génère une clé de cache à partir des arguments.
     """
     key_dict = {"args": args, "kwargs": kwargs}
-    key_str = json.dumps(key_dict, sort_keys=True)
+    key_str = json.dumps(key_dict, sort_keys=True, default=_key_default)
     return hashlib.md5(key_str.encode()).hexdigest()
 
 
-def cache(expiry: int = DEFAULT_EXPIRY):
+def function_key(func: Callable, args: tuple, kwargs: dict, is_method: bool = False) -> str:
     """
-    Décorateur pour mettre en cache le résultat d'une fonction.
+    Clé de cache d'un appel de fonction. `self`/`cls` et les sessions de base
+    de données sont ignorés : deux instances d'un repository partagent le cache.
     """
+    if is_method:
+        args = args[1:]
+    args = tuple(arg for arg in args if not isinstance(arg, (Session, AsyncSession)))
+    kwargs = {k: v for k, v in kwargs.items() if not isinstance(v, (Session, AsyncSession))}
+    return f"{func.__module__}.{func.__qualname__}:{cache_key(*args, **kwargs)}"
+
+
+def get_cached(key: str) -> Tuple[bool, Any]:
+    """
+    Lit une valeur du cache : renvoie (trouvée, valeur).
+    """
+    hit, value = cache_store.get(key)
+    logger.debug(f"Cache {'hit' if hit else 'miss'} for key: {key}")
+    return hit, value
+
+
+def set_cached(key: str, value: Any, expiry: int = DEFAULT_EXPIRY, tags: Iterable[str] = ()) -> None:
+    """
+    Enregistre une valeur dans le cache.
+    """
+    cache_store.set(key, value, expiry, tags)
+    logger.debug(f"Value cached for key: {key} with expiry in {expiry} seconds")
+
+
+def get_or_set_cached(
+    key: str,
+    compute: Callable[[], Any],
+    expiry: int = DEFAULT_EXPIRY,
+    tags: Iterable[str] = ()
+) -> Tuple[bool, Any]:
+    """
+    Lit une valeur du cache ou la calcule une seule fois pour tous les appels
+    concurrents : renvoie (trouvée, valeur).
+    """
+    hit, value = cache_store.get_or_set(key, compute, expiry, tags)
+    logger.debug(f"Cache {'hit' if hit else 'miss'} for key: {key}")
+    return hit, value
+
+
+async def get_or_set_cached_async(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    expiry: int = DEFAULT_EXPIRY,
+    tags: Iterable[str] = ()
+) -> Tuple[bool, Any]:
+    """
+    Version de get_or_set_cached pour la boucle asyncio (`compute` est une
+    coroutine) : l'attente d'un calcul en cours ne bloque pas la boucle.
+    """
+    hit, value = await cache_store.get_or_set_async(key, compute, expiry, tags)
+    logger.debug(f"Cache {'hit' if hit else 'miss'} for key: {key}")
+    return hit, value
+
+
+def cache(expiry: int = DEFAULT_EXPIRY, tags: Iterable[str] = ()):
+    """
+    Décorateur pour mettre en cache le résultat d'une fonction ou d'une
+    méthode. Les entrées portent les étiquettes `tags`, utilisées par
+    invalidate_cache. Une coroutine (async def) est mise en cache par son
+    résultat, via get_or_set_cached_async.
+
+        @cache(expiry=60, tags=("books",))
+        def get_stats(self): ...
+    """
+    tags = tuple(tags)
+
     def decorator(func: Callable) -> Callable:
+        params = list(inspect.signature(func).parameters)
+        is_method = bool(params) and params[0] in ("self", "cls")
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                key = function_key(func, args, kwargs, is_method)
+                _, value = await get_or_set_cached_async(key, lambda: func(*args, **kwargs), expiry, tags)
+                return value
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            key = f"{func.__module__}.{func.__name__}:{cache_key(*args, **kwargs)}"
-            now = time.time()
-            if key in cache_store:
-                expiry_time, value = cache_store[key]
-                if expiry_time > now:
-                    logger.debug(f"Cache hit for key: {key}")
-                    return value
-                else:
-                    logger.debug(f"Cache expired for key: {key}")
-            else:
-                logger.debug(f"Cache miss for key: {key}")
-
-            result = func(*args, **kwargs)
-            cache_store[key] = (now + expiry, result)
-            logger.debug(f"Value cached for key: {key} with expiry in {expiry} seconds")
-            return result
+            key = function_key(func, args, kwargs, is_method)
+            _, value = get_or_set_cached(key, lambda: func(*args, **kwargs), expiry, tags)
+            return value
         return wrapper
     return decorator
 
 
-def invalidate_cache(prefix: str = None) -> None:
+def _invalidate_stores(tags: Iterable[str]) -> int:
+    removed = cache_store.invalidate(*tags)
+    for store in local_stores:
+        removed += store.invalidate(*tags)
+    return removed
+
+
+def _publish(tags: Sequence[str]) -> None:
+    if invalidation_bus is not None:
+        try:
+            invalidation_bus.publish(tags)
+        except Exception as e:
+            # L'écriture est déjà validée : les autres workers expireront par TTL
+            logger.error(f"Publication de l'invalidation impossible : {e}")
+
+
+def invalidate_cache(*tags: str) -> None:
     """
-    Invalide le cache.
+    Invalide les entrées portant l'une des étiquettes, ou tout le cache.
     """
-    global cache_store
-    if prefix:
-        logger.info(f"Invalidating cache with prefix: {prefix}")
-        cache_store = {k: v for k, v in cache_store.items() if not k.startswith(prefix)}
+    removed = _invalidate_stores(tags)
+    if tags:
+        logger.info(f"Invalidating cache for tags {', '.join(tags)}: {removed} entries")
     else:
         logger.info("Invalidating entire cache")
-        cache_store = {}
\ No newline at end of file
+    _publish(tags)
+
+
+def invalidate_on_commit(db: Session, *tags: str) -> None:
+    """
+    Invalide les étiquettes au commit de la session (rien en cas de rollback).
+    À appeler avant le commit. Toutes les étiquettes d'une transaction sont
+    publiées ensemble, dans cette transaction : une seule ligne sur le bus,
+    visible des autres workers en même temps que les données.
+    """
+    db.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).update(tags)
+
+
+def _invalidate_local(tags: List[str]) -> None:
+    # Invalidation reçue d'un autre worker : appliquée sans la republier
+    removed = _invalidate_stores(tags)
+    logger.debug(f"Invalidation reçue pour {tags or 'tout le cache'} : {removed} entrées")
+
+
+def _shares_bus_database(session: Session) -> bool:
+    bind = session.get_bind()
+    return getattr(bind, "engine", bind).url == invalidation_bus.engine.url
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_pending_invalidations(session):
+    tags = session.info.get(PENDING_INVALIDATIONS_KEY)
+    if tags and invalidation_bus is not None and _shares_bus_database(session):
+        invalidation_bus.publish(sorted(tags), connection=session.connection())
+        session.info[PUBLISHED_INVALIDATIONS_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_invalidations(session):
+    tags = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+    published = session.info.pop(PUBLISHED_INVALIDATIONS_KEY, False)
+    if not tags:
+        return
+    tags = sorted(tags)
+    removed = _invalidate_stores(tags)
+    logger.info(f"Invalidating cache for tags {', '.join(tags)}: {removed} entries")
+    if not published:
+        # Bus sur une autre base : publication dans sa propre transaction
+        _publish(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session):
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+    session.info.pop(PUBLISHED_INVALIDATIONS_KEY, None)
+
+
+def start_invalidation_bus(engine: Engine, poll_interval: float) -> Optional[InvalidationBus]:
+    """
+    Abonne le cache local aux invalidations des autres workers et publie les
+    siennes. Sans la table cache_invalidation (migration non appliquée), le
+    bus reste désactivé.
+    """
+    global invalidation_bus
+    try:
+        bus = InvalidationBus(engine, _invalidate_local, poll_interval=poll_interval)
+    except Exception as e:
+        logger.error(f"Bus d'invalidation du cache indisponible : {e}")
+        return None
+    bus.start()
+    invalidation_bus = bus
+    return bus
+
+
+def stop_invalidation_bus() -> None:
+    global invalidation_bus
+    if invalidation_bus is not None:
+        invalidation_bus.stop()
+        invalidation_bus = None
+
+
+def cache_stats() -> Dict[str, int]:
+    """
+    Compteurs du cache (comptés par processus pour les succès et échecs).
+    """
+    return cache_store.stats()
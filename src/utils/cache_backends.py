@@ -0,0 +1,525 @@
+import asyncio
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import time
+
+from pydantic import BaseModel
+
+try:
+    import redis
+except ImportError:  # Dépendance optionnelle : seulement pour CACHE_BACKEND=redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPIRY = 300  # 5 minutes
+# Étiquettes dont la dernière invalidation est mémorisée (au-delà : oubliées)
+MAX_TRACKED_TAGS = 10_000
+
+
+@dataclass
+class _Flight:
+    # Calcul en cours pour une clé : les autres threads attendent son résultat
+    done: threading.Event = field(default_factory=threading.Event)
+    owner: int = field(default_factory=threading.get_ident)
+    value: Any = None
+    error: Optional[BaseException] = None
+    # Appels asynchrones en attente : réveillés sur leur boucle, sans la bloquer
+    waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = field(default_factory=list)
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class CacheBackend:
+    """
+    Stockage derrière le décorateur `cache`. Une implémentation fournit
+    get/set/_invalidate ; le calcul unique des clés absentes (single-flight)
+    et les compteurs de succès/échecs sont communs et locaux au processus.
+    """
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._flight_lock = threading.Lock()
+        # Incrémenté à chaque invalidation : un calcul commencé avant n'est pas
+        # stocké si l'une de ses étiquettes a été invalidée entre-temps
+        self._generation = 0
+        self._tag_generations: Dict[str, int] = {}
+        # Invalidation complète (ou étiquettes oubliées) : tout calcul antérieur est périmé
+        self._stale_before = 0
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Lit une valeur : renvoie (trouvée, valeur).
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, expiry: int = DEFAULT_EXPIRY, tags: Iterable[str] = ()) -> None:
+        """
+        Enregistre une valeur avec sa durée de vie et ses étiquettes.
+        """
+        raise NotImplementedError
+
+    def _invalidate(self, *tags: str) -> int:
+        raise NotImplementedError
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Supprime les entrées portant l'une des étiquettes (tout le cache si
+        aucune étiquette n'est donnée). Renvoie le nombre d'entrées supprimées.
+        """
+        with self._flight_lock:
+            self._generation += 1
+            if not tags or len(self._tag_generations) + len(tags) > MAX_TRACKED_TAGS:
+                self._tag_generations.clear()
+                self._stale_before = self._generation
+            else:
+                for tag in tags:
+                    self._tag_generations[tag] = self._generation
+        removed = self._invalidate(*tags)
+        self.invalidations += removed
+        return removed
+
+    @property
+    def generation(self) -> int:
+        """
+        Compteur d'invalidations, à relever avant un calcul (voir set_if_current).
+        """
+        return self._generation
+
+    def set_if_current(
+        self,
+        generation: int,
+        key: str,
+        value: Any,
+        expiry: int = DEFAULT_EXPIRY,
+        tags: Iterable[str] = ()
+    ) -> bool:
+        """
+        Enregistre une valeur calculée depuis `generation`, sauf si l'une de
+        ses étiquettes a été invalidée entre-temps (la valeur peut être
+        périmée). Utilisé par get_or_set, et pour les calculs qui n'y passent pas.
+        """
+        tags = tuple(tags)
+        with self._flight_lock:
+            if generation < self._stale_before or any(
+                self._tag_generations.get(tag, 0) > generation for tag in tags
+            ):
+                return False
+            self._store(key, value, expiry, tags)
+            return True
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        expiry: int = DEFAULT_EXPIRY,
+        tags: Iterable[str] = ()
+    ) -> Tuple[bool, Any]:
+        """
+        Lit une valeur ou la calcule. Les appels concurrents sur une même clé
+        absente n'exécutent `compute` qu'une fois : les autres attendent le
+        résultat (ou l'exception) du premier. Renvoie (trouvée, valeur).
+
+        L'attente bloque le thread : depuis une boucle asyncio, utiliser
+        get_or_set_async.
+        """
+        hit, value = self.get(key)
+        if hit:
+            return True, value
+        flight, generation, _ = self._join_flight(key)
+
+        if generation is None:
+            if flight.owner == threading.get_ident():
+                # Le calcul en cours est suspendu sur ce thread (boucle asyncio) :
+                # l'attendre ici bloquerait la boucle, et donc le calcul lui-même
+                raise RuntimeError(f"Calcul de {key} déjà en cours sur ce thread : utiliser get_or_set_async")
+            flight.done.wait()
+            return self._flight_result(flight)
+
+        try:
+            flight.value = compute()
+            # Stockée avant la fin du vol : un appel suivant la trouve
+            self.set_if_current(generation, key, flight.value, expiry, tags)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self._land(key, flight)
+        return False, flight.value
+
+    async def get_or_set_async(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        expiry: int = DEFAULT_EXPIRY,
+        tags: Iterable[str] = ()
+    ) -> Tuple[bool, Any]:
+        """
+        Version de get_or_set pour la boucle asyncio (`compute` est une
+        coroutine) : un seul calcul par clé, partagé avec les appels
+        synchrones, et une attente qui ne bloque jamais la boucle.
+        """
+        hit, value = self.get(key)
+        if hit:
+            return True, value
+        loop = asyncio.get_running_loop()
+        flight, generation, landed = self._join_flight(key, loop)
+
+        if generation is None:
+            await landed
+            return self._flight_result(flight)
+
+        try:
+            flight.value = await compute()
+            # Stockée avant la fin du vol : un appel suivant la trouve
+            self.set_if_current(generation, key, flight.value, expiry, tags)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self._land(key, flight)
+        return False, flight.value
+
+    def _join_flight(
+        self,
+        key: str,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> Tuple[_Flight, Optional[int], Optional[asyncio.Future]]:
+        # Rejoint le calcul en cours de la clé ou le démarre. Renvoie (vol,
+        # génération, futur) : la génération seulement pour l'appel qui calcule,
+        # le futur (résolu à la fin du vol) pour un appel asynchrone qui attend.
+        with self._flight_lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                return flight, self._generation, None
+            landed = None
+            if loop is not None:
+                landed = loop.create_future()
+                flight.waiters.append((loop, landed))
+            return flight, None, landed
+
+    def _land(self, key: str, flight: _Flight) -> None:
+        # Fin du vol : plus aucun appel ne peut s'y inscrire, tous sont réveillés
+        with self._flight_lock:
+            del self._flights[key]
+        flight.done.set()
+        for loop, landed in flight.waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, landed)
+            except RuntimeError:
+                # Boucle fermée entre-temps : personne à réveiller
+                pass
+
+    @staticmethod
+    def _flight_result(flight: _Flight) -> Tuple[bool, Any]:
+        if flight.error is not None:
+            raise flight.error
+        return True, flight.value
+
+    def _store(self, key: str, value: Any, expiry: int, tags: Iterable[str]) -> None:
+        # Un cache indisponible ne doit pas faire échouer la requête
+        try:
+            self.set(key, value, expiry, tags)
+        except Exception as e:
+            logger.warning(f"Écriture en cache impossible pour {key} : {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Compteurs du cache (succès, échecs, évictions...) pour ce processus.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+@dataclass
+class _Entry:
+    expires_at: float
+    value: Any
+    size: int
+    tags: FrozenSet[str]
+
+
+def _sizeof(value: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimation de l'empreinte mémoire d'une valeur (conteneurs parcourus).
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(k, seen) + _sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(item, seen) for item in value)
+    elif isinstance(value, BaseModel):
+        size += _sizeof(value.__dict__, seen)
+    return size
+
+
+class LRUCache(CacheBackend):
+    """
+    Cache en mémoire du processus, borné (nombre d'entrées et taille
+    estimée), avec expiration, éviction LRU et invalidation par étiquettes.
+    Toutes les opérations sont protégées par un verrou : le cache est partagé
+    par les threads du threadpool de FastAPI.
+    """
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 64 * 1024 * 1024):
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self._bytes = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._discard(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def set(self, key: str, value: Any, expiry: int = DEFAULT_EXPIRY, tags: Iterable[str] = ()) -> None:
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            logger.warning(f"Valeur trop volumineuse pour le cache ({size} octets) : {key}")
+            return
+        with self._lock:
+            self._discard(key)
+            entry = _Entry(time.monotonic() + expiry, value, size, frozenset(tags))
+            self._entries[key] = entry
+            self._bytes += size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            # Éviction des entrées les moins récemment utilisées
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def _invalidate(self, *tags: str) -> int:
+        with self._lock:
+            if not tags:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._tags.clear()
+                self._bytes = 0
+                return removed
+            keys = set().union(*(self._tags.get(tag, ()) for tag in tags))
+            for key in keys:
+                self._discard(key)
+            return len(keys)
+
+    def purge_expired(self) -> int:
+        """
+        Supprime toutes les entrées expirées. Renvoie leur nombre.
+        """
+        with self._lock:
+            now = time.monotonic()
+            expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+            for key in expired:
+                self._discard(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(super().stats(), entries=len(self._entries), bytes=self._bytes)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache partagé par les processus d'un même hôte, stocké dans un fichier
+    SQLite en WAL (placé de préférence sur un tmpfs comme /dev/shm). Les
+    valeurs sont sérialisées avec pickle ; le nombre d'entrées est borné en
+    supprimant les entrées expirées puis celles qui expirent le plus tôt.
+    """
+    # Nettoyage des entrées en trop toutes les TRIM_INTERVAL écritures
+    TRIM_INTERVAL = 100
+
+    def __init__(self, path: str, max_entries: int = 10_000, busy_timeout: float = 5.0):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_tag ("
+                "tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key)) WITHOUT ROWID"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_cache_tag_key ON cache_tag (key)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_cache_entry_expires_at ON cache_entry (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # Une connexion par thread et par processus (les workers sont forkés)
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            # Un cache perdu se recalcule : pas de fsync à chaque écriture
+            db.execute("PRAGMA synchronous=OFF")
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM cache_entry WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None and row[1] <= time.time():
+            self.expirations += 1
+            row = None
+        if row is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, expiry: int = DEFAULT_EXPIRY, tags: Iterable[str] = ()) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connection() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO cache_entry (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, data, time.time() + expiry)
+            )
+            db.execute("DELETE FROM cache_tag WHERE key = ?", (key,))
+            db.executemany("INSERT INTO cache_tag (tag, key) VALUES (?, ?)", [(tag, key) for tag in set(tags)])
+        self._writes += 1
+        if self._writes % self.TRIM_INTERVAL == 0:
+            self._trim()
+
+    def _invalidate(self, *tags: str) -> int:
+        with self._connection() as db:
+            if not tags:
+                db.execute("DELETE FROM cache_tag")
+                return db.execute("DELETE FROM cache_entry").rowcount
+            placeholders = ", ".join("?" * len(tags))
+            keys = [(key,) for key, in db.execute(
+                f"SELECT DISTINCT key FROM cache_tag WHERE tag IN ({placeholders})", tags
+            )]
+            db.executemany("DELETE FROM cache_entry WHERE key = ?", keys)
+            db.executemany("DELETE FROM cache_tag WHERE key = ?", keys)
+            return len(keys)
+
+    def _trim(self) -> None:
+        with self._connection() as db:
+            expired = db.execute("DELETE FROM cache_entry WHERE expires_at <= ?", (time.time(),)).rowcount
+            evicted = db.execute(
+                "DELETE FROM cache_entry WHERE key IN ("
+                "SELECT key FROM cache_entry ORDER BY expires_at "
+                "LIMIT max((SELECT count(*) FROM cache_entry) - ?, 0))",
+                (self.max_entries,)
+            ).rowcount
+            if expired or evicted:
+                db.execute("DELETE FROM cache_tag WHERE key NOT IN (SELECT key FROM cache_entry)")
+        self.expirations += expired
+        self.evictions += evicted
+
+    def stats(self) -> Dict[str, int]:
+        entries, = self._connection().execute("SELECT count(*) FROM cache_entry").fetchone()
+        return dict(super().stats(), entries=entries)
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache partagé via un serveur parlant le protocole Redis. Chaque étiquette
+    est un ensemble des clés qui la portent ; l'expiration et l'éviction sont
+    laissées au serveur (TTL des clés, maxmemory-policy).
+    """
+    def __init__(self, client: Any, prefix: str = "biblio:"):
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "biblio:") -> "RedisCache":
+        if redis is None:
+            raise RuntimeError("Le backend de cache redis nécessite le paquet redis (requirements-redis.txt)")
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}entry:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        data = self.client.get(self._key(key))
+        if data is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, pickle.loads(data)
+
+    def set(self, key: str, value: Any, expiry: int = DEFAULT_EXPIRY, tags: Iterable[str] = ()) -> None:
+        if expiry <= 0:
+            # Durée nulle : déjà expirée (refusée par SET EX)
+            self.client.delete(self._key(key))
+            return
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.set(self._key(key), data, ex=expiry)
+        for tag in set(tags):
+            pipe.sadd(self._tag(tag), key)
+            # L'ensemble vit au moins aussi longtemps que ses clés
+            pipe.expire(self._tag(tag), expiry, nx=True)
+            pipe.expire(self._tag(tag), expiry, gt=True)
+        pipe.execute()
+
+    def _invalidate(self, *tags: str) -> int:
+        if not tags:
+            keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+            if keys:
+                self.client.delete(*keys)
+            return sum(1 for key in keys if key.startswith(self._key("").encode()))
+        # Lecture et suppression des ensembles en une transaction : une clé
+        # étiquetée ensuite rejoint un nouvel ensemble
+        pipe = self.client.pipeline(transaction=True)
+        for tag in tags:
+            pipe.smembers(self._tag(tag))
+        pipe.delete(*(self._tag(tag) for tag in tags))
+        members = set().union(*pipe.execute()[:-1])
+        if not members:
+            return 0
+        return self.client.delete(*(self._key(key.decode()) for key in members))
@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from ..models.cache import CacheInvalidation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 0.1  # secondes
+DEFAULT_RETENTION = 3600  # secondes
+PRUNE_INTERVAL = 60  # secondes
+
+
+class InvalidationBus:
+    """
+    Diffusion des invalidations de cache entre workers via la table
+    cache_invalidation. Chaque worker y publie ses invalidations et relit
+    périodiquement les lignes d'id supérieur au dernier vu (l'id sert de
+    numéro de séquence), puis les applique à son cache local.
+
+    Avec SQLite, les écritures sont sérialisées : les id deviennent visibles
+    dans l'ordre, aucune invalidation n'est sautée.
+    """
+    def __init__(
+        self,
+        engine: Engine,
+        on_invalidate: Callable[[List[str]], None],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        retention: float = DEFAULT_RETENTION
+    ):
+        self.engine = engine
+        self.on_invalidate = on_invalidate
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.table = CacheInvalidation.__table__
+        # Les invalidations antérieures au démarrage ne concernent pas ce cache
+        self.last_seq = self._current_seq()
+        self.published = self.received = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _current_seq(self) -> int:
+        with self.engine.connect() as connection:
+            return connection.execute(select(func.max(self.table.c.id))).scalar() or 0
+
+    def publish(self, tags: Sequence[str], connection: Optional[Connection] = None) -> int:
+        """
+        Publie une invalidation (liste vide : tout le cache). Renvoie sa séquence.
+
+        Avec `connection`, la ligne est écrite dans la transaction en cours
+        (celle de l'écriture invalidée) et n'est visible qu'à son commit ;
+        sinon dans une transaction propre.
+        """
+        now = datetime.utcnow()
+        statement = insert(self.table).values(
+            tags=json.dumps(sorted(tags)), origin=self.origin, created_at=now, updated_at=now
+        )
+        if connection is not None:
+            seq = connection.execute(statement).inserted_primary_key[0]
+        else:
+            with self.engine.begin() as connection:
+                seq = connection.execute(statement).inserted_primary_key[0]
+        self.published += 1
+        logger.debug(f"Invalidation {seq} publiée : {list(tags)}")
+        return seq
+
+    def poll(self) -> int:
+        """
+        Applique les invalidations publiées par les autres workers depuis le
+        dernier appel. Renvoie leur nombre.
+        """
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(self.table.c.id, self.table.c.tags, self.table.c.origin)
+                .where(self.table.c.id > self.last_seq)
+                .order_by(self.table.c.id)
+            ).all()
+        applied = 0
+        for seq, tags, origin in rows:
+            if origin != self.origin:
+                self.on_invalidate(json.loads(tags))
+                applied += 1
+            self.last_seq = seq
+        self.received += applied
+        return applied
+
+    def prune(self) -> int:
+        """
+        Supprime les invalidations plus anciennes que la rétention. La dernière
+        ligne est conservée pour que la séquence ne reparte pas de zéro.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention)
+        with self.engine.begin() as connection:
+            latest = connection.execute(select(func.max(self.table.c.id))).scalar() or 0
+            removed = connection.execute(
+                delete(self.table).where(self.table.c.created_at < cutoff, self.table.c.id < latest)
+            ).rowcount
+        if removed:
+            logger.info(f"{removed} invalidation(s) de cache purgée(s)")
+        return removed
+
+    def start(self) -> None:
+        """
+        Démarre l'écoute en tâche de fond (thread démon).
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation-bus", daemon=True)
+        self._thread.start()
+        logger.info(f"Bus d'invalidation du cache démarré ({self.origin}, intervalle {self.poll_interval}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        next_prune = time.monotonic() + PRUNE_INTERVAL
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+                if time.monotonic() >= next_prune:
+                    self.prune()
+                    next_prune = time.monotonic() + PRUNE_INTERVAL
+            except Exception as e:
+                # Base momentanément verrouillée ou indisponible : on réessaie
+                logger.warning(f"Lecture des invalidations de cache impossible : {e}")
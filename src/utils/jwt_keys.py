@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from jose import jwk
+from jose.backends.base import Key
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+ALGORITHM = "HS256"
+
+# Identifiant de SECRET_KEY dans le trousseau (et des tokens émis sans `kid`)
+DEFAULT_KID = "default"
+
+
+class KeyRing:
+    """
+    Trousseau de clés JWT : les tokens sont signés avec la clé active et
+    portent son identifiant (`kid`) dans leur en-tête ; ils sont vérifiés
+    avec la clé de ce `kid`, tant qu'elle reste dans le trousseau. Les clés
+    sont construites une seule fois (objets jose prêts à l'emploi).
+    """
+    def __init__(self, keys: Dict[str, str], active_kid: str):
+        if active_kid not in keys:
+            raise ValueError(f"Clé JWT active inconnue : {active_kid}")
+        self.active_kid = active_kid
+        self._keys: Dict[str, Key] = {kid: jwk.construct(secret, ALGORITHM) for kid, secret in keys.items()}
+
+    @property
+    def kids(self):
+        return list(self._keys)
+
+    @property
+    def signing_key(self) -> Key:
+        return self._keys[self.active_kid]
+
+    def verification_key(self, kid: Optional[str]) -> Optional[Key]:
+        return self._keys.get(kid or DEFAULT_KID)
+
+
+def read_key_file(path: str) -> Dict:
+    """
+    Fichier de clés : {"active": kid, "keys": {kid: secret, ...}}.
+    """
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def write_key_file(path: str, data: Dict, *, replace: bool = True) -> bool:
+    """
+    Écrit le fichier de clés de façon atomique (lisible du seul
+    propriétaire). Avec replace=False, n'écrase pas un fichier existant et
+    renvoie False : un autre worker l'a créé avant nous.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".jwt_keys-")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
+        if replace:
+            os.replace(temporary, path)
+            return True
+        try:
+            os.link(temporary, path)
+            return True
+        except FileExistsError:
+            return False
+    finally:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+
+
+def new_kid() -> str:
+    return time.strftime("%Y%m%d") + "-" + secrets.token_hex(4)
+
+
+def load_key_ring(config=settings) -> KeyRing:
+    """
+    Assemble le trousseau, partagé par tous les workers : fichier
+    JWT_KEYS_FILE, puis JWT_KEYS (environnement), puis SECRET_KEY sous le
+    `kid` "default". Clé active : JWT_ACTIVE_KID, sinon celle du fichier,
+    sinon "default".
+
+    Sans aucune clé configurée, une clé est générée dans JWT_KEYS_FILE : le
+    premier worker la crée, les autres la relisent.
+    """
+    keys: Dict[str, str] = {}
+    active_kid = None
+    path = config.JWT_KEYS_FILE
+    if path and os.path.exists(path):
+        data = read_key_file(path)
+        keys.update(data.get("keys", {}))
+        active_kid = data.get("active")
+    keys.update(config.JWT_KEYS)
+    if config.SECRET_KEY:
+        keys.setdefault(DEFAULT_KID, config.SECRET_KEY)
+
+    if not keys:
+        if not path:
+            raise ValueError("Aucune clé JWT : définir SECRET_KEY, JWT_KEYS ou JWT_KEYS_FILE")
+        kid = new_kid()
+        if write_key_file(path, {"active": kid, "keys": {kid: secrets.token_urlsafe(32)}}, replace=False):
+            logger.warning("Aucune clé JWT configurée : clé générée dans %s", path)
+        return load_key_ring(config)
+
+    active_kid = config.JWT_ACTIVE_KID or active_kid
+    if active_kid is None:
+        active_kid = DEFAULT_KID if DEFAULT_KID in keys else next(iter(keys))
+    return KeyRing(keys, active_kid)
+
+
+def _file_mtime(path: Optional[str]) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime if path else None
+    except FileNotFoundError:
+        return None
+
+
+_ring: Optional[KeyRing] = None
+_ring_mtime: Optional[float] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def key_ring(*, refresh: bool = False) -> KeyRing:
+    """
+    Trousseau en cache dans le processus. Le fichier de clés est surveillé
+    (au plus une fois toutes les JWT_KEYS_RELOAD_INTERVAL secondes, ou tout
+    de suite avec refresh=True) : une rotation est prise en compte sans
+    redémarrer les workers.
+    """
+    global _ring, _ring_mtime, _checked_at
+    now = time.monotonic()
+    if _ring is not None and not refresh and now - _checked_at < settings.JWT_KEYS_RELOAD_INTERVAL:
+        return _ring
+    with _lock:
+        mtime = _file_mtime(settings.JWT_KEYS_FILE)
+        if _ring is None or mtime != _ring_mtime:
+            _ring = load_key_ring(settings)
+            # Fichier éventuellement créé par load_key_ring
+            _ring_mtime = _file_mtime(settings.JWT_KEYS_FILE)
+            logger.info("Trousseau JWT chargé : clés %s, active %s", _ring.kids, _ring.active_kid)
+        _checked_at = now
+        return _ring
+
+
+def verification_key(kid: Optional[str]) -> Optional[Key]:
+    """
+    Clé de vérification d'un token. Un `kid` inconnu peut venir d'un worker
+    qui a déjà vu une rotation : le fichier de clés est alors relu.
+    """
+    key = key_ring().verification_key(kid)
+    if key is None and kid:
+        key = key_ring(refresh=True).verification_key(kid)
+    return key
+
+
+def reset_key_ring() -> None:
+    """
+    Oublie le trousseau en cache (rechargé au prochain usage).
+    """
+    global _ring, _ring_mtime
+    with _lock:
+        _ring = None
+        _ring_mtime = None
+
+
+def rotate_key(path: str, *, retire: Optional[list] = None) -> str:
+    """
+    Ajoute une clé au fichier et la rend active ; les anciennes restent
+    valides pour les tokens déjà émis jusqu'à leur retrait (`retire`).
+    Renvoie le `kid` de la nouvelle clé.
+    """
+    data = read_key_file(path) if os.path.exists(path) else {"keys": {}}
+    kid = new_kid()
+    data["keys"][kid] = secrets.token_urlsafe(32)
+    for old in retire or []:
+        if old != kid:
+            data["keys"].pop(old, None)
+    data["active"] = kid
+    write_key_file(path, data)
+    return kid
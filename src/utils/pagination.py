@@ -1,48 +1,178 @@
 import logging
-from typing import Generic, TypeVar, List, Optional, Dict, Any
+import base64
+import binascii
+import json
+from typing import Generic, TypeVar, List, Optional, Dict, Any, Tuple, Callable, Awaitable
 from pydantic import BaseModel
+from sqlalchemy import Column, tuple_
 from sqlalchemy.orm import Query
 from fastapi import Query as QueryParam
 
+from src.exceptions import CustomException
+from .cache import cache_key, get_or_set_cached, get_or_set_cached_async, invalidate_cache
+
 T = TypeVar('T')
 
 logger = logging.getLogger(__name__)
 
+# Cache des comptages, invalidé à chaque écriture sur la ressource concernée
+COUNT_CACHE_PREFIX = "src.utils.pagination.count"
+COUNT_CACHE_EXPIRY = 300  # 5 minutes
+
 class PaginationParams:
     def __init__(
         self,
         skip: int = 0,
         limit: int = 100,
         sort_by: Optional[str] = None,
-        sort_desc: bool = False
+        sort_desc: bool = False,
+        cursor: Optional[str] = None,
+        keyset: bool = False,
+        include_total: Optional[bool] = None
     ):
         self.skip = skip
         self.limit = limit
         self.sort_by = sort_by
         self.sort_desc = sort_desc
+        self.cursor = cursor
+        # Un curseur fourni implique le mode keyset
+        self.keyset = keyset or cursor is not None
+        # Par défaut : total calculé en mode offset, omis en mode curseur
+        self.include_total = (not self.keyset) if include_total is None else include_total
 
 
 class Page(BaseModel, Generic[T]):
     items: List[T]
-    total: int
-    page: int
+    total: Optional[int] = None
+    total_cached: Optional[bool] = None
+    page: Optional[int] = None
     size: int
-    pages: int
-    
+    pages: Optional[int] = None
+    has_more: Optional[bool] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
     class Config:
         arbitrary_types_allowed = True
 
 
-def paginate(query: Query, params: PaginationParams, schema) -> Page:
+def keyset_columns(schema) -> Dict[str, Column]:
+    """
+    Colonnes utilisables pour la pagination par curseur : clé primaire et
+    premières colonnes d'index, non nullables. Avec SQLite, un index secondaire
+    contient implicitement le rowid, donc ORDER BY (colonne, id) reste indexé.
+    """
+    table = schema.__table__
+    columns = {c.name: c for c in table.primary_key.columns}
+    for index in table.indexes:
+        first = list(index.columns)[0]
+        if not first.nullable:
+            columns[first.name] = first
+    return columns
+
+
+def count_cache_key(resource: str, **filters: Any) -> str:
+    """
+    Clé de cache d'un comptage : ressource + signature normalisée des filtres
+    (filtres vides ignorés, chaînes en minuscules et espaces réduits).
+    """
+    normalized = {}
+    for name, value in filters.items():
+        if isinstance(value, str):
+            value = " ".join(value.lower().split())
+        if value is None or value == "":
+            continue
+        normalized[name] = value
+    return f"{count_tag(resource)}:{cache_key(**normalized)}"
+
+
+def count_tag(resource: str) -> str:
+    """
+    Étiquette de cache des comptages d'une ressource (préfixe de leurs clés).
+    """
+    return f"{COUNT_CACHE_PREFIX}.{resource}"
+
+
+def invalidate_counts(resource: str) -> None:
+    """
+    Invalide les comptages mis en cache pour une ressource.
+    """
+    invalidate_cache(count_tag(resource))
+
+
+def count(query: Query, count_key: Optional[str] = None) -> Tuple[int, bool]:
+    """
+    Compte les éléments d'une requête, via le cache si une clé est fournie.
+    Renvoie (total, provient_du_cache).
+    """
+    if not count_key:
+        return query.count(), False
+    # Les clés de count_cache_key commencent par l'étiquette de la ressource
+    tag = count_key.partition(":")[0]
+    hit, total = get_or_set_cached(count_key, query.count, COUNT_CACHE_EXPIRY, tags=(tag,))
+    return total, hit
+
+
+async def count_async(count_key: str, compute: Callable[[], Awaitable[int]]) -> Tuple[int, bool]:
+    """
+    Version de count pour la boucle asyncio : `compute` compte les éléments
+    (coroutine), une seule fois par clé pour tous les appels concurrents.
+    Renvoie (total, provient_du_cache).
+    """
+    tag = count_key.partition(":")[0]
+    hit, total = await get_or_set_cached_async(count_key, compute, COUNT_CACHE_EXPIRY, tags=(tag,))
+    return total, hit
+
+
+def encode_cursor(sort_by: str, sort_desc: bool, key: Any, id: int, backward: bool = False) -> str:
+    """
+    Encode un curseur opaque (clé de tri + id en départage).
+    """
+    raw = json.dumps([sort_by, sort_desc, key, id, backward], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_desc: bool) -> Tuple[Any, int, bool]:
+    """
+    Décode un curseur et vérifie qu'il correspond au tri demandé.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, cursor_desc, key, id, backward = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, binascii.Error):
+        raise CustomException("Curseur de pagination invalide", status_code=400)
+    if cursor_sort_by != sort_by or cursor_desc != sort_desc:
+        raise CustomException("Le curseur ne correspond pas au tri demandé", status_code=400)
+    return key, id, backward
+
+
+def paginate(
+    query: Query,
+    params: PaginationParams,
+    schema,
+    count_key: Optional[str] = None,
+    counted: Optional[Tuple[int, bool]] = None
+) -> Page:
     """
     Pagine une requête SQLAlchemy.
+    `count_key` (voir count_cache_key) permet de réutiliser un total déjà calculé.
+    `counted` fournit le total déjà obtenu (total, provient_du_cache), par
+    exemple par count_async.
     """
     logger.debug(f"Pagination params: skip={params.skip}, limit={params.limit}, sort_by={params.sort_by}, sort_desc={params.sort_desc}")
 
-    # Compter le nombre total d'éléments
-    total = query.count()
-    logger.info(f"Total items in query: {total}")
-    
+    total = total_cached = None
+    if params.include_total:
+        # Compter le nombre total d'éléments
+        total, total_cached = counted if counted is not None else count(query, count_key)
+        logger.info(f"Total items in query: {total} (cached={total_cached})")
+
+    if params.keyset:
+        page = paginate_keyset(query, params, schema)
+        page.total = total
+        page.total_cached = total_cached
+        return page
+
     # Appliquer le tri si spécifié
     if params.sort_by:
         if hasattr(schema, params.sort_by):
@@ -54,13 +184,17 @@ def paginate(query: Query, params: PaginationParams, schema) -> Page:
                 query = query.order_by(column)
         else:
             logger.warning(f"Sort column '{params.sort_by}' does not exist in schema '{schema.__name__}'")
-    
-    # Appliquer la pagination
-    items = query.offset(params.skip).limit(params.limit).all()
+
+    # Appliquer la pagination (un élément de plus pour savoir s'il reste des pages)
+    items = query.offset(params.skip).limit(params.limit + 1).all()
+    has_more = len(items) > params.limit
+    items = items[:params.limit]
     logger.debug(f"Fetched {len(items)} items from database")
 
     # Calculer le nombre de pages
-    pages = (total + params.limit - 1) // params.limit if params.limit > 0 else 1
+    pages = None
+    if total is not None:
+        pages = (total + params.limit - 1) // params.limit if params.limit > 0 else 1
     page = (params.skip // params.limit) + 1 if params.limit > 0 else 1
 
     logger.info(f"Returning page {page}/{pages} with size {params.limit}")
@@ -68,7 +202,67 @@ def paginate(query: Query, params: PaginationParams, schema) -> Page:
     return Page(
         items=items,
         total=total,
+        total_cached=total_cached,
         page=page,
         size=params.limit,
-        pages=pages
-    )
\ No newline at end of file
+        pages=pages,
+        has_more=has_more
+    )
+
+
+def paginate_keyset(query: Query, params: PaginationParams, schema) -> Page:
+    """
+    Pagine une requête par curseur (keyset) : le coût d'une page ne dépend pas
+    de sa position, et aucun comptage n'est effectué.
+    """
+    sort_by = params.sort_by or "id"
+    columns = keyset_columns(schema)
+    if sort_by not in columns:
+        logger.warning(f"Keyset pagination not allowed on column '{sort_by}' of '{schema.__name__}'")
+        raise CustomException(
+            f"Tri par curseur impossible sur '{sort_by}' (colonnes autorisées : {', '.join(sorted(columns))})",
+            status_code=400
+        )
+    column = getattr(schema, sort_by)
+    id_column = schema.id
+    sort_key = tuple_(column, id_column) if sort_by != "id" else id_column
+
+    backward = False
+    if params.cursor:
+        key, last_id, backward = decode_cursor(params.cursor, sort_by, params.sort_desc)
+        bound = tuple_(key, last_id) if sort_by != "id" else last_id
+        # On avance dans le sens du tri, ou à rebours pour la page précédente
+        if params.sort_desc != backward:
+            query = query.filter(sort_key < bound)
+        else:
+            query = query.filter(sort_key > bound)
+
+    # Le tri keyset remplace tout tri existant (pertinence, etc.)
+    descending = params.sort_desc != backward
+    order = [column.desc(), id_column.desc()] if descending else [column.asc(), id_column.asc()]
+    if sort_by == "id":
+        order = order[1:]
+    rows = query.order_by(None).order_by(*order).limit(params.limit + 1).all()
+    has_more = len(rows) > params.limit
+    items = rows[:params.limit]
+    if backward:
+        items.reverse()
+    logger.debug(f"Fetched {len(items)} items with keyset pagination (backward={backward})")
+
+    next_cursor = prev_cursor = None
+    if items:
+        first, last = items[0], items[-1]
+        # Page suivante : il en reste si on avançait, toujours si on reculait
+        if backward or has_more:
+            next_cursor = encode_cursor(sort_by, params.sort_desc, getattr(last, sort_by), last.id)
+        # Page précédente : toujours si on avançait depuis un curseur
+        if (backward and has_more) or (not backward and params.cursor):
+            prev_cursor = encode_cursor(sort_by, params.sort_desc, getattr(first, sort_by), first.id, backward=True)
+
+    return Page(
+        items=items,
+        size=params.limit,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
+    )
@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..config import settings
+from .cache import invalidate_cache, register_local_store
+from .cache_backends import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Colonnes jamais mises en cache : rechargées depuis la base si elles sont lues
+PRIVATE_COLUMNS = frozenset({"hashed_password"})
+
+# Utilisateurs authentifiés, par token : toujours en mémoire du processus
+principal_store = register_local_store(LRUCache(max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES))
+
+
+def principal_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def token_key(token: str) -> str:
+    # Empreinte du token : le token lui-même n'est pas conservé
+    return "principal:" + hashlib.sha256(token.encode()).hexdigest()
+
+
+def principal_generation() -> int:
+    """
+    À relever avant de charger l'utilisateur, pour cache_principal.
+    """
+    return principal_store.generation
+
+
+def cached_principal(token: str) -> Optional[Any]:
+    """
+    Utilisateur associé au token, reconstruit sans requête ni décodage :
+    objet détaché, à rattacher par session.merge(user, load=False).
+    """
+    if settings.PRINCIPAL_CACHE_TTL <= 0:
+        return None
+    hit, entry = principal_store.get(token_key(token))
+    if not hit:
+        return None
+    model, values = entry
+    user = model(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def cache_principal(token: str, user: Any, expires_at: Optional[int], generation: int) -> None:
+    """
+    Met l'utilisateur en cache pour PRINCIPAL_CACHE_TTL secondes, sans
+    dépasser l'expiration du token. Ignoré si l'utilisateur a été invalidé
+    depuis `generation` (l'utilisateur chargé peut être périmé).
+    """
+    expiry = settings.PRINCIPAL_CACHE_TTL
+    if expires_at is not None:
+        expiry = min(expiry, int(expires_at - time.time()))
+    if expiry <= 0:
+        return
+    values = {
+        attr.key: getattr(user, attr.key)
+        for attr in inspect(user).mapper.column_attrs
+        if attr.key not in PRIVATE_COLUMNS
+    }
+    principal_store.set_if_current(generation, token_key(token), (type(user), values), expiry, (principal_tag(user.id),))
+
+
+def invalidate_principals(user_id: int) -> None:
+    """
+    Oublie toutes les sessions en cache d'un utilisateur (ce worker et,
+    par le bus d'invalidation, les autres).
+    """
+    invalidate_cache(principal_tag(user_id))
+
+
+def principal_stats() -> Dict[str, Any]:
+    """
+    Compteurs du cache des utilisateurs authentifiés, avec le taux de succès.
+    """
+    stats: Dict[str, Any] = principal_store.stats()
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+    return stats
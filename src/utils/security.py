@@ -1,24 +1,42 @@
+import asyncio
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional, Tuple, TypeVar, Union
 
 from jose import jwt
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 
 from ..config import settings
+from .jwt_keys import ALGORITHM, key_ring
+from src.exceptions import CustomException
 
 logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
 
-ALGORITHM = "HS256"
+
+@lru_cache
+def crypt_context(rounds: int) -> CryptContext:
+    """
+    Contexte bcrypt au coût donné : un hash d'un autre coût est signalé
+    à mettre à jour par verify_and_update.
+    """
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+pwd_context = crypt_context(settings.BCRYPT_ROUNDS)
 
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
 ) -> str:
     """
-    Crée un token JWT.
+    Crée un token JWT, signé avec la clé active du trousseau (son `kid` dans l'en-tête).
     """
     logger.debug("Creating access token for subject: %s", subject)
     if expires_delta:
@@ -31,29 +49,169 @@ def create_access_token(
         logger.debug("Using default ACCESS_TOKEN_EXPIRE_MINUTES: %s", settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    ring = key_ring()
+    encoded_jwt = jwt.encode(to_encode, ring.signing_key, algorithm=ALGORITHM, headers={"kid": ring.active_kid})
     logger.info("Access token created for subject: %s", subject)
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# Fonctions exécutées dans les processus du pool : définies au niveau du
+# module pour être importables (démarrage "spawn")
+
+def _hash(rounds: int, password: str) -> str:
+    return crypt_context(rounds).hash(password)
+
+
+def _verify(rounds: int, plain_password: str, hashed_password: str) -> bool:
+    return crypt_context(rounds).verify(plain_password, hashed_password)
+
+
+def _verify_and_update(rounds: int, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return crypt_context(rounds).verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
     """
-    Vérifie si un mot de passe en clair correspond à un hash.
+    Exécute bcrypt hors des threads du serveur, dans un pool de processus
+    dédié de `workers` processus (0 : dans le thread appelant ou, en
+    asynchrone, dans le pool de threads de Starlette).
+
+    Au plus `max_pending` opérations en attente ou en cours : au-delà, une
+    CustomException 503 est levée plutôt que d'allonger la file.
     """
-    logger.debug("Verifying password.")
-    result = pwd_context.verify(plain_password, hashed_password)
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Démarré au premier usage ; "spawn" : pas de fork des threads du serveur
+        with self._lock:
+            if self._executor is None:
+                logger.info("Démarrage du pool de hachage des mots de passe (%d processus)", self.workers)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        if not self._slots.acquire(blocking=False):
+            logger.warning("Pool de hachage saturé (%d opérations en cours)", self.max_pending)
+            raise CustomException("Serveur surchargé, réessayez plus tard", status_code=503)
+        try:
+            future = self.executor.submit(fn, self.rounds, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.workers <= 0:
+            return fn(self.rounds, *args)
+        return self._submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.workers <= 0:
+            return await run_in_threadpool(fn, self.rounds, *args)
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(
+    settings.BCRYPT_ROUNDS, settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+def configure_password_hasher(
+    rounds: Optional[int] = None, workers: Optional[int] = None, max_pending: Optional[int] = None
+) -> PasswordHasher:
+    """
+    Remplace le pool de hachage (l'ancien est arrêté). Sans argument,
+    reprend les valeurs de la configuration.
+    """
+    global password_hasher
+    password_hasher.shutdown()
+    password_hasher = PasswordHasher(
+        settings.BCRYPT_ROUNDS if rounds is None else rounds,
+        settings.PASSWORD_HASH_WORKERS if workers is None else workers,
+        settings.PASSWORD_HASH_MAX_PENDING if max_pending is None else max_pending,
+    )
+    return password_hasher
+
+
+def _log_verification(result: bool) -> None:
     if result:
         logger.info("Password verification succeeded.")
     else:
         logger.warning("Password verification failed.")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Vérifie si un mot de passe en clair correspond à un hash.
+    """
+    logger.debug("Verifying password.")
+    result = password_hasher.run(_verify, plain_password, hashed_password)
+    _log_verification(result)
     return result
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Vérifie le mot de passe ; renvoie aussi un nouveau hash si celui-ci
+    n'a pas le coût configuré (BCRYPT_ROUNDS), None sinon.
+    """
+    logger.debug("Verifying password.")
+    result, new_hash = password_hasher.run(_verify_and_update, plain_password, hashed_password)
+    _log_verification(result)
+    return result, new_hash
+
+
 def get_password_hash(password: str) -> str:
     """
     Génère un hash à partir d'un mot de passe en clair.
     """
     logger.debug("Hashing password.")
-    hashed = pwd_context.hash(password)
+    hashed = password_hasher.run(_hash, password)
+    logger.info("Password hashed successfully.")
+    return hashed
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password sans bloquer la boucle d'évènements.
+    """
+    logger.debug("Verifying password.")
+    result = await password_hasher.run_async(_verify, plain_password, hashed_password)
+    _log_verification(result)
+    return result
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    verify_and_update_password sans bloquer la boucle d'évènements.
+    """
+    logger.debug("Verifying password.")
+    result, new_hash = await password_hasher.run_async(_verify_and_update, plain_password, hashed_password)
+    _log_verification(result)
+    return result, new_hash
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    get_password_hash sans bloquer la boucle d'évènements.
+    """
+    logger.debug("Hashing password.")
+    hashed = await password_hasher.run_async(_hash, password)
     logger.info("Password hashed successfully.")
-    return hashed
\ No newline at end of file
+    return hashed
@@ -1,13 +1,21 @@
+import asyncio
+from datetime import datetime, timedelta
+
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from src.models.base import Base
-from src.db.session import get_db
+from src.db.session import get_db, get_read_db
 from src.main import app
 from src.models.users import User
 from src.models.books import Book
+from src.models.categories import Category
+from src.models.loans import Loan
+from src.repositories.versions import versions_view
+from src.utils.cache import invalidate_cache
 
 
 @pytest.fixture(scope="session")
@@ -29,6 +37,9 @@ def db_session(engine):
     """
     Crée une nouvelle session de base de données pour un test.
     """
+    # Le cache est global au processus : on repart d'un cache vide
+    invalidate_cache()
+    versions_view.invalidate()
     connection = engine.connect()
     transaction = connection.begin()
     session = sessionmaker(bind=connection)()
@@ -52,6 +63,7 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     
     from fastapi.testclient import TestClient
     with TestClient(app) as client:
@@ -73,4 +85,41 @@ def book(db_session):
     book = Book(title="Test Book", author="Author", isbn="1234567890", publication_year=2020, quantity=3)
     db_session.add(book)
     db_session.commit()
-    return book
\ No newline at end of file
+    return book
+
+
+@pytest.fixture
+def run_with_db():
+    """
+    Fournit run_with_db(test) : exécute `test(session)` sur une base SQLite
+    en mémoire avec le pilote asynchrone.
+    """
+    def run_with_db(test):
+        async def main():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+            Session = async_sessionmaker(engine, expire_on_commit=False)
+            async with Session() as db:
+                roman = Category(name="Roman")
+                user = User(email="async@example.com", full_name="Async", hashed_password="x", is_active=True)
+                books = [
+                    Book(title="La Peste", author="Albert Camus", isbn="9782070360425", publication_year=1947, quantity=2),
+                    Book(title="L'Étranger", author="Albert Camus", isbn="9782070360024", publication_year=1942, quantity=1),
+                    Book(title="1984", author="George Orwell", isbn="9780451524935", publication_year=1949, quantity=3),
+                ]
+                books[0].categories.append(roman)
+                db.add_all([user, *books])
+                await db.flush()
+                db.add(Loan(user_id=user.id, book_id=books[0].id, loan_date=datetime.utcnow(),
+                            due_date=datetime.utcnow() + timedelta(days=14)))
+                await db.commit()
+            try:
+                async with Session() as db:
+                    await test(db)
+            finally:
+                await engine.dispose()
+
+        invalidate_cache()
+        asyncio.run(main())
+    return run_with_db
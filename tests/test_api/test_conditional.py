@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from src.api.conditional import conditional_response
+from src.api.routes.stats import get_general_stats
+from src.models.books import Book
+from src.models.categories import Category
+from src.models.versions import bump_versions
+from src.repositories.books import BookRepository
+from src.repositories.stats import table_state
+from src.repositories.versions import versions_view
+from src.services.stats import StatsService
+
+
+def make_request(path: str = "/api/v1/books/", query: str = "", **headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_etag_and_if_none_match():
+    """
+    Teste la génération de l'ETag et la réponse 304 sur If-None-Match.
+    """
+    response = Response()
+    assert conditional_response(make_request(), response, [3, "2024-01-01"]) is None
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"') and response.headers["cache-control"] == "no-cache"
+
+    for header in (etag, etag.removeprefix("W/"), f'"autre", {etag}', "*"):
+        not_modified = conditional_response(make_request(if_none_match=header), Response(), [3, "2024-01-01"])
+        assert not_modified.status_code == 304 and not_modified.headers["etag"] == etag
+
+    # Données ou paramètres différents : nouvel ETag
+    assert conditional_response(make_request(if_none_match=etag), Response(), [4, "2024-01-01"]) is None
+    assert conditional_response(make_request(query="skip=100", if_none_match=etag), Response(), [3, "2024-01-01"]) is None
+
+
+def test_if_modified_since():
+    """
+    Teste Last-Modified et If-Modified-Since (ignoré si If-None-Match est présent).
+    """
+    modified = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    response = Response()
+    conditional_response(make_request(), response, [1], modified, private=True)
+    assert response.headers["last-modified"] == "Wed, 01 May 2024 12:30:15 GMT"
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    since = response.headers["last-modified"]
+    assert conditional_response(make_request(if_modified_since=since), Response(), [1], modified).status_code == 304
+    older = format_datetime(modified - timedelta(seconds=1), usegmt=False)
+    assert conditional_response(make_request(if_modified_since=older), Response(), [1], modified) is None
+    assert conditional_response(make_request(if_modified_since="pas une date"), Response(), [1], modified) is None
+    assert conditional_response(make_request(if_modified_since=since, if_none_match='"autre"'), Response(), [1], modified) is None
+
+
+def test_table_state_tracks_writes(db_session: Session):
+    """
+    Teste que la signature change à chaque création, modification, suppression
+    et changement de catégories d'un livre.
+    """
+    repository = BookRepository(Book, db_session)
+    states = [table_state(db_session, Book, Category)[0]]
+    book = repository.create(obj_in={
+        "title": "Livre", "author": "Auteur", "isbn": "1000000000001", "publication_year": 2000, "quantity": 1
+    })
+    category = Category(name="Roman")
+    db_session.add(category)
+    db_session.commit()
+    states.append(table_state(db_session, Book, Category)[0])
+    single = table_state(db_session, Book, Category, book_id=book.id)[0]
+
+    repository.update(db_obj=book, obj_in={"quantity": 2})
+    states.append(table_state(db_session, Book, Category)[0])
+    repository.add_category(book_id=book.id, category_id=category.id)
+    states.append(table_state(db_session, Book, Category)[0])
+    assert table_state(db_session, Book, Category, book_id=book.id)[0] != single
+    repository.remove(id=book.id)
+    states.append(table_state(db_session, Book, Category)[0])
+    assert len({repr(state) for state in states}) == len(states)
+
+
+def test_table_state_sees_other_worker_writes(db_session: Session):
+    """
+    Teste que la signature suit une écriture d'un autre worker, même quand
+    la vue des versions en mémoire du processus n'est pas encore rafraîchie.
+    """
+    repository = BookRepository(Book, db_session)
+    repository.create(obj_in={
+        "title": "Livre", "author": "Auteur", "isbn": "1000000000001", "publication_year": 2000, "quantity": 1
+    })
+    versions_view.get(db_session)
+    before = table_state(db_session, Book, Category)[0]
+    # Écriture d'un autre worker : sans commit dans ce processus, la vue reste en cache
+    bump_versions(db_session.connection(), ["book"])
+    assert table_state(db_session, Book, Category)[0] != before
+
+
+def test_stats_route_returns_304_without_query(db_session: Session, monkeypatch):
+    """
+    Teste qu'une route de statistiques répond 304 sans exécuter sa requête principale.
+    """
+    db_session.add(Book(title="Livre", author="Auteur", isbn="1000000000001", publication_year=2000, quantity=1))
+    db_session.commit()
+    response = Response()
+    stats = get_general_stats(make_request("/api/v1/stats/general"), response, db_session, current_user=None)
+    assert stats["unique_books"] == 1
+
+    def fail(self):
+        pytest.fail("La requête principale ne doit pas être exécutée")
+    monkeypatch.setattr(StatsService, "get_general_stats", fail)
+    request = make_request("/api/v1/stats/general", if_none_match=response.headers["etag"])
+    not_modified = get_general_stats(request, Response(), db_session, current_user=None)
+    assert not_modified.status_code == 304 and not_modified.body == b""
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.api import dependencies
+from src.api.dependencies import get_current_user, get_current_user_async
+from src.api.routes.users import ChangePasswordRequest, change_password
+from src.models.users import User
+from src.repositories.users import UserRepository
+from src.utils.principal_cache import cache_principal, invalidate_principals, principal_generation, principal_stats
+from src.utils.security import create_access_token, get_password_hash
+
+
+@pytest.fixture
+def statements(engine):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    yield statements
+    event.remove(engine, "before_cursor_execute", listener)
+
+
+def test_repeat_requests_skip_decode_and_query(db_session: Session, user, statements, monkeypatch):
+    """
+    Teste qu'un token déjà vu est résolu sans décodage ni requête, dans une autre session.
+    """
+    user.hashed_password = get_password_hash("ancien-mot-de-passe")
+    db_session.commit()
+    token = create_access_token(user.id)
+    hits = principal_stats()["hits"]
+    assert get_current_user(db_session, token).id == user.id
+
+    db_session.expunge_all()
+    statements.clear()
+    monkeypatch.setattr(dependencies, "decode_token", lambda token: pytest.fail("Le token ne doit pas être décodé"))
+    cached = get_current_user(db_session, token)
+    assert (cached.id, cached.email, cached.is_active) == (user.id, user.email, True)
+    assert cached in db_session and statements == []
+    assert principal_stats()["hits"] == hits + 1
+
+    # Le mot de passe haché n'est pas en cache : rechargé à la demande
+    assert cached.hashed_password.startswith("$2")
+    assert len(statements) == 1
+
+
+def test_writes_invalidate_cached_principals(db_session: Session, user):
+    """
+    Teste l'invalidation par la mise à jour, le changement de mot de passe et la suppression.
+    """
+    user.hashed_password = get_password_hash("ancien-mot-de-passe")
+    db_session.commit()
+    token = create_access_token(user.id)
+    repository = UserRepository(User, db_session)
+
+    get_current_user(db_session, token)
+    repository.update(db_obj=user, obj_in={"is_active": False})
+    db_session.expunge_all()
+    assert get_current_user(db_session, token).is_active is False
+
+    current = get_current_user(db_session, token)
+    request = ChangePasswordRequest(current_password="ancien-mot-de-passe", new_password="nouveau-mot-de-passe")
+    asyncio.run(change_password(request, db_session, current))
+    assert principal_stats()["entries"] == 0
+
+    get_current_user(db_session, token)
+    repository.remove(id=user.id)
+    with pytest.raises(HTTPException) as error:
+        get_current_user(db_session, token)
+    assert error.value.status_code == 404
+
+
+def test_cache_respects_token_expiry_and_invalidations(user):
+    """
+    Teste qu'une entrée ne survit pas au token, et qu'un chargement antérieur à une invalidation n'est pas conservé.
+    """
+    cache_principal("presque-expiré", user, int(time.time()), principal_generation())
+    assert principal_stats()["entries"] == 0
+
+    generation = principal_generation()
+    invalidate_principals(user.id)
+    cache_principal("ancien", user, None, generation)
+    assert principal_stats()["entries"] == 0
+
+    token = create_access_token(user.id, expires_delta=timedelta(minutes=5))
+    cache_principal(token, user, int(time.time()) + 300, principal_generation())
+    assert principal_stats()["entries"] == 1
+
+
+def test_async_dependency_uses_cache(run_with_db):
+    """
+    Teste la version asynchrone : le second appel est servi par le cache.
+    """
+    async def test(db):
+        user = (await db.execute(User.__table__.select())).first()
+        token = create_access_token(user.id)
+        hits = principal_stats()["hits"]
+        first = await get_current_user_async(db, token)
+        db.expunge_all()
+        second = await get_current_user_async(db, token)
+        assert second.id == first.id and second.email == "async@example.com"
+        assert principal_stats()["hits"] == hits + 1
+
+    run_with_db(test)
@@ -0,0 +1,57 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import Response
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy.orm import Session
+
+from src.api.schemas.books import Book
+from src.api.schemas.loans import LoanWithDetails
+from src.api.serialization import json_response, serialize, type_adapter
+from src.models.books import Book as BookModel
+from src.models.categories import Category as CategoryModel
+from src.models.loans import Loan as LoanModel
+from src.utils.pagination import Page, PaginationParams, paginate
+
+
+def fastapi_serialize(schema, content):
+    """
+    Chemin standard de FastAPI : validation par response_model puis dictionnaires JSON.
+    """
+    field = create_model_field("Response", schema, mode="serialization")
+    return asyncio.run(serialize_response(field=field, response_content=content))
+
+
+def test_serialize_matches_response_model(db_session: Session, user, book):
+    """
+    Teste que la sérialisation groupée produit le même JSON que response_model.
+    """
+    book.categories.append(CategoryModel(name="Roman", description="Fiction"))
+    now = datetime.utcnow()
+    db_session.add(LoanModel(user_id=user.id, book_id=book.id, loan_date=now, due_date=now + timedelta(days=14)))
+    db_session.commit()
+
+    page = paginate(db_session.query(BookModel), PaginationParams(skip=0, limit=10), BookModel)
+    assert json.loads(serialize(Page[Book], page)) == fastapi_serialize(Page[Book], page)
+    assert json.loads(serialize(Page[Book], page))["items"][0]["categories"][0]["name"] == "Roman"
+
+    loans = db_session.query(LoanModel).all()
+    assert json.loads(serialize(List[LoanWithDetails], loans)) == fastapi_serialize(List[LoanWithDetails], loans)
+    assert type_adapter(List[LoanWithDetails]) is type_adapter(List[LoanWithDetails])
+
+
+def test_json_response_keeps_injected_headers(db_session: Session, book):
+    """
+    Teste que les en-têtes posés sur la réponse injectée (ETag...) sont conservés.
+    """
+    response = Response()
+    del response.headers["content-length"]
+    response.headers["etag"] = 'W/"abc"'
+    result = json_response(List[Book], [book], response)
+    assert result.headers["etag"] == 'W/"abc"'
+    assert result.headers["content-type"] == "application/json"
+    assert int(result.headers["content-length"]) == len(result.body)
+    assert json.loads(result.body)[0]["isbn"] == book.isbn
@@ -0,0 +1,59 @@
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.instrumentation import disable_model_instrumentation, enable_model_instrumentation
+
+LOGGER = "src.models.instrumentation"
+
+
+@pytest.fixture
+def instrumentation():
+    enable_model_instrumentation()
+    yield
+    disable_model_instrumentation()
+
+
+def create_and_load(db_session: Session, user, book) -> None:
+    now = datetime.utcnow()
+    db_session.add(Loan(user_id=user.id, book_id=book.id, loan_date=now, due_date=now + timedelta(days=14)))
+    db_session.commit()
+    db_session.expunge_all()
+    db_session.query(Loan).all()
+
+
+def test_models_do_not_log_by_default(db_session: Session, user, book, caplog):
+    """
+    Teste qu'aucun message n'est émis par la construction, le chargement ou repr() des modèles.
+    """
+    caplog.set_level(logging.DEBUG, logger="src.models")
+    create_and_load(db_session, user, book)
+    repr(db_session.query(Loan).first())
+    repr(db_session.query(Book).first())
+    assert [record for record in caplog.records if record.name in (LOGGER, "src.models.books", "src.models.loans")] == []
+
+
+def test_instrumentation_traces_init_and_load(db_session: Session, user, book, caplog, instrumentation):
+    """
+    Teste la trace de la construction et du chargement, une fois activée.
+    """
+    caplog.set_level(logging.DEBUG, logger=LOGGER)
+    create_and_load(db_session, user, book)
+    messages = [record.getMessage() for record in caplog.records if record.name == LOGGER]
+    assert any(message.startswith("Création de Loan avec {") for message in messages)
+    assert any(message.startswith("Chargement de <Loan(id=") for message in messages)
+
+
+def test_instrumentation_is_lazy_below_debug(db_session: Session, user, book, caplog, instrumentation, monkeypatch):
+    """
+    Teste que les objets ne sont pas formatés quand DEBUG est désactivé.
+    """
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    calls = []
+    monkeypatch.setattr(Loan, "__repr__", lambda self: calls.append(self) or "<Loan>")
+    create_and_load(db_session, user, book)
+    assert calls == []
@@ -0,0 +1,42 @@
+import asyncio
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import Settings
+from src.db.profile import apply_sqlite_profile, engine_options, sqlite_pragmas
+
+
+def test_pragmas_applied_on_connect(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_profile(engine, sqlite_pragmas(Settings(SQLITE_BUSY_TIMEOUT_MS=1234)))
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert connection.execute(text("PRAGMA cache_size")).scalar() == -64 * 1024
+        assert connection.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    assert engine.pool.size() == Settings().DB_POOL_SIZE
+    engine.dispose()
+
+
+def test_pragmas_applied_on_async_engine(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"
+
+    async def main():
+        engine = create_async_engine(url, **engine_options(url))
+        apply_sqlite_profile(engine.sync_engine)
+        async with engine.connect() as connection:
+            mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+        await engine.dispose()
+        return mode
+
+    assert asyncio.run(main()) == "wal"
+
+
+def test_profile_disabled_and_memory_database():
+    assert sqlite_pragmas(Settings(SQLITE_PROFILE_ENABLED=False)) == {}
+    # Base en mémoire : pas d'options de pool (SingletonThreadPool/StaticPool)
+    assert engine_options("sqlite://") == {"connect_args": {"check_same_thread": False}}
+    assert "connect_args" not in engine_options("postgresql://user@localhost/db")
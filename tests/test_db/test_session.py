@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.db.profile import apply_sqlite_profile, engine_options, sqlite_pragmas, sqlite_read_pragmas
+from src.db.session import async_database_url, read_database_url
+
+
+def test_read_database_url():
+    assert read_database_url("sqlite://") is None
+    assert read_database_url("postgresql://primary/db") is None
+    assert read_database_url("postgresql://primary/db", "postgresql://replica/db") == "postgresql://replica/db"
+    url = read_database_url("sqlite:////data/library.db")
+    assert url == "sqlite:///file:/data/library.db?mode=ro&uri=true"
+
+
+def test_read_only_engine_sees_writes_and_rejects_them(tmp_path):
+    url = f"sqlite:///{tmp_path / 'library.db'}"
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_profile(engine, sqlite_pragmas())
+    read_url = read_database_url(url)
+    read_engine = create_engine(read_url, **engine_options(read_url))
+    apply_sqlite_profile(read_engine, sqlite_read_pragmas())
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO item VALUES (1)"))
+
+    with read_engine.connect() as reader:
+        # Transaction de lecture ouverte : l'écrivain n'est pas bloqué (WAL)
+        assert reader.execute(text("SELECT count(*) FROM item")).scalar() == 1
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO item VALUES (2)"))
+        with pytest.raises(OperationalError):
+            reader.execute(text("INSERT INTO item VALUES (3)"))
+    with read_engine.connect() as reader:
+        assert reader.execute(text("SELECT count(*) FROM item")).scalar() == 2
+
+    async def read_async():
+        async_engine = create_async_engine(async_database_url(read_url))
+        async with async_engine.connect() as connection:
+            count = (await connection.execute(text("SELECT count(*) FROM item"))).scalar()
+        await async_engine.dispose()
+        return count
+
+    assert asyncio.run(read_async()) == 2
+    read_engine.dispose()
+    engine.dispose()
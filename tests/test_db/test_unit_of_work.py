@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import event
+
+from src.db.unit_of_work import unit_of_work, in_unit_of_work, after_commit
+from src.models.books import Book
+from src.models.categories import Category
+from src.repositories.books import BookRepository
+from src.services.books import BookService
+from src.api.schemas.books import BookCreate
+
+
+def book_data(isbn="1234567890123"):
+    return {"title": "Livre", "author": "Auteur", "isbn": isbn, "publication_year": 2020, "quantity": 2}
+
+
+@pytest.fixture
+def commits(db_session):
+    calls = []
+    event.listen(db_session, "after_commit", lambda session: calls.append(session))
+    return calls
+
+
+def test_single_commit_for_several_writes(db_session, commits):
+    repository = BookRepository(Book, db_session)
+    with unit_of_work(db_session):
+        assert in_unit_of_work(db_session)
+        book = repository.create(obj_in=book_data())
+        assert book.id is not None  # flush : l'ID est déjà attribué
+        repository.update(db_obj=book, obj_in={"quantity": 5})
+        with unit_of_work(db_session):  # bloc imbriqué : rejoint la transaction
+            repository.create(obj_in=book_data("1234567890124"))
+        assert commits == []
+    assert len(commits) == 1
+    assert not in_unit_of_work(db_session)
+    assert repository.get_by_isbn(isbn="1234567890123").quantity == 5
+
+
+def test_rollback_on_error(db_session):
+    repository = BookRepository(Book, db_session)
+    callbacks = []
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db_session):
+            repository.create(obj_in=book_data())
+            after_commit(db_session, lambda: callbacks.append("invalidate"))
+            raise RuntimeError("échec")
+    assert repository.get_by_isbn(isbn="1234567890123") is None
+    assert callbacks == []
+
+
+def test_after_commit_outside_unit_of_work(db_session):
+    callbacks = []
+    after_commit(db_session, lambda: callbacks.append("invalidate"))
+    assert callbacks == ["invalidate"]
+
+
+def test_create_book_with_categories(db_session, commits):
+    categories = [Category(name="Roman"), Category(name="Histoire")]
+    db_session.add_all(categories)
+    db_session.commit()
+    commits.clear()
+    service = BookService(BookRepository(Book, db_session))
+    book = service.create(obj_in=BookCreate(**book_data(), category_ids=[c.id for c in categories]))
+    assert len(commits) == 1
+    assert {c.name for c in book.categories} == {"Roman", "Histoire"}
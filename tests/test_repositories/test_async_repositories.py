@@ -0,0 +1,44 @@
+
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.books import AsyncBookRepository
+from src.repositories.loans import AsyncLoanRepository
+from src.repositories.users import AsyncUserRepository
+from src.services.books import AsyncBookService
+from src.utils.pagination import PaginationParams
+
+
+def test_async_get_loads_categories(run_with_db):
+    async def test(db):
+        book = await AsyncBookRepository(Book, db).get(1)
+        # Chargées d'avance : accessibles sans chargement paresseux
+        assert [c.name for c in book.categories] == ["Roman"]
+        assert await AsyncBookRepository(Book, db).get(999) is None
+        user = await AsyncUserRepository(User, db).get(1)
+        assert user.email == "async@example.com"
+    run_with_db(test)
+
+
+def test_async_paginate_and_search(run_with_db):
+    async def test(db):
+        service = AsyncBookService(AsyncBookRepository(Book, db))
+        page = await service.paginate(params=PaginationParams(limit=2))
+        assert page.total == 3
+        assert len(page.items) == 2
+        assert page.has_more
+        page = await service.search(params=PaginationParams(), query="camus")
+        assert {book.title for book in page.items} == {"La Peste", "L'Étranger"}
+        page = await service.search(params=PaginationParams(), category_id=1)
+        assert [book.categories[0].name for book in page.items] == ["Roman"]
+    run_with_db(test)
+
+
+def test_async_loans_with_details(run_with_db):
+    async def test(db):
+        loans = await AsyncLoanRepository(Loan, db).get_loans_by_user_with_details(user_id=1)
+        assert len(loans) == 1
+        assert loans[0].book.title == "La Peste"
+        assert loans[0].book.categories[0].name == "Roman"
+        assert loans[0].user.email == "async@example.com"
+    run_with_db(test)
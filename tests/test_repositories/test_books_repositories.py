@@ -1,10 +1,15 @@
+import logging
+
 import pytest
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session
 
+from src.models.base import Base
 from src.models.books import Book
 from src.models.categories import Category
 from src.repositories.books import BookRepository
 from src.repositories.categories import CategoryRepository
+from src.repositories.search import BookSearchEngine, reset_fts_availability
 
 
 def test_create_book(db_session: Session):
@@ -144,4 +149,64 @@ def test_book_categories(db_session: Session):
     # Vérifier que la catégorie a été supprimée
     book_with_categories = book_repository.get_with_categories(id=book.id)
     assert len(book_with_categories.categories) == 1
-    assert book_with_categories.categories[0].name == "Python"
\ No newline at end of file
+    assert book_with_categories.categories[0].name == "Python"
+
+def test_full_text_search_ranking_and_sync(db_session: Session):
+    """
+    Teste la recherche plein texte : pertinence et synchronisation de l'index.
+    """
+    repository = BookRepository(Book, db_session)
+
+    in_description = repository.create(obj_in={
+        "title": "Mémoires",
+        "author": "Anonyme",
+        "isbn": "5555555555555",
+        "publication_year": 2001,
+        "description": "Souvenirs d'un lecteur de Camus",
+        "quantity": 1
+    })
+    in_author = repository.create(obj_in={
+        "title": "La Peste",
+        "author": "Albert Camus",
+        "isbn": "6666666666666",
+        "publication_year": 1947,
+        "quantity": 1
+    })
+
+    # Le résultat sur l'auteur est plus pertinent que celui sur la description
+    results = repository.search(query="camus")
+    assert [b.id for b in results] == [in_author.id, in_description.id]
+
+    # Recherche insensible aux accents et par préfixe
+    assert [b.id for b in repository.get_by_title(title="memoire")] == [in_description.id]
+
+    # L'index suit les mises à jour et les suppressions
+    repository.update(db_obj=in_author, obj_in={"title": "L'Étranger"})
+    assert repository.get_by_title(title="peste") == []
+    assert [b.id for b in repository.get_by_title(title="etranger")] == [in_author.id]
+
+    repository.remove(id=in_description.id)
+    assert [b.id for b in repository.search(query="camus")] == [in_author.id]
+
+
+def test_missing_full_text_index_is_checked_and_reported_once(caplog):
+    """
+    Teste que l'absence de l'index est mémorisée (une requête, un avertissement)
+    et oubliée à la création du schéma.
+    """
+    engine = create_engine("sqlite://")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    reset_fts_availability()
+    caplog.set_level(logging.WARNING, logger="src.repositories.search")
+
+    with Session(engine) as db:
+        search = BookSearchEngine(db)
+        assert [search.is_available() for _ in range(3)] == [False] * 3
+    assert len([s for s in statements if "sqlite_master" in s]) == 1
+    assert len([r for r in caplog.records if "absent" in r.getMessage()]) == 1
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        assert BookSearchEngine(db).is_available() is True
+    engine.dispose()
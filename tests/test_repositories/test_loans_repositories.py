@@ -1,12 +1,18 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.models.base import Base
 from src.models.loans import Loan
 from src.models.books import Book
 from src.models.users import User
 from src.repositories.loans import LoanRepository
 from src.repositories.books import BookRepository
 from src.repositories.users import UserRepository
+from src.services.loans import LoanService
 from src.exceptions import CustomException 
 
 class DummySession:
@@ -131,4 +137,142 @@ def test_remove_loan_exception():
     repo = LoanRepository(Loan, session)
     with pytest.raises(CustomException) as exc:
         repo.remove(id=1)  # Correction ici
-    assert "Erreur lors de la suppression" in str(exc.value)
\ No newline at end of file
+    assert "Erreur lors de la suppression" in str(exc.value)
+def test_active_loan_checks(db_session, user, book):
+    repo = LoanRepository(Loan, db_session)
+    assert repo.has_active_loan(user_id=user.id, book_id=book.id) is False
+    loan = repo.create(obj_in={
+        "user_id": user.id,
+        "book_id": book.id,
+        "loan_date": datetime.utcnow(),
+        "due_date": datetime.utcnow() + timedelta(days=14),
+        "return_date": None
+    })
+    assert repo.has_active_loan(user_id=user.id, book_id=book.id) is True
+    assert repo.count_active_loans_by_user(user_id=user.id) == 1
+    repo.update(db_obj=loan, obj_in={"return_date": datetime.utcnow()})
+    assert repo.has_active_loan(user_id=user.id, book_id=book.id) is False
+    assert repo.count_active_loans_by_user(user_id=user.id) == 0
+
+def test_duplicate_active_loan_rejected(db_session, user, book):
+    repo = LoanRepository(Loan, db_session)
+    loan_data = {
+        "user_id": user.id,
+        "book_id": book.id,
+        "loan_date": datetime.utcnow(),
+        "due_date": datetime.utcnow() + timedelta(days=14),
+        "return_date": None
+    }
+    repo.create(obj_in=dict(loan_data))
+    # L'index unique partiel interdit un second emprunt actif du même livre
+    with pytest.raises(CustomException):
+        repo.create(obj_in=dict(loan_data))
+
+def test_checkout_and_checkin(db_session, user, book):
+    repo = LoanRepository(Loan, db_session)
+    now = datetime.utcnow()
+    loan = repo.checkout(user_id=user.id, book_id=book.id, loan_date=now, due_date=now + timedelta(days=14))
+    assert loan.id is not None
+    db_session.refresh(book)
+    assert book.quantity == 2
+    assert repo.checkin(loan_id=loan.id, book_id=book.id, return_date=datetime.utcnow()) is True
+    # Un second retour du même emprunt ne réincrémente pas le stock
+    assert repo.checkin(loan_id=loan.id, book_id=book.id, return_date=datetime.utcnow()) is False
+    db_session.refresh(book)
+    db_session.refresh(loan)
+    assert book.quantity == 3
+    assert loan.return_date is not None
+
+def test_checkout_out_of_stock(db_session, user, book):
+    repo = LoanRepository(Loan, db_session)
+    BookRepository(Book, db_session).update(db_obj=book, obj_in={"quantity": 0})
+    now = datetime.utcnow()
+    assert repo.checkout(user_id=user.id, book_id=book.id, loan_date=now, due_date=now + timedelta(days=14)) is None
+    assert repo.get_loans_by_book(book_id=book.id) == []
+
+def test_checkout_many_skips_only_active_duplicates(db_session, user, book):
+    repo = LoanRepository(Loan, db_session)
+    other = BookRepository(Book, db_session).create(obj_in={
+        "title": "Autre", "author": "Author", "isbn": "5555555555", "publication_year": 2020, "quantity": 1
+    })
+    now = datetime.utcnow()
+    # Emprunt actif créé par une autre requête après la vérification du service
+    repo.create(obj_in={"user_id": user.id, "book_id": book.id, "loan_date": now, "due_date": now + timedelta(days=14)})
+    loans = repo.checkout_many(user_id=user.id, book_ids=[book.id, other.id], loan_date=now, due_date=now + timedelta(days=14))
+    assert list(loans) == [other.id]
+    db_session.refresh(book)
+    db_session.refresh(other)
+    # Le stock du livre en doublon est rétabli, celui de l'autre livre décrémenté
+    assert (book.quantity, other.quantity) == (3, 0)
+    assert len(repo.get_loans_by_book(book_id=book.id)) == 1
+
+@pytest.fixture
+def file_sessions(tmp_path):
+    """
+    Sessions sur une base SQLite fichier, partagée par plusieurs threads
+    (les verrous d'écriture de SQLite s'appliquent comme en production).
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'loans.db'}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+def borrow_concurrently(SessionLocal, borrow, attempts):
+    """
+    Exécute `borrow(service, attempt)` en parallèle, chacun avec sa session ;
+    renvoie les codes HTTP obtenus (201 ou celui de l'exception).
+    """
+    def run(attempt):
+        with SessionLocal() as db:
+            service = LoanService(LoanRepository(Loan, db), BookRepository(Book, db), UserRepository(User, db))
+            try:
+                return borrow(service, attempt)
+            except CustomException as e:
+                return e.status_code
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        return list(pool.map(run, attempts))
+
+def test_concurrent_checkout_never_oversells(file_sessions):
+    with file_sessions() as db:
+        db.add(Book(title="Rare", author="Author", isbn="9999999999", publication_year=2020, quantity=5))
+        db.add_all(User(email=f"u{i}@example.com", full_name=f"U{i}", hashed_password="x", is_active=True) for i in range(40))
+        db.commit()
+        book_id = db.query(Book.id).scalar()
+        user_ids = [row.id for row in db.query(User.id)]
+
+    def borrow(service, user_id):
+        service.create_loan(user_id=user_id, book_id=book_id)
+        return 201
+
+    results = borrow_concurrently(file_sessions, borrow, user_ids)
+
+    assert results.count(201) == 5
+    assert set(results) == {201, 409}
+    with file_sessions() as db:
+        assert db.query(Book.quantity).filter(Book.id == book_id).scalar() == 0
+        assert db.query(Loan).filter(Loan.book_id == book_id).count() == 5
+
+def test_concurrent_duplicate_checkout_is_conflict(file_sessions):
+    with file_sessions() as db:
+        db.add(Book(title="Common", author="Author", isbn="8888888888", publication_year=2020, quantity=50))
+        db.add(User(email="dup@example.com", full_name="Dup", hashed_password="x", is_active=True))
+        db.commit()
+        book_id = db.query(Book.id).scalar()
+        user_id = db.query(User.id).scalar()
+
+    def borrow(service, attempt):
+        # Emprunts simple et groupé en concurrence pour le même livre
+        if attempt % 2:
+            return service.create_loans(user_id=user_id, book_ids=[book_id])[0]["status_code"]
+        service.create_loan(user_id=user_id, book_id=book_id)
+        return 201
+
+    results = borrow_concurrently(file_sessions, borrow, range(32))
+
+    # L'index unique partiel tranche la course : un seul emprunt, les autres en conflit
+    assert results.count(201) == 1
+    assert set(results) == {201, 409}
+    with file_sessions() as db:
+        assert db.query(Book.quantity).filter(Book.id == book_id).scalar() == 49
+        assert db.query(Loan).filter(Loan.book_id == book_id).count() == 1
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.db.unit_of_work import unit_of_work
+from src.models import Base
+from src.models.books import Book
+from src.models.categories import Category
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.books import BookRepository
+from src.repositories.categories import CategoryRepository
+from src.repositories.loans import LoanRepository
+from src.repositories.users import UserRepository
+from src.repositories.versions import TableVersionsView, get_versions, versions_view
+
+
+def versions(db: Session):
+    return {name: version.version for name, version in get_versions(db).items()}
+
+
+def changes(before, after):
+    return {name for name in after if after[name] != before.get(name)}
+
+
+def test_repository_writes_bump_versions(db_session: Session, user, book):
+    """
+    Teste que chaque écriture incrémente la version des tables touchées, et seulement celles-ci.
+    """
+    books = BookRepository(Book, db_session)
+    loans = LoanRepository(Loan, db_session)
+    category = CategoryRepository(Category, db_session).create(obj_in={"name": "Roman"})
+    now = datetime.utcnow()
+
+    steps = [
+        (lambda: books.create(obj_in={
+            "title": "Autre", "author": "Auteur", "isbn": "1000000000009", "publication_year": 2000, "quantity": 1
+        }), {"book"}),
+        (lambda: books.update(db_obj=book, obj_in={"quantity": 4}), {"book"}),
+        (lambda: books.add_category(book_id=book.id, category_id=category.id), {"book"}),
+        (lambda: books.remove_category(book_id=book.id, category_id=category.id), {"book"}),
+        (lambda: UserRepository(User, db_session).update(db_obj=user, obj_in={"full_name": "Nouveau nom"}), {"user"}),
+        (lambda: loans.checkout(user_id=user.id, book_id=book.id, loan_date=now, due_date=now + timedelta(days=14)), {"book", "loan"}),
+        (lambda: loans.checkin(loan_id=loans.get_active_loans()[0].id, book_id=book.id, return_date=now), {"book", "loan"}),
+        (lambda: books.bulk_insert(rows=[{
+            "title": "Import", "author": "Auteur", "isbn": "1000000000010", "publication_year": 2000, "quantity": 1,
+            "created_at": now, "updated_at": now
+        }]), {"book"}),
+        (lambda: CategoryRepository(Category, db_session).get_or_create_many(names=["Policier"]), {"category"}),
+        (lambda: books.remove(id=books.get_by_isbn(isbn="1000000000009").id), {"book"}),
+        # Lectures : aucune version ne change
+        (lambda: (books.get_multi(), loans.get_active_loans(), books.get_stats()), set()),
+    ]
+    for step, expected in steps:
+        before = versions(db_session)
+        step()
+        db_session.flush()
+        assert changes(before, versions(db_session)) == expected
+
+
+def test_versions_are_bumped_in_the_write_transaction(tmp_path):
+    """
+    Teste qu'une écriture annulée n'incrémente aucune version.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'versions.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    repository = BookRepository(Book, db)
+    repository.create(obj_in={"title": "Livre", "author": "Auteur", "isbn": "1000000000001", "publication_year": 2000, "quantity": 1})
+    before = versions(db)
+    assert before["book"] == 1
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            repository.create(obj_in={"title": "Annulé", "author": "Auteur", "isbn": "1000000000002", "publication_year": 2000, "quantity": 1})
+            raise RuntimeError("échec après l'écriture")
+    assert versions(db) == before
+    db.close()
+    engine.dispose()
+
+
+def test_versions_view_caches_and_refreshes_after_commit(db_session: Session, engine):
+    """
+    Teste que la vue en mémoire évite la requête, et qu'un commit local la rafraîchit.
+    """
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        BookRepository(Book, db_session).create(obj_in={
+            "title": "Livre", "author": "Auteur", "isbn": "1000000000001", "publication_year": 2000, "quantity": 1
+        })
+        first = versions_view.version(db_session, "book")
+        statements.clear()
+        assert versions_view.version(db_session, "book") == first
+        assert versions_view.version(db_session, "absente").version == 0
+        assert statements == []
+
+        BookRepository(Book, db_session).create(obj_in={
+            "title": "Autre", "author": "Auteur", "isbn": "1000000000002", "publication_year": 2000, "quantity": 1
+        })
+        assert versions_view.version(db_session, "book").version == first.version + 1
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # Sans écriture locale, relue après max_age seulement
+    view = TableVersionsView(max_age=0)
+    assert view.version(db_session, "book").version == first.version + 1
@@ -0,0 +1,78 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import event
+
+from src.models.books import Book
+from src.models.categories import Category
+from src.repositories.books import BookRepository
+from src.repositories.categories import CategoryRepository
+from src.services.imports import BookImportService, detect_format, read_rows
+from src.exceptions import CustomException
+
+
+def make_service(db_session, batch_size=2):
+    return BookImportService(BookRepository(Book, db_session), CategoryRepository(Category, db_session), batch_size=batch_size)
+
+
+CSV_DATA = """title,author,isbn,publication_year,quantity,categories
+Livre 1,Auteur A,1000000000001,2001,3,Roman|Histoire
+Livre 2,Auteur B,1000000000002,2002,1,Roman
+Livre 3,Auteur C,123,2003,1,
+Livre 4,Auteur D,1000000000001,2004,2,
+Livre 5,Auteur E,1000000000005,2005,,
+Livre 6,Auteur F,1000000000006,2006,4,Poésie
+"""
+
+
+def test_import_csv(db_session):
+    db_session.add(Category(name="Roman"))
+    db_session.commit()
+    progress = []
+    report = make_service(db_session).import_file(
+        io.BytesIO(CSV_DATA.encode()), "csv", on_progress=lambda r: progress.append(r.total)
+    )
+    assert progress == [2, 4, 6]
+    assert (report.total, report.imported, report.failed, report.batches) == (6, 3, 3, 3)
+    errors = {error.line: error for error in report.errors}
+    assert set(errors) == {4, 5, 6}
+    assert "isbn" in errors[4].errors[0]
+    assert errors[5].errors == ["ISBN déjà utilisé"]  # importé par le lot précédent
+    assert "quantity" in errors[6].errors[0]
+
+    repository = BookRepository(Book, db_session)
+    book = repository.get_by_isbn(isbn="1000000000001")
+    assert {c.name for c in book.categories} == {"Roman", "Histoire"}
+    assert db_session.query(Category).count() == 3
+    assert repository.get_by_isbn(isbn="1000000000006").categories[0].name == "Poésie"
+
+
+def test_import_jsonl_skips_existing_isbn(db_session, book):
+    lines = [
+        json.dumps({"title": "Doublon", "author": "X", "isbn": book.isbn, "publication_year": 2000, "quantity": 1}),
+        "{pas du json",
+        json.dumps({"title": "Nouveau", "author": "Y", "isbn": "2000000000001", "publication_year": 2000,
+                    "quantity": 2, "categories": ["Essai"]}),
+        json.dumps({"title": "Nouveau bis", "author": "Y", "isbn": "2000000000001", "publication_year": 2000,
+                    "quantity": 1}),
+    ]
+    statements = []
+    event.listen(db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    report = make_service(db_session, batch_size=100).import_file(io.BytesIO("\n".join(lines).encode()), "jsonl")
+    assert (report.total, report.imported, report.failed) == (4, 1, 3)
+    errors = {error.line: error.errors[0] for error in report.errors}
+    assert errors[1] == "ISBN déjà utilisé"
+    assert errors[2].startswith("JSON invalide")
+    assert errors[4] == "ISBN en double dans le fichier"
+    # Une seule recherche d'ISBN existants pour tout le lot
+    assert sum(s.startswith("SELECT book.isbn \nFROM book") for s in statements) == 1
+
+
+def test_read_rows_and_format():
+    rows = list(read_rows(io.BytesIO(b"title,isbn\nA,1,extra\n"), "csv"))
+    assert isinstance(rows[0][1], ValueError)
+    assert detect_format("catalogue.CSV") == "csv"
+    assert detect_format("export.ndjson") == "jsonl"
+    with pytest.raises(CustomException):
+        detect_format("catalogue.xlsx")
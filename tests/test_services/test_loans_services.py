@@ -1,10 +1,11 @@
 import pytest
 from datetime import datetime, timedelta
-from src.services.loans import LoanService
+from src.services.loans import LoanService, MAX_ACTIVE_LOANS
 from src.exceptions import CustomException
 
 class DummyLoanRepo:
-    def __init__(self):
+    def __init__(self, book_repo=None):
+        self.book_repo = book_repo
         self.active_loans = []
         self.loans = []
         self.created = False
@@ -14,6 +15,10 @@ class DummyLoanRepo:
         self.last_get_id = None
     def get_active_loans(self):
         return self.active_loans
+    def has_active_loan(self, user_id, book_id):
+        return any(l.user_id == user_id and l.book_id == book_id for l in self.active_loans)
+    def count_active_loans_by_user(self, user_id):
+        return len([l for l in self.active_loans if l.user_id == user_id])
     def get(self, id):
         self.last_get_id = id
         for loan in self.loans:
@@ -37,6 +42,19 @@ class DummyLoanRepo:
         for k, v in obj_in.items():
             setattr(db_obj, k, v)
         return db_obj
+    def checkout(self, user_id, book_id, loan_date, due_date):
+        book = self.book_repo.books[book_id]
+        if book.quantity <= 0:
+            return None
+        book.quantity -= 1
+        return self.create({"user_id": user_id, "book_id": book_id, "loan_date": loan_date, "due_date": due_date})
+    def checkin(self, loan_id, book_id, return_date):
+        loan = self.get(loan_id)
+        if loan.return_date is not None:
+            return False
+        loan.return_date = return_date
+        self.book_repo.books[book_id].quantity += 1
+        return True
 
 class DummyBookRepo:
     def __init__(self, available=True):
@@ -96,8 +114,8 @@ def test_create_loan_user_inactive():
     assert "inactif" in str(exc.value)
 
 def test_create_loan_success():
-    loan_repo = DummyLoanRepo()
     book_repo = DummyBookRepo()
+    loan_repo = DummyLoanRepo(book_repo)
     user_repo = DummyUserRepo()
     service = LoanService(loan_repo, book_repo, user_repo)
     loan = service.create_loan(user_id=1, book_id=1)
@@ -107,8 +125,8 @@ def test_create_loan_success():
     assert loan.book_id == 1
 
 def test_return_loan_success():
-    loan_repo = DummyLoanRepo()
     book_repo = DummyBookRepo()
+    loan_repo = DummyLoanRepo(book_repo)
     user_repo = DummyUserRepo()
     # Ajoute un emprunt actif
     loan = type("Loan", (), {
@@ -120,8 +138,6 @@ def test_return_loan_success():
         "loan_date": datetime.utcnow()
     })()
     loan_repo.loans.append(loan)
-    loan_repo.get = lambda id: loan if id == 10 else None
-    loan_repo.update = lambda db_obj, obj_in: setattr(db_obj, "return_date", obj_in["return_date"]) or db_obj
     service = LoanService(loan_repo, book_repo, user_repo)
     result = service.return_loan(loan_id=10)
     assert result.return_date is not None
@@ -181,3 +197,74 @@ def test_extend_loan_already_extended():
     with pytest.raises(CustomException) as exc:
         service.extend_loan(loan_id=10, extension_days=7)
     assert "déjà été prolongé" in str(exc.value)
+
+def test_create_loan_already_borrowed():
+    loan_repo = DummyLoanRepo()
+    loan_repo.active_loans.append(type("Loan", (), {"user_id": 1, "book_id": 1})())
+    service = LoanService(loan_repo, DummyBookRepo(), DummyUserRepo())
+    with pytest.raises(CustomException) as exc:
+        service.create_loan(user_id=1, book_id=1)
+    assert exc.value.status_code == 409
+
+def test_create_loan_limit_reached():
+    loan_repo = DummyLoanRepo()
+    loan_repo.active_loans.extend(type("Loan", (), {"user_id": 1, "book_id": 100 + i})() for i in range(5))
+    service = LoanService(loan_repo, DummyBookRepo(), DummyUserRepo())
+    with pytest.raises(CustomException) as exc:
+        service.create_loan(user_id=1, book_id=1)
+    assert "limite d'emprunts" in str(exc.value)
+
+def test_create_loan_stock_taken_concurrently():
+    book_repo = DummyBookRepo()
+    loan_repo = DummyLoanRepo(book_repo)
+    # Un autre emprunt a pris le dernier exemplaire entre la lecture et l'écriture
+    loan_repo.checkout = lambda user_id, book_id, loan_date, due_date: None
+    service = LoanService(loan_repo, book_repo, DummyUserRepo())
+    with pytest.raises(CustomException) as exc:
+        service.create_loan(user_id=1, book_id=1)
+    assert exc.value.status_code == 409
+    assert not loan_repo.created
+
+def make_loan_service(db_session):
+    from src.models.books import Book
+    from src.models.loans import Loan
+    from src.models.users import User
+    from src.repositories.books import BookRepository
+    from src.repositories.loans import LoanRepository
+    from src.repositories.users import UserRepository
+    return LoanService(LoanRepository(Loan, db_session), BookRepository(Book, db_session), UserRepository(User, db_session))
+
+def test_create_and_return_loans_batch(db_session, user):
+    from sqlalchemy import event
+    from src.models.books import Book
+    books = [Book(title=f"Livre {i}", author="A", isbn=f"100000000000{i}", publication_year=2000, quantity=q)
+             for i, q in enumerate([2, 1, 0])]
+    db_session.add_all(books)
+    db_session.commit()
+    ids = [b.id for b in books]
+    commits = []
+    event.listen(db_session, "after_commit", lambda session: commits.append(session))
+    service = make_loan_service(db_session)
+
+    results = service.create_loans(user_id=user.id, book_ids=[ids[0], ids[1], ids[2], ids[0], 999])
+    assert [r["status_code"] for r in results] == [201, 201, 409, 409, 404]
+    assert len(commits) == 1
+    assert [b.quantity for b in books] == [1, 0, 0]
+
+    loan_ids = [r["loan"].id for r in results if r["loan"]]
+    commits.clear()
+    results = service.return_loans(loan_ids=loan_ids + [loan_ids[0], 999])
+    assert [r["status_code"] for r in results] == [200, 200, 409, 404]
+    assert all(r["loan"].return_date is not None for r in results[:2])
+    assert len(commits) == 1
+    assert [b.quantity for b in books] == [2, 1, 0]
+
+def test_create_loans_batch_respects_limit(db_session, user):
+    from src.models.books import Book
+    books = [Book(title=f"Livre {i}", author="A", isbn=f"20000000000{i:02d}", publication_year=2000, quantity=1)
+             for i in range(MAX_ACTIVE_LOANS + 2)]
+    db_session.add_all(books)
+    db_session.commit()
+    results = make_loan_service(db_session).create_loans(user_id=user.id, book_ids=[b.id for b in books])
+    codes = [r["status_code"] for r in results]
+    assert codes == [201] * MAX_ACTIVE_LOANS + [403, 403]
@@ -0,0 +1,128 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.models.users import User
+from src.models.loans import Loan
+from src.models.counters import LibraryCounter
+from src.repositories.books import BookRepository
+from src.repositories.counters import CounterRepository
+from src.repositories.loans import LoanRepository
+from src.repositories.users import UserRepository
+from src.services.loans import LoanService
+from src.services.stats import StatsService
+from src.services.users import UserService
+
+
+@pytest.fixture
+def library(db_session: Session):
+    users = [
+        User(email="actif@example.com", full_name="Actif", hashed_password="x", is_active=True),
+        User(email="inactif@example.com", full_name="Inactif", hashed_password="x", is_active=False),
+    ]
+    books = [
+        Book(title="Livre A", author="Auteur", isbn="1000000000001", publication_year=2000, quantity=3),
+        Book(title="Livre B", author="Auteur", isbn="1000000000002", publication_year=2010, quantity=2),
+    ]
+    db_session.add_all(users + books)
+    db_session.flush()
+    now = datetime.utcnow()
+    db_session.add_all([
+        Loan(user_id=users[0].id, book_id=books[0].id, loan_date=now - timedelta(days=2), due_date=now + timedelta(days=12)),
+        Loan(user_id=users[0].id, book_id=books[1].id, loan_date=now - timedelta(days=30), due_date=now - timedelta(days=16)),
+        Loan(user_id=users[1].id, book_id=books[0].id, loan_date=now - timedelta(days=30), due_date=now - timedelta(days=16),
+             return_date=now - timedelta(days=20)),
+    ])
+    db_session.commit()
+
+
+def _count_statements(db_session: Session):
+    statements = []
+    event.listen(db_session.get_bind(), "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+EXPECTED_GENERAL_STATS = {
+    "total_books": 5,
+    "unique_books": 2,
+    "total_users": 2,
+    "active_users": 1,
+    "total_loans": 3,
+    "active_loans": 2,
+    "overdue_loans": 1,
+}
+
+
+def test_general_stats_without_counters(db_session: Session, library):
+    """
+    Teste le calcul des statistiques générales quand les compteurs ne sont pas initialisés.
+    """
+    statements = _count_statements(db_session)
+
+    stats = StatsService(db_session).get_general_stats()
+
+    assert stats == EXPECTED_GENERAL_STATS
+    # Lecture des compteurs (vides) puis une requête combinée
+    assert len(statements) == 2
+
+
+def test_general_stats_from_counters(db_session: Session, library):
+    """
+    Teste que les statistiques générales sont lues depuis les compteurs en une requête.
+    """
+    drift = CounterRepository(LibraryCounter, db_session).reconcile()
+    assert drift["total_books"] == {"stored": None, "actual": 5}
+    statements = _count_statements(db_session)
+
+    stats = StatsService(db_session).get_general_stats()
+
+    assert stats == EXPECTED_GENERAL_STATS
+    assert len(statements) == 1
+
+
+def test_counters_follow_writes(db_session: Session, library):
+    """
+    Teste la mise à jour transactionnelle des compteurs par les services et repositories.
+    """
+    counters = CounterRepository(LibraryCounter, db_session)
+    counters.reconcile()
+    book_repository = BookRepository(Book, db_session)
+    user_repository = UserRepository(User, db_session)
+    loan_service = LoanService(LoanRepository(Loan, db_session), book_repository, user_repository)
+    user_service = UserService(user_repository)
+
+    book = book_repository.create(obj_in={
+        "title": "Livre C", "author": "Auteur", "isbn": "1000000000003", "publication_year": 2020, "quantity": 4
+    })
+    book_repository.update(db_obj=book, obj_in={"quantity": 6})
+    user = user_repository.create(obj_in={
+        "email": "nouveau@example.com", "full_name": "Nouveau", "hashed_password": "x"
+    })
+    loan = loan_service.create_loan(user_id=user.id, book_id=book.id)
+    loan_service.return_loan(loan_id=loan.id)
+    loan_service.create_loan(user_id=user.id, book_id=book.id)
+    user_service.update(db_obj=user, obj_in={"is_active": False})
+    book_repository.remove(id=book_repository.get_by_isbn(isbn="1000000000002").id)
+
+    values = counters.get_values()
+    assert counters.reconcile(fix=False) == {}
+    assert values["unique_books"] == 2
+    assert values["total_users"] == 3
+    assert values["active_users"] == 1
+
+
+def test_shared_totals_in_repositories(db_session: Session, library):
+    """
+    Teste les statistiques des repositories qui partagent les mêmes agrégats.
+    """
+    repository = BookRepository(Book, db_session)
+    book_stats = repository.get_stats()
+    assert book_stats["total_books"] == 5
+    assert book_stats["unique_books"] == 2
+    assert book_stats["avg_publication_year"] == 2005
+
+    loan_stats = LoanRepository(Loan, db_session).get_loans_stats()
+    assert (loan_stats["total_loans"], loan_stats["active_loans"], loan_stats["overdue_loans"]) == (3, 2, 1)
@@ -0,0 +1,93 @@
+import json
+import logging
+
+import pytest
+
+from src.config import settings
+from src.logging_config import SamplingFilter, build_handlers, setup_logging, stop_logging
+
+
+@pytest.fixture
+def configure(tmp_path):
+    """
+    Configure la journalisation vers un fichier temporaire, puis rétablit la configuration par défaut.
+    """
+    path = tmp_path / "app.log"
+
+    def configure(**overrides):
+        setup_logging(settings.model_copy(update={"LOG_FILE": str(path), **overrides}))
+        return path
+    yield configure
+    setup_logging()
+
+
+def read_lines(path):
+    stop_logging()  # vide la file d'attente
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_json_output_levels_and_sampling(configure):
+    """
+    Teste la sortie JSON, les niveaux par logger et l'échantillonnage des messages INFO.
+    """
+    path = configure(LOG_JSON=True, LOG_LEVELS={"test.quiet": "WARNING"}, LOG_SAMPLING={"test.sampled": 0.1})
+    for i in range(20):
+        logging.getLogger("test.sampled.child").info("échantillon %d", i)
+    logging.getLogger("test.sampled").warning("toujours conservé")
+    logging.getLogger("test.quiet").info("filtré par niveau")
+    logging.getLogger("test.quiet").error("erreur conservée")
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logging.getLogger("test.other").exception("échec")
+
+    entries = [json.loads(line) for line in read_lines(path)]
+    messages = [entry["message"] for entry in entries]
+    assert messages == ["échantillon 0", "échantillon 10", "toujours conservé", "erreur conservée", "échec"]
+    assert entries[0]["logger"] == "test.sampled.child" and entries[0]["level"] == "INFO"
+    assert "ZeroDivisionError" in entries[-1]["exception"]
+
+
+def test_text_output_and_rotation(configure):
+    """
+    Teste le format texte et la rotation du fichier par taille.
+    """
+    path = configure(LOG_MAX_BYTES=2000, LOG_BACKUP_COUNT=2)
+    for i in range(100):
+        logging.getLogger("test.rotation").info("message numéro %03d", i)
+    lines = read_lines(path)
+    assert "[INFO] test.rotation: message numéro 099" in lines[-1]
+    assert (path.parent / "app.log.1").exists() and (path.parent / "app.log.2").exists()
+    assert not (path.parent / "app.log.3").exists()
+
+
+def test_external_rotation_reopens_moved_file(tmp_path):
+    """
+    Teste que, sans rotation par taille (plusieurs workers), le fichier
+    déplacé par une rotation externe est rouvert au lieu d'être renommé.
+    """
+    path = tmp_path / "app.log"
+    handler = build_handlers(settings.model_copy(update={"LOG_FILE": str(path), "LOG_MAX_BYTES": 0}))[-1]
+    logger = logging.getLogger("test.rotation")
+    try:
+        handler.handle(logger.makeRecord(logger.name, logging.INFO, __file__, 0, "avant rotation", None, None))
+        path.rename(tmp_path / "app.log.1")
+        handler.handle(logger.makeRecord(logger.name, logging.INFO, __file__, 0, "après rotation", None, None))
+    finally:
+        handler.close()
+    assert path.read_text(encoding="utf-8").endswith("après rotation\n")
+    assert (tmp_path / "app.log.1").read_text(encoding="utf-8").endswith("avant rotation\n")
+
+
+def test_sampling_rate_prefixes():
+    """
+    Teste la résolution du préfixe le plus long et la proportion conservée.
+    """
+    sampling = SamplingFilter({"src": 0.5, "src.repositories": 0.25})
+    assert sampling.rate("src.repositories.books") == 0.25
+    assert sampling.rate("src.services") == 0.5
+    assert sampling.rate("uvicorn") == 1.0
+
+    record = lambda name: logging.LogRecord(name, logging.INFO, __file__, 1, "message", None, None)
+    kept = sum(sampling.filter(record("src.repositories.books")) for _ in range(100))
+    assert kept == 25
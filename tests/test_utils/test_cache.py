@@ -0,0 +1,242 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.cache import cache, cache_stats, function_key
+from src.utils.cache_backends import LRUCache
+from src.exceptions import CustomException
+
+
+def test_lru_eviction_by_entries_and_size():
+    """
+    Teste l'éviction LRU quand le nombre d'entrées ou la taille est dépassé.
+    """
+    store = LRUCache(max_entries=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    assert store.get("a") == (True, 1)  # "b" devient le moins récent
+    store.set("c", 3)
+    assert store.get("b") == (False, None)
+    assert store.get("a") == (True, 1) and store.get("c") == (True, 3)
+    assert store.stats()["evictions"] == 1
+
+    small = LRUCache(max_bytes=2000)
+    small.set("x", "x" * 1000)
+    small.set("y", "y" * 1000)
+    assert small.get("x") == (False, None)
+    assert small.stats()["bytes"] <= 2000
+    small.set("z", "z" * 5000)  # Plus gros que le cache : ignoré
+    assert small.get("z") == (False, None) and small.get("y")[0]
+
+
+def test_expiry_and_counters():
+    """
+    Teste l'expiration des entrées et les compteurs de succès/échecs.
+    """
+    store = LRUCache()
+    store.set("a", 1, expiry=0)
+    store.set("b", 2, expiry=60)
+    assert store.get("a") == (False, None)
+    assert store.get("b") == (True, 2)
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (1, 1, 1, 1)
+
+
+def test_tag_invalidation():
+    """
+    Teste l'invalidation ciblée par étiquette et l'invalidation complète.
+    """
+    store = LRUCache()
+    store.set("stats", 1, tags=("books",))
+    store.set("count", 2, tags=("books", "counts"))
+    store.set("loans", 3, tags=("loans",))
+    assert store.invalidate("books") == 2
+    assert store.get("stats")[0] is False and store.get("count")[0] is False
+    assert store.get("loans") == (True, 3)
+    store.invalidate()
+    assert store.stats()["entries"] == 0
+
+
+def test_single_flight():
+    """
+    Teste que des lectures concurrentes d'une clé absente ne calculent qu'une fois.
+    """
+    store = LRUCache()
+    calls = []
+    start = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 42
+
+    def read(results):
+        start.wait()
+        results.append(store.get_or_set("key", compute))
+
+    results = []
+    threads = [threading.Thread(target=read, args=(results,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(results) == [(False, 42)] + [(True, 42)] * 7
+
+
+def test_single_flight_async_follower_does_not_block_loop():
+    """
+    Teste qu'un appel de la boucle asyncio attend le calcul d'un autre thread
+    sans bloquer la boucle, et sans recalculer.
+    """
+    store = LRUCache()
+    calls = []
+    started, release = threading.Event(), threading.Event()
+
+    def compute():
+        calls.append("thread")
+        started.set()
+        release.wait(5)
+        return 1
+
+    async def follower():
+        async def recompute():
+            calls.append("loop")
+            return 2
+
+        waiting = asyncio.ensure_future(store.get_or_set_async("key", recompute))
+        # La boucle reste disponible pendant l'attente
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        release.set()
+        return await waiting
+
+    leader = threading.Thread(target=lambda: store.get_or_set("key", compute))
+    leader.start()
+    assert started.wait(5)
+    assert asyncio.run(follower()) == (True, 1)
+    leader.join()
+    assert calls == ["thread"]
+
+
+def test_single_flight_async_leader():
+    """
+    Teste qu'un calcul mené depuis la boucle est partagé avec les autres
+    coroutines et les threads, et qu'un appel synchrone du même thread
+    échoue au lieu de bloquer la boucle.
+    """
+    store = LRUCache()
+    calls = []
+
+    async def main():
+        release = asyncio.Event()
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return 42
+
+        leader = asyncio.ensure_future(store.get_or_set_async("key", compute))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(store.get_or_set_async("key", compute)) for _ in range(3)]
+        thread_results = []
+        thread = threading.Thread(target=lambda: thread_results.append(store.get_or_set("key", lambda: 0)))
+        thread.start()
+        await asyncio.sleep(0.01)
+        with pytest.raises(RuntimeError):
+            store.get_or_set("key", lambda: 0)
+        release.set()
+        results = [await leader] + [await follower for follower in followers]
+        await asyncio.get_running_loop().run_in_executor(None, thread.join)
+        return results + thread_results
+
+    assert asyncio.run(main()) == [(False, 42)] + [(True, 42)] * 4
+    assert calls == [1]
+    assert store.get("key") == (True, 42)
+
+
+def test_single_flight_error_and_invalidation_during_compute():
+    """
+    Teste qu'une erreur n'est pas mise en cache et qu'un calcul invalidé
+    pendant son exécution n'est pas stocké.
+    """
+    store = LRUCache()
+
+    def failing():
+        raise CustomException("Erreur", status_code=500)
+
+    with pytest.raises(CustomException):
+        store.get_or_set("key", failing)
+    assert store.get_or_set("key", lambda: 1) == (False, 1)
+
+    def stale():
+        store.invalidate("books")
+        return "ancienne valeur"
+
+    assert store.get_or_set("other", stale, tags=("books",)) == (False, "ancienne valeur")
+    assert store.get("other") == (False, None)
+
+
+def test_set_if_current_ignores_unrelated_invalidations():
+    """
+    Teste qu'un calcul n'est écarté que par l'invalidation de l'une de ses
+    étiquettes (ou de tout le cache), pas par celle d'autres étiquettes.
+    """
+    store = LRUCache()
+    generation = store.generation
+    store.invalidate("books")
+    assert store.set_if_current(generation, "user", 1, tags=("user:1",))
+    assert not store.set_if_current(generation, "stats", 2, tags=("books",))
+    generation = store.generation
+    store.invalidate()
+    assert not store.set_if_current(generation, "user", 3, tags=("user:1",))
+    assert store.get("user") == (False, None)
+
+
+def test_cache_decorator_on_coroutine():
+    """
+    Teste que le décorateur met en cache le résultat d'une coroutine, pas
+    l'objet coroutine : chaque appel peut être attendu.
+    """
+    calls = []
+
+    class Repository:
+        @cache(expiry=60, tags=("tests",))
+        async def get_stats(self, year=None):
+            calls.append(year)
+            return {"year": year}
+
+    async def main():
+        return [await Repository().get_stats(year=1990) for _ in range(2)]
+
+    assert asyncio.run(main()) == [{"year": 1990}] * 2
+    assert calls == [1990]
+
+
+def test_method_key_ignores_self():
+    """
+    Teste que la clé d'une méthode ignore self : les instances partagent le cache.
+    """
+    calls = []
+
+    class Repository:
+        def __init__(self, db):
+            self.db = db
+
+        @cache(expiry=60, tags=("tests",))
+        def get_stats(self, year=None):
+            calls.append(year)
+            return {"year": year}
+
+    hits = cache_stats()["hits"]
+    assert Repository(object()).get_stats(year=2000) == {"year": 2000}
+    assert Repository(object()).get_stats(year=2000) == {"year": 2000}
+    Repository(object()).get_stats(year=2001)
+    assert calls == [2000, 2001]
+    assert cache_stats()["hits"] == hits + 1
+
+    def func(a, b=None):
+        pass
+    assert function_key(func, (object(), 1), {}, is_method=True) == function_key(func, (object(), 1), {}, is_method=True)
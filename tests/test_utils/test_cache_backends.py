@@ -0,0 +1,125 @@
+import multiprocessing
+
+import fakeredis
+import pytest
+
+from src.config import Settings
+from src.utils import cache as cache_module
+from src.utils.cache import cache, create_cache_backend
+from src.utils.cache_backends import LRUCache, RedisCache, SQLiteCache
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return LRUCache()
+    if request.param == "sqlite":
+        return SQLiteCache(str(tmp_path / "cache.db"))
+    return RedisCache(fakeredis.FakeRedis(), prefix="test:")
+
+
+def test_backend_get_set_and_tags(backend):
+    """
+    Teste lecture, écriture, expiration et invalidation par étiquette sur chaque backend.
+    """
+    backend.set("stats", {"total_books": 5}, tags=("books",))
+    backend.set("count", 3, tags=("books", "counts"))
+    backend.set("loans", [1, 2], tags=("loans",))
+    backend.set("expired", 1, expiry=0)
+    assert backend.get("stats") == (True, {"total_books": 5})
+    assert backend.get("expired") == (False, None)
+    assert backend.get("missing") == (False, None)
+
+    assert backend.invalidate("books") == 2
+    assert backend.get("stats") == (False, None) and backend.get("count") == (False, None)
+    assert backend.get("loans") == (True, [1, 2])
+    # Une clé réécrite après invalidation est de nouveau étiquetée
+    backend.set("count", 4, tags=("counts",))
+    assert backend.invalidate("counts") == 1
+
+    backend.invalidate()
+    assert backend.get("loans") == (False, None)
+    stats = backend.stats()
+    assert stats["hits"] == 2 and stats["misses"] >= 5
+
+
+def test_backend_single_flight(backend):
+    """
+    Teste get_or_set et le calcul unique sur chaque backend.
+    """
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "valeur"
+
+    assert backend.get_or_set("key", compute, tags=("books",)) == (False, "valeur")
+    assert backend.get_or_set("key", compute, tags=("books",)) == (True, "valeur")
+    assert len(calls) == 1
+
+
+def _write_from_other_process(path):
+    store = SQLiteCache(path)
+    store.invalidate("books")
+    store.set("stats", {"total_books": 7}, tags=("books",))
+
+
+def test_sqlite_cache_is_shared_between_processes(tmp_path):
+    """
+    Teste que deux processus voient les mêmes entrées et invalidations.
+    """
+    path = str(tmp_path / "cache.db")
+    store = SQLiteCache(path)
+    store.set("stats", {"total_books": 5}, tags=("books",))
+    store.set("other", 1, tags=("books",))
+
+    process = multiprocessing.get_context("spawn").Process(target=_write_from_other_process, args=(path,))
+    process.start()
+    process.join(timeout=30)
+    assert process.exitcode == 0
+    assert store.get("stats") == (True, {"total_books": 7})
+    assert store.get("other") == (False, None)
+
+
+def test_sqlite_cache_trims_to_max_entries(tmp_path):
+    """
+    Teste que le cache SQLite reste borné en nombre d'entrées.
+    """
+    store = SQLiteCache(str(tmp_path / "cache.db"), max_entries=10)
+    for i in range(SQLiteCache.TRIM_INTERVAL):
+        store.set(f"key-{i}", i, expiry=60 + i, tags=("books",))
+    stats = store.stats()
+    assert stats["entries"] == 10 and stats["evictions"] == SQLiteCache.TRIM_INTERVAL - 10
+    # Les entrées restantes sont celles qui expirent le plus tard
+    assert store.get(f"key-{SQLiteCache.TRIM_INTERVAL - 1}")[0]
+    assert store.invalidate("books") == 10
+
+
+def test_create_cache_backend_from_settings(tmp_path):
+    """
+    Teste le choix du backend par les paramètres de déploiement.
+    """
+    assert isinstance(create_cache_backend(Settings(CACHE_BACKEND="memory")), LRUCache)
+    sqlite_backend = create_cache_backend(Settings(CACHE_BACKEND="sqlite", CACHE_SQLITE_PATH=str(tmp_path / "c.db")))
+    assert isinstance(sqlite_backend, SQLiteCache)
+    with pytest.raises(ValueError):
+        create_cache_backend(Settings(CACHE_BACKEND="memcached"))
+
+
+def test_decorator_uses_configured_backend(monkeypatch, tmp_path):
+    """
+    Teste que le décorateur passe par le backend configuré.
+    """
+    store = SQLiteCache(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(cache_module, "cache_store", store)
+    calls = []
+
+    @cache(expiry=60, tags=("books",))
+    def get_stats():
+        calls.append(1)
+        return {"total_books": len(calls)}
+
+    assert get_stats() == get_stats() == {"total_books": 1}
+    cache_module.invalidate_cache("books")
+    assert get_stats() == {"total_books": 2}
+    assert store.stats()["entries"] == 1
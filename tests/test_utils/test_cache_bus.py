@@ -0,0 +1,120 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, update
+
+from src.models.cache import CacheInvalidation
+from src.utils import cache as cache_module
+from src.utils.cache_backends import LRUCache
+from src.utils.cache_bus import InvalidationBus
+
+
+@pytest.fixture
+def bus_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bus.db'}", connect_args={"check_same_thread": False})
+    CacheInvalidation.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_publish_and_poll_between_workers(bus_engine):
+    """
+    Teste qu'une invalidation publiée par un worker est appliquée par les autres, pas par lui-même.
+    """
+    received = {"a": [], "b": [], "c": []}
+    buses = {name: InvalidationBus(bus_engine, received[name].append) for name in received}
+
+    first = buses["a"].publish(["books"])
+    second = buses["b"].publish([])
+    assert second > first
+    assert buses["a"].poll() == 1 and buses["b"].poll() == 1 and buses["c"].poll() == 2
+    assert received == {"a": [[]], "b": [["books"]], "c": [["books"], []]}
+    # Relecture : rien de nouveau
+    assert buses["c"].poll() == 0
+
+    # Un worker démarré plus tard ne rejoue pas l'historique
+    late = InvalidationBus(bus_engine, received["c"].append)
+    assert late.poll() == 0
+
+
+def test_prune_keeps_latest_sequence(bus_engine):
+    """
+    Teste la purge des anciennes invalidations sans réinitialiser la séquence.
+    """
+    bus = InvalidationBus(bus_engine, lambda tags: None, retention=60)
+    for _ in range(3):
+        last = bus.publish(["books"])
+    with bus_engine.begin() as connection:
+        connection.execute(update(CacheInvalidation.__table__).values(created_at=datetime.utcnow() - timedelta(hours=2)))
+    assert bus.prune() == 2
+    assert bus.publish(["books"]) == last + 1
+
+
+def test_invalidate_cache_reaches_other_worker(bus_engine, monkeypatch):
+    """
+    Teste de bout en bout : invalidate_cache dans un worker vide le cache
+    local d'un autre worker abonné au bus.
+    """
+    other_cache = LRUCache()
+    other_cache.set("stats", 1, tags=("books",))
+    other_cache.set("loans", 2, tags=("loans",))
+    other = InvalidationBus(bus_engine, lambda tags: other_cache.invalidate(*tags), poll_interval=0.01)
+    other.start()
+    try:
+        monkeypatch.setattr(cache_module, "invalidation_bus", InvalidationBus(bus_engine, lambda tags: None))
+        cache_module.invalidate_cache("books")
+        deadline = time.monotonic() + 5
+        while other_cache.get("stats")[0] and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        other.stop()
+    assert other_cache.get("stats") == (False, None)
+    assert other_cache.get("loans") == (True, 2)
+
+
+def test_start_without_table_disables_bus(tmp_path):
+    """
+    Teste que l'absence de la table (migration non appliquée) désactive le bus sans erreur.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    assert cache_module.start_invalidation_bus(engine, 0.1) is None
+    assert cache_module.invalidation_bus is None
+
+
+def test_write_publishes_once_in_its_transaction(tmp_path, monkeypatch):
+    """
+    Teste qu'une écriture publie une seule invalidation (toutes ses
+    étiquettes), dans sa transaction, et rien en cas de rollback.
+    """
+    from sqlalchemy import select
+    from sqlalchemy.orm import sessionmaker
+    from src.db.unit_of_work import unit_of_work
+    from src.models.base import Base
+    from src.models.books import Book
+    from src.repositories.books import BookRepository
+    from src.utils.pagination import count_tag
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(cache_module, "invalidation_bus", InvalidationBus(engine, lambda tags: None))
+    SessionLocal = sessionmaker(bind=engine)
+    table = CacheInvalidation.__table__
+    book = {"title": "Bus", "author": "Author", "isbn": "7777777777", "publication_year": 2020, "quantity": 1}
+
+    cache_module.set_cached("stats", 1, tags=("books",))
+    with SessionLocal() as db:
+        BookRepository(Book, db).create(obj_in=book)
+    assert cache_module.get_cached("stats") == (False, None)
+    with engine.connect() as connection:
+        assert connection.execute(select(table.c.tags)).scalars().all() == [json.dumps(["books", count_tag("books")])]
+
+    with SessionLocal() as db:
+        with pytest.raises(RuntimeError):
+            with unit_of_work(db):
+                BookRepository(Book, db).create(obj_in=dict(book, isbn="7777777778"))
+                raise RuntimeError
+    with engine.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(table)).scalar() == 1
+    engine.dispose()
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from src.api.dependencies import decode_token
+from src.config import settings
+from src.utils import jwt_keys
+from src.utils.jwt_keys import ALGORITHM, load_key_ring, reset_key_ring, rotate_key
+from src.utils.security import create_access_token
+
+
+@pytest.fixture
+def key_file(tmp_path, monkeypatch):
+    """
+    Trousseau dans un fichier temporaire, sans SECRET_KEY.
+    """
+    path = str(tmp_path / "jwt_keys.json")
+    monkeypatch.setattr(settings, "JWT_KEYS_FILE", path)
+    monkeypatch.setattr(settings, "SECRET_KEY", None)
+    monkeypatch.setattr(settings, "JWT_KEYS_RELOAD_INTERVAL", 3600)
+    reset_key_ring()
+    yield path
+    reset_key_ring()
+
+
+def kid(token: str) -> str:
+    return jwt.get_unverified_header(token)["kid"]
+
+
+def test_generated_key_is_shared_by_workers(tmp_path):
+    """
+    Teste que deux workers sans clé configurée signent et vérifient avec la même clé générée.
+    """
+    config = SimpleNamespace(JWT_KEYS_FILE=str(tmp_path / "keys.json"), JWT_KEYS={}, SECRET_KEY=None, JWT_ACTIVE_KID=None)
+    first, second = load_key_ring(config), load_key_ring(config)
+    assert first.kids == second.kids == [first.active_kid]
+    token = jwt.encode({"sub": "1"}, first.signing_key, algorithm=ALGORITHM)
+    assert jwt.decode(token, second.verification_key(first.active_kid), algorithms=[ALGORITHM])["sub"] == "1"
+
+
+def test_rotation_keeps_live_tokens_valid(key_file):
+    """
+    Teste qu'après rotation, les tokens signés avec l'ancienne clé restent valides jusqu'à son retrait.
+    """
+    old_token = create_access_token(1)
+    old_kid = kid(old_token)
+
+    # Rotation par un autre processus : le `kid` inconnu force la relecture du fichier
+    new_kid = rotate_key(key_file)
+    new_token = jwt.encode({"sub": "2"}, jwt_keys.load_key_ring().signing_key, algorithm=ALGORITHM, headers={"kid": new_kid})
+    assert decode_token(new_token).sub == 2
+    assert kid(create_access_token(1)) == new_kid
+    assert decode_token(old_token).sub == 1
+
+    rotate_key(key_file, retire=[old_kid])
+    reset_key_ring()
+    with pytest.raises(HTTPException) as error:
+        decode_token(old_token)
+    assert error.value.status_code == 403
+
+
+def test_secret_key_signs_tokens_without_kid(monkeypatch):
+    """
+    Teste que SECRET_KEY reste la clé "default", y compris pour les tokens émis sans `kid`.
+    """
+    monkeypatch.setattr(settings, "JWT_KEYS_FILE", None)
+    monkeypatch.setattr(settings, "SECRET_KEY", "secret-partage")
+    reset_key_ring()
+    try:
+        assert kid(create_access_token(1)) == "default"
+        legacy = jwt.encode({"sub": "3"}, "secret-partage", algorithm=ALGORITHM)
+        assert decode_token(legacy).sub == 3
+        forged = jwt.encode({"sub": "3"}, "autre-secret", algorithm=ALGORITHM, headers={"kid": "inconnu"})
+        with pytest.raises(HTTPException):
+            decode_token(forged)
+    finally:
+        reset_key_ring()
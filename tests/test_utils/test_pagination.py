@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.utils.pagination import PaginationParams, paginate
+from src.exceptions import CustomException
+
+
+def _create_books(db_session: Session, count: int):
+    for i in range(count):
+        db_session.add(Book(
+            title=f"Livre {i % 3}",
+            author=f"Auteur {i}",
+            isbn=f"{i:013d}",
+            publication_year=2000,
+            quantity=1
+        ))
+    db_session.commit()
+
+
+def _walk(db_session: Session, sort_by=None, sort_desc=False, limit=3):
+    """
+    Parcourt toutes les pages en suivant next_cursor.
+    """
+    pages = []
+    params = PaginationParams(limit=limit, sort_by=sort_by, sort_desc=sort_desc, keyset=True)
+    while True:
+        page = paginate(db_session.query(Book), params, Book)
+        pages.append(page)
+        if not page.next_cursor:
+            return pages
+        params = PaginationParams(limit=limit, sort_by=sort_by, sort_desc=sort_desc, cursor=page.next_cursor)
+
+
+@pytest.mark.parametrize("sort_by,sort_desc", [(None, False), ("title", False), ("title", True)])
+def test_keyset_pagination_covers_all_rows(db_session: Session, sort_by, sort_desc):
+    """
+    Teste que la pagination par curseur parcourt tout, dans l'ordre, sans doublon.
+    """
+    _create_books(db_session, 10)
+    pages = _walk(db_session, sort_by=sort_by, sort_desc=sort_desc)
+
+    ids = [book.id for page in pages for book in page.items]
+    books = db_session.query(Book).all()
+    expected = sorted(books, key=lambda b: (getattr(b, sort_by or "id"), b.id), reverse=sort_desc)
+    assert ids == [book.id for book in expected]
+    assert [len(page.items) for page in pages] == [3, 3, 3, 1]
+    assert pages[0].prev_cursor is None
+    assert all(page.total is None and page.pages is None for page in pages)
+
+
+def test_keyset_pagination_prev_cursor(db_session: Session):
+    """
+    Teste le retour à la page précédente avec prev_cursor.
+    """
+    _create_books(db_session, 10)
+    pages = _walk(db_session, sort_by="title")
+
+    params = PaginationParams(limit=3, sort_by="title", cursor=pages[2].prev_cursor)
+    previous = paginate(db_session.query(Book), params, Book)
+
+    assert [b.id for b in previous.items] == [b.id for b in pages[1].items]
+    assert previous.next_cursor is not None
+
+
+def test_keyset_pagination_rejects_unindexed_column(db_session: Session):
+    """
+    Teste le refus d'un tri par curseur sur une colonne non indexée.
+    """
+    params = PaginationParams(limit=3, sort_by="publication_year", keyset=True)
+    with pytest.raises(CustomException) as exc:
+        paginate(db_session.query(Book), params, Book)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_pagination_rejects_mismatched_cursor(db_session: Session):
+    """
+    Teste le refus d'un curseur obtenu avec un autre tri.
+    """
+    _create_books(db_session, 5)
+    first = paginate(db_session.query(Book), PaginationParams(limit=2, sort_by="title", keyset=True), Book)
+    params = PaginationParams(limit=2, sort_by="author", cursor=first.next_cursor)
+    with pytest.raises(CustomException):
+        paginate(db_session.query(Book), params, Book)
+
+
+def test_count_cache_and_invalidation(db_session: Session):
+    """
+    Teste la réutilisation d'un total en cache et son invalidation à l'écriture.
+    """
+    from src.repositories.books import BookRepository
+    from src.utils.pagination import count_cache_key
+
+    _create_books(db_session, 4)
+    count_key = count_cache_key("books", query="  Livre ", author=None)
+    assert count_key == count_cache_key("books", query="livre")
+    params = PaginationParams(limit=2)
+
+    first = paginate(db_session.query(Book), params, Book, count_key=count_key)
+    second = paginate(db_session.query(Book), params, Book, count_key=count_key)
+    assert (first.total, first.total_cached) == (4, False)
+    assert (second.total, second.total_cached) == (4, True)
+
+    BookRepository(Book, db_session).create(obj_in={
+        "title": "Nouveau", "author": "Auteur", "isbn": "9999999999999", "publication_year": 2000, "quantity": 1
+    })
+    third = paginate(db_session.query(Book), params, Book, count_key=count_key)
+    assert (third.total, third.total_cached) == (5, False)
+
+
+def test_pagination_without_total(db_session: Session):
+    """
+    Teste la pagination sans comptage (défilement infini).
+    """
+    _create_books(db_session, 3)
+    page = paginate(db_session.query(Book), PaginationParams(limit=2, include_total=False), Book)
+    assert page.total is None and page.pages is None
+    assert page.has_more is True
+    last = paginate(db_session.query(Book), PaginationParams(skip=2, limit=2, include_total=False), Book)
+    assert len(last.items) == 1 and last.has_more is False
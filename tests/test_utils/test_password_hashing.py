@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.api.routes.auth import login_access_token
+from src.api.routes.users import create_user
+from src.api.schemas.users import UserCreate
+from src.exceptions import CustomException
+from src.models.users import User
+from src.repositories.users import UserRepository
+from src.services.users import UserService
+from src.utils import security
+from src.utils.security import PasswordHasher, configure_password_hasher, crypt_context
+
+
+@pytest.fixture
+def fast_hasher():
+    """
+    Coût bcrypt minimal, dans le thread appelant.
+    """
+    yield configure_password_hasher(rounds=4, workers=0)
+    configure_password_hasher()
+
+
+def test_process_pool_hashes_and_verifies():
+    """
+    Teste le hachage et la vérification dans un processus du pool, en synchrone et en asynchrone.
+    """
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=4)
+    try:
+        hashed = hasher.run(security._hash, "secret")
+        assert hashed.startswith("$2b$04$")
+        assert hasher.run(security._verify, "secret", hashed) is True
+        assert asyncio.run(hasher.run_async(security._verify_and_update, "autre", hashed)) == (False, None)
+    finally:
+        hasher.shutdown()
+
+
+def test_pool_rejects_work_beyond_max_pending():
+    """
+    Teste qu'au-delà de max_pending opérations en cours, une erreur 503 est levée.
+    """
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=1)
+    try:
+        pending = hasher._submit(security._hash, "secret")
+        with pytest.raises(CustomException) as error:
+            hasher.run(security._hash, "autre")
+        assert error.value.status_code == 503
+        assert pending.result().startswith("$2b$04$")
+    finally:
+        hasher.shutdown()
+
+
+def test_authenticate_rehashes_with_configured_cost(db_session: Session, user, fast_hasher):
+    """
+    Teste qu'un hash d'un autre coût est remplacé à la connexion, puis conservé.
+    """
+    user.hashed_password = crypt_context(5).hash("password123")
+    db_session.commit()
+    service = UserService(UserRepository(User, db_session))
+
+    service.authenticate(email=user.email, password="password123")
+    rehashed = user.hashed_password
+    assert rehashed.startswith("$2b$04$")
+
+    service.authenticate(email=user.email, password="password123")
+    assert user.hashed_password == rehashed
+
+
+def test_async_login_rehashes_and_returns_token(fast_hasher, run_with_db):
+    """
+    Teste la route de connexion asynchrone : token émis, hash recalculé, erreurs 401/404.
+    """
+    async def test(db):
+        user = (await db.execute(select(User))).scalars().first()
+        user.hashed_password = crypt_context(5).hash("password123")
+        await db.commit()
+
+        token = await login_access_token(db, OAuth2PasswordRequestForm(username=user.email, password="password123"))
+        assert token["token_type"] == "bearer"
+        await db.refresh(user)
+        assert user.hashed_password.startswith("$2b$04$")
+
+        for username, password, status_code in [(user.email, "mauvais", 401), ("inconnu@example.com", "x", 404)]:
+            with pytest.raises(HTTPException) as error:
+                await login_access_token(db, OAuth2PasswordRequestForm(username=username, password=password))
+            assert error.value.status_code == status_code
+
+    run_with_db(test)
+
+
+def test_registration_with_taken_email_skips_hashing(db_session: Session, user, monkeypatch):
+    """
+    Teste qu'une inscription avec un email déjà pris est refusée sans passer par le pool de hachage.
+    """
+    async def no_hash(password):
+        pytest.fail("Le mot de passe ne doit pas être haché")
+
+    monkeypatch.setattr("src.api.routes.users.get_password_hash_async", no_hash)
+    user_in = UserCreate(email=user.email, password="password123", full_name="Doublon")
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(create_user(db=db_session, user_in=user_in))
+    assert error.value.status_code == 409